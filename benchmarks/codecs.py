@@ -0,0 +1,89 @@
+"""Measure encode/decode cost and size of the broker message codecs.
+
+    python -m benchmarks.codecs --iterations 20000 -o codecs.json
+
+``legacy`` is the previous encoding (``model_dump`` + ``json.dumps``),
+kept as the baseline for new codecs.
+"""
+import argparse
+import json
+import platform
+from datetime import datetime, timedelta, timezone
+from time import perf_counter_ns
+
+from bson import ObjectId
+
+from src.core.brokers.codecs import CODECS
+from src.services.events.messages import EventMessage
+
+
+def _messages(count: int) -> list[EventMessage]:
+    now = datetime.now(tz=timezone.utc)
+    return [
+        EventMessage(
+            id=str(ObjectId()),
+            title=f"Conference {number}",
+            action=("created", "updated", "deleted")[number % 3],
+            timestamp=now + timedelta(seconds=number),
+            user_id=str(ObjectId()),
+        )
+        for number in range(count)
+    ]
+
+
+def _legacy_encode(message: EventMessage) -> bytes:
+    return json.dumps(message.model_dump(mode="json")).encode()
+
+
+def _time_per_op(func, items, iterations: int) -> float:
+    """Mean nanoseconds per call over ``iterations`` calls."""
+    size = len(items)
+    started = perf_counter_ns()
+    for number in range(iterations):
+        func(items[number % size])
+    return (perf_counter_ns() - started) / iterations
+
+
+def run(iterations: int) -> dict:
+    messages = _messages(256)
+    encoders = {"legacy": (_legacy_encode, CODECS["json"].decode)}
+    encoders.update(
+        (name, (codec.encode, codec.decode)) for name, codec in CODECS.items()
+    )
+    results = {}
+    for name, (encode, decode) in encoders.items():
+        bodies = [encode(message) for message in messages]
+        results[name] = {
+            "encode_ns": round(_time_per_op(encode, messages, iterations)),
+            "decode_ns": round(_time_per_op(decode, bodies, iterations)),
+            "mean_bytes": round(sum(map(len, bodies)) / len(bodies), 1),
+        }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "iterations": iterations,
+        },
+        "codecs": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=20000)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations)
+    for name, result in report["codecs"].items():
+        print(
+            f"{name:>8}: encode {result['encode_ns']:>7} ns  "
+            f"decode {result['decode_ns']:>7} ns  "
+            f"{result['mean_bytes']:>6} bytes"
+        )
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
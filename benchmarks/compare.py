@@ -0,0 +1,59 @@
+"""Compare two benchmark reports and fail on regressions.
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+
+Exits with status 1 when any scenario's p95 latency grows, or its
+throughput drops, by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path) as fp:
+        return json.load(fp)["scenarios"]
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"{'scenario':<16}{'p95 base':>12}{'p95 head':>12}"
+          f"{'rps base':>12}{'rps head':>12}")
+    for name, head_stats in head.items():
+        base_stats = base.get(name)
+        if not base_stats or not head_stats.get("requests"):
+            continue
+        p95_base = base_stats["latency_ms"]["p95"]
+        p95_head = head_stats["latency_ms"]["p95"]
+        rps_base = base_stats["throughput_rps"] or 0
+        rps_head = head_stats["throughput_rps"] or 0
+        print(f"{name:<16}{p95_base:>12.2f}{p95_head:>12.2f}"
+              f"{rps_base:>12.1f}{rps_head:>12.1f}")
+
+        if p95_base and p95_head > p95_base * (1 + threshold):
+            regressions.append(f"{name}: p95 {p95_base} -> {p95_head} ms")
+        if rps_base and rps_head < rps_base * (1 - threshold):
+            regressions.append(f"{name}: throughput {rps_base} -> {rps_head}")
+        if head_stats["errors"] > base_stats.get("errors", 0):
+            regressions.append(
+                f"{name}: errors {base_stats.get('errors', 0)} -> "
+                f"{head_stats['errors']}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    regressions = compare(_load(args.base), _load(args.head), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
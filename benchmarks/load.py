@@ -0,0 +1,190 @@
+"""Drive a running service with a named load profile.
+
+    python -m benchmarks.load read-heavy --base-url http://localhost:8000 \\
+        --concurrency 64 --duration 60 -o load.json
+
+Profiles log in as users created by ``benchmarks.seed``. The JSON report has
+the same layout as ``benchmarks.run`` and works with ``benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks.measure import run_mix
+from benchmarks.seed import SEED_PASSWORD, SEED_USERNAME
+
+PROFILES: dict[str, dict[str, float]] = {
+    # clients polling the feed with time-window filters
+    "read-heavy": {"list_events": 80, "get_event": 20},
+    # organisers publishing and editing events, attendees subscribing
+    "write-burst": {"create_event": 60, "patch_event": 25, "subscribe": 15},
+    # mass re-login, e.g. after a token secret rotation
+    "login-storm": {"login": 100},
+}
+
+
+class LoadClient:
+
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.tokens: list[str] = []
+        self.event_ids: list[str] = []
+
+    def _headers(self, i: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[i % len(self.tokens)]}"}
+
+    def _username(self, i: int) -> str:
+        # stride over the seeded users to stay below the per-user rate limit
+        return SEED_USERNAME.format(i * 7919 % self.args.users)
+
+    async def prepare(self) -> None:
+        for i in range(self.args.sessions):
+            response = await self.client.post(
+                "/api/v1/auth/login",
+                json={"username": self._username(i), "password": SEED_PASSWORD},
+            )
+            response.raise_for_status()
+            self.tokens.append(response.json()["access_token"])
+        for page in range(1, 11):
+            response = await self.client.get(
+                "/api/v1/events/", headers=self._headers(page),
+                params={"page": page, "page_size": 50},
+            )
+            response.raise_for_status()
+            self.event_ids.extend(item["id"] for item in response.json()["items"])
+
+    async def login(self, i: int) -> bool:
+        response = await self.client.post(
+            "/api/v1/auth/login",
+            json={"username": self._username(i), "password": SEED_PASSWORD},
+        )
+        return response.status_code == 200
+
+    async def list_events(self, i: int) -> bool:
+        start = datetime.now(tz=timezone.utc) + timedelta(
+            days=self.rng.randint(-30, 60)
+        )
+        response = await self.client.get(
+            "/api/v1/events/",
+            headers=self._headers(i),
+            params={
+                "filters.start_time.min": start.isoformat(),
+                "filters.start_time.max": (start + timedelta(days=7)).isoformat(),
+                "page": self.rng.randint(1, 5),
+                "page_size": self.rng.choice((10, 20, 50)),
+            },
+        )
+        return response.status_code == 200
+
+    async def get_event(self, i: int) -> bool:
+        event_id = self.rng.choice(self.event_ids)
+        response = await self.client.get(
+            f"/api/v1/events/{event_id}", headers=self._headers(i)
+        )
+        return response.status_code == 200
+
+    async def create_event(self, i: int) -> bool:
+        start = datetime.now(tz=timezone.utc) + timedelta(
+            days=self.rng.uniform(1, 90)
+        )
+        response = await self.client.post(
+            "/api/v1/events/",
+            headers=self._headers(i),
+            json={
+                "title": f"Load event {uuid.uuid4().hex[:8]}",
+                "description": "Load profile generated event",
+                "location": "Online",
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(hours=2)).isoformat(),
+                "tags": ["load"],
+            },
+        )
+        if response.status_code == 200:
+            self.event_ids.append(response.json()["id"])
+        return response.status_code == 200
+
+    async def patch_event(self, i: int) -> bool:
+        event_id = self.rng.choice(self.event_ids)
+        response = await self.client.patch(
+            f"/api/v1/events/{event_id}",
+            headers=self._headers(i),
+            json={"title": f"Load event {i}"},
+        )
+        return response.status_code == 200
+
+    async def subscribe(self, i: int) -> bool:
+        event_id = self.rng.choice(self.event_ids)
+        response = await self.client.post(
+            f"/api/v1/events/{event_id}/subscribe", headers=self._headers(i)
+        )
+        return response.status_code == 200
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        load = LoadClient(client, args)
+        await load.prepare()
+        weights = PROFILES[args.profile]
+        measurements = await run_mix(
+            {name: getattr(load, name) for name in weights},
+            weights,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            seed=args.seed,
+        )
+    return {
+        "meta": {
+            "profile": args.profile,
+            "base_url": args.base_url,
+            "created_at": datetime.now(tz=timezone.utc).isoformat(),
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": {
+            name: measurement.summary()
+            for name, measurement in measurements.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("profile", choices=sorted(PROFILES))
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=30)
+    parser.add_argument(
+        "--users", type=int, default=5000,
+        help="number of users created by benchmarks.seed",
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=50,
+        help="users logged in up front to sign read/write requests",
+    )
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Latency/throughput collection shared by the benchmark tools."""
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+@dataclass
+class Measurement:
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    duration: float = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        if count == 0:
+            return {"requests": 0, "errors": self.errors}
+        ordered = sorted(self.latencies)
+        if count > 1:
+            cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = ordered[0]
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "duration_s": round(self.duration, 4),
+            "throughput_rps": round(count / self.duration, 2)
+            if self.duration else None,
+            "latency_ms": {
+                "mean": round(statistics.fmean(ordered) * 1000, 3),
+                "p50": round(p50 * 1000, 3),
+                "p95": round(p95 * 1000, 3),
+                "p99": round(p99 * 1000, 3),
+                "max": round(ordered[-1] * 1000, 3),
+            },
+        }
+
+
+async def run_concurrent(
+    name: str,
+    operation: Callable[[int], Awaitable[bool]],
+    *,
+    iterations: int,
+    concurrency: int,
+) -> Measurement:
+    """Run ``operation(i)`` for ``i`` in ``range(iterations)``.
+
+    At most ``concurrency`` operations are in flight. The operation returns
+    ``True`` on success; raised exceptions are recorded as errors.
+    """
+    measurement = Measurement(name=name)
+    counter = iter(range(iterations))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                ok = await operation(i)
+            except Exception:
+                ok = False
+            measurement.record(time.perf_counter() - started, ok)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    measurement.duration = time.perf_counter() - started
+    return measurement
+
+
+async def run_mix(
+    operations: dict[str, Callable[[int], Awaitable[bool]]],
+    weights: dict[str, float],
+    *,
+    duration: float,
+    concurrency: int,
+    seed: int = 0,
+) -> dict[str, Measurement]:
+    """Run a weighted mix of operations for ``duration`` seconds.
+
+    Each of the ``concurrency`` workers picks the next operation from
+    ``weights`` (closed loop: a worker waits for its previous request).
+    """
+    names = list(weights)
+    measurements = {name: Measurement(name=name) for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def worker(number: int):
+        rng = random.Random(f"{seed}:{number}")
+        i = number
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, [weights[n] for n in names])[0]
+            started = time.perf_counter()
+            try:
+                ok = await operations[name](i)
+            except Exception:
+                ok = False
+            measurements[name].record(time.perf_counter() - started, ok)
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+    for measurement in measurements.values():
+        measurement.duration = elapsed
+    return measurements
@@ -0,0 +1,83 @@
+"""Run the in-process API benchmark and emit a JSON report.
+
+    python -m benchmarks.run --iterations 200 --concurrency 16 -o bench.json
+
+Compare two reports with ``python -m benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.measure import run_concurrent
+from benchmarks.scenarios import SCENARIOS, ApiScenarios
+from benchmarks.stack import local_stack
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {}
+    async with local_stack(mongo_uri=args.mongo_uri) as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            scenarios = ApiScenarios(client, run_id=uuid.uuid4().hex[:8])
+            for name in SCENARIOS:
+                measurement = await run_concurrent(
+                    name,
+                    getattr(scenarios, name),
+                    iterations=args.iterations,
+                    concurrency=args.concurrency,
+                )
+                results[name] = measurement.summary()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(tz=timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--mongo-uri", default="mongodb://localhost:27017/events_bench",
+        help="local mongod and database to use, dropped afterwards",
+    )
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""HTTP scenarios exercised by the benchmark runner.
+
+Scenarios are stateful and run in the declared order: users created by
+``register`` are logged in by ``login``, events created by ``create_event``
+are read, patched, subscribed to and finally deleted.
+"""
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+PASSWORD = "Bench_pass1!"
+
+
+class ApiScenarios:
+
+    def __init__(self, client: httpx.AsyncClient, run_id: str):
+        self.client = client
+        self.run_id = run_id
+        self.usernames: list[str] = []
+        self.tokens: list[str] = []
+        self.event_ids: list[str] = []
+
+    def _headers(self, i: int) -> dict[str, str]:
+        token = self.tokens[i % len(self.tokens)]
+        return {"Authorization": f"Bearer {token}"}
+
+    def _event_id(self, i: int) -> str:
+        return self.event_ids[i % len(self.event_ids)]
+
+    async def register(self, i: int) -> bool:
+        username = f"bench_{self.run_id}_{i}"
+        response = await self.client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": f"{username}@example.com",
+                "username": username,
+                "password": PASSWORD,
+                "full_name": f"Bench User {i}",
+            },
+        )
+        if response.status_code == 200:
+            self.usernames.append(username)
+        return response.status_code == 200
+
+    async def login(self, i: int) -> bool:
+        # every user logs in once to stay below the login rate limiter
+        username = self.usernames[i % len(self.usernames)]
+        response = await self.client.post(
+            "/api/v1/auth/login",
+            json={"username": username, "password": PASSWORD},
+        )
+        if response.status_code == 200:
+            self.tokens.append(response.json()["access_token"])
+        return response.status_code == 200
+
+    async def create_event(self, i: int) -> bool:
+        start = datetime.now(tz=timezone.utc) + timedelta(days=30, hours=i)
+        response = await self.client.post(
+            "/api/v1/events/",
+            headers=self._headers(i),
+            json={
+                "title": f"Bench event {i}",
+                "description": "Benchmark generated event",
+                "location": "Benchmark",
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(hours=2)).isoformat(),
+                "tags": ["bench"],
+                "max_attendees": 100,
+            },
+        )
+        if response.status_code == 200:
+            self.event_ids.append(response.json()["id"])
+        return response.status_code == 200
+
+    async def list_events(self, i: int) -> bool:
+        response = await self.client.get(
+            "/api/v1/events/",
+            headers=self._headers(i),
+            params={"page": i % 5 + 1, "page_size": 10},
+        )
+        return response.status_code == 200
+
+    async def get_event(self, i: int) -> bool:
+        response = await self.client.get(
+            f"/api/v1/events/{self._event_id(i)}", headers=self._headers(i)
+        )
+        return response.status_code == 200
+
+    async def patch_event(self, i: int) -> bool:
+        response = await self.client.patch(
+            f"/api/v1/events/{self._event_id(i)}",
+            headers=self._headers(i),
+            json={"title": f"Bench event {i} (updated)"},
+        )
+        return response.status_code == 200
+
+    async def subscribe(self, i: int) -> bool:
+        response = await self.client.post(
+            f"/api/v1/events/{self._event_id(i)}/subscribe",
+            headers=self._headers(i),
+        )
+        return response.status_code == 200
+
+    async def delete_event(self, i: int) -> bool:
+        if i >= len(self.event_ids):
+            return False
+        response = await self.client.delete(
+            f"/api/v1/events/{self.event_ids[i]}", headers=self._headers(i)
+        )
+        return response.status_code == 200
+
+
+SCENARIOS = (
+    "register",
+    "login",
+    "create_event",
+    "list_events",
+    "get_event",
+    "patch_event",
+    "subscribe",
+    "delete_event",
+)
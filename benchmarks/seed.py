@@ -0,0 +1,207 @@
+"""Seed MongoDB and Redis with production-scale synthetic data.
+
+    python -m benchmarks.seed --users 5000 --events 2000000 --parallel 8
+
+Data is generated from ``--seed`` deterministically: every batch has its own
+random stream, so the output does not depend on ``--parallel``. All seeded
+users share ``SEED_PASSWORD`` so that load profiles can log in as them.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from beanie import init_beanie
+from bson import ObjectId
+from pymongo import AsyncMongoClient
+from redis.asyncio.client import Redis
+
+from src.core.provider import CoreProvider
+from src.services.auth.models import User, build_login_keys
+from src.services.auth.repository import AuthRepository
+from src.services.auth.service import AuthService
+from src.services.events.models import Event
+from src.services.events.repository import EventRepository
+from src.services.events.types import EventStatus
+
+SEED_PASSWORD = "Seed_pass1!"
+SEED_USERNAME = "seed_user_{}"
+
+
+def weighted(spec: str) -> dict[str, float]:
+    """Parse ``name=weight,name=weight`` into a mapping."""
+    pairs = (item.split("=") for item in spec.split(",") if item)
+    return {name.strip(): float(weight) for name, weight in pairs}
+
+
+def batches(total: int, size: int):
+    for number, start in enumerate(range(0, total, size)):
+        yield number, start, min(size, total - start)
+
+
+class Generator:
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+        self.tags = weighted(args.tags)
+        self.statuses = weighted(args.statuses)
+        self.user_ids = [
+            self.user_id(i) for i in range(args.users)
+        ]
+
+    def rng(self, kind: str, number: int) -> random.Random:
+        return random.Random(f"{self.args.seed}:{kind}:{number}")
+
+    def user_id(self, i: int) -> ObjectId:
+        # stable ids let events reference users seeded by another batch
+        return ObjectId(f"{self.args.seed % 2 ** 32:08x}{i:016x}")
+
+    def users(self, number: int, start: int, count: int, password_hash: str):
+        for i in range(start, start + count):
+            username = SEED_USERNAME.format(i)
+            email = f"{username}@example.com"
+            yield User(
+                id=self.user_id(i),
+                email=email,
+                username=username,
+                login_keys=build_login_keys(username, email),
+                password_hash=password_hash,
+                full_name=f"Seed User {i}",
+                created_at=self.now,
+                updated_at=self.now,
+            )
+
+    def creator(self, rng: random.Random) -> ObjectId:
+        # a few prolific creators and a long tail, as in production
+        index = int(rng.paretovariate(self.args.creator_skew)) - 1
+        return self.user_ids[index % len(self.user_ids)]
+
+    def start_time(self, rng: random.Random) -> datetime:
+        args = self.args
+        if rng.random() < args.near_term_share:
+            offset = rng.uniform(0, 30)
+        else:
+            offset = rng.uniform(-args.past_days, args.future_days)
+        return self.now + timedelta(days=offset)
+
+    def events(self, number: int, count: int):
+        rng = self.rng("events", number)
+        tag_names, tag_weights = zip(*self.tags.items())
+        status_names, status_weights = zip(*self.statuses.items())
+        for _ in range(count):
+            start = self.start_time(rng)
+            yield Event(
+                id=ObjectId(rng.randbytes(12)),
+                title=f"Event {rng.randrange(10 ** 6)}",
+                description="x" * rng.randint(20, 500),
+                location=rng.choice(("Berlin", "Paris", "Online", "London")),
+                start_time=start,
+                end_time=start + timedelta(hours=rng.uniform(1, 8)),
+                created_by=self.creator(rng),
+                tags=sorted(set(rng.choices(
+                    tag_names, tag_weights, k=rng.randint(0, self.args.max_tags)
+                ))),
+                max_attendees=rng.randint(10, 5000),
+                status=EventStatus(rng.choices(
+                    status_names, status_weights
+                )[0]),
+            )
+
+    def subscribers(self, number: int, events: list[Event]):
+        rng = self.rng("subscribers", number)
+        for event in events:
+            if rng.random() >= self.args.subscribed_share:
+                continue
+            size = min(
+                int(rng.paretovariate(1.1)) * 10, self.args.max_subscribers,
+                len(self.user_ids),
+            )
+            members = rng.sample(self.user_ids, size)
+            yield event, [str(user_id) for user_id in members]
+
+
+async def seed(args: argparse.Namespace) -> None:
+    config = CoreProvider().get_config()
+    client = AsyncMongoClient(args.mongo_uri or config.database.db_uri)
+    await init_beanie(
+        database=client.get_default_database(config.database.db_name),
+        document_models=[User, Event],
+    )
+    redis = Redis.from_url(args.redis_url or config.redis.redis_uri)
+    generator = Generator(args)
+    limiter = asyncio.Semaphore(args.parallel)
+    # hashing once keeps seeding fast while producing real bcrypt hashes
+    password_hash = AuthService()._hash_password(SEED_PASSWORD)
+
+    async def insert_users(number: int, start: int, count: int):
+        async with limiter:
+            await AuthRepository().add_many(
+                list(generator.users(number, start, count, password_hash))
+            )
+
+    async def insert_events(number: int, start: int, count: int):
+        async with limiter:
+            events = list(generator.events(number, count))
+            await EventRepository().add_many(events)
+            async with redis.pipeline(transaction=False) as pipe:
+                for event, members in generator.subscribers(number, events):
+                    key = f"event:{event.id}:subscribers"
+                    pipe.sadd(key, *members)
+                    pipe.expireat(key, event.end_time)
+                await pipe.execute()
+
+    for label, total, job in (
+        ("users", args.users, insert_users),
+        ("events", args.events, insert_events),
+    ):
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            job(number, start, count)
+            for number, start, count in batches(total, args.batch_size)
+        ))
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {total} in {elapsed:.1f}s "
+              f"({total / max(elapsed, 1e-9):.0f}/s)")
+
+    await redis.aclose()
+    await client.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--tags", default="tech=5,music=3,business=2,sport=2,art=1,food=1"
+    )
+    parser.add_argument("--max-tags", type=int, default=3)
+    parser.add_argument(
+        "--statuses", default="scheduled=80,completed=15,canceled=5"
+    )
+    parser.add_argument("--past-days", type=float, default=180)
+    parser.add_argument("--future-days", type=float, default=365)
+    parser.add_argument(
+        "--near-term-share", type=float, default=0.3,
+        help="share of events starting within the next 30 days",
+    )
+    parser.add_argument(
+        "--creator-skew", type=float, default=1.2,
+        help="pareto alpha of events per creator, lower is more skewed",
+    )
+    parser.add_argument("--subscribed-share", type=float, default=0.1)
+    parser.add_argument("--max-subscribers", type=int, default=50_000)
+    parser.add_argument("--mongo-uri", default=None)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args(argv)
+    if args.users <= 0:
+        parser.error("--users must be positive")
+    asyncio.run(seed(args))
+
+
+if __name__ == "__main__":
+    main()
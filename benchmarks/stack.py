@@ -0,0 +1,104 @@
+"""In-process stand-ins for the service dependencies.
+
+The benchmark suite boots the real ``create()`` application, but swaps the
+external services for local replacements:
+
+- MongoDB: a local ``mongod``, the benchmark database is dropped on exit;
+- Redis: ``fakeredis``;
+- RabbitMQ: FastStream's ``TestRabbitBroker``.
+
+mongomock-motor is not used: Beanie 2 awaits ``aggregate()``, which it does
+not support. fakeredis is benchmark-only and not part of the lock file:
+
+    pip install fakeredis
+"""
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator
+from unittest import mock
+
+from fastapi import FastAPI
+from faststream.rabbit import RabbitBroker, TestRabbitBroker
+from pymongo import AsyncMongoClient
+
+
+def _require(module: str, package: str):
+    try:
+        return __import__(module, fromlist=["*"])
+    except ImportError as exc:
+        raise SystemExit(
+            f"Benchmarks need '{package}' installed: pip install {package}"
+        ) from exc
+
+
+def _fake_redis_factory():
+    fakeredis = _require("fakeredis", "fakeredis")
+    server = fakeredis.FakeServer()
+
+    class FakeRedisFactory:
+        """Mimics ``Redis.from_url`` while sharing one in-memory server."""
+
+        @staticmethod
+        def from_url(url: str, **kwargs):
+            return fakeredis.FakeAsyncRedis(server=server)
+
+    return FakeRedisFactory
+
+
+class _BenchMongoClient:
+    """One shared client pinned to the benchmark database.
+
+    The application closes its client on shutdown; the stand-in keeps it
+    open until the benchmark database has been dropped.
+    """
+
+    def __init__(self, client, db_name: str):
+        self._client = client
+        self._db_name = db_name
+
+    def __getitem__(self, name: str):
+        return self._client[self._db_name]
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+    async def close(self) -> None:
+        pass
+
+
+def _mongo_client_factory(mongo_uri: str, db_name: str):
+    shared = _BenchMongoClient(AsyncMongoClient(mongo_uri), db_name)
+    return lambda *args, **kwargs: shared
+
+
+@asynccontextmanager
+async def local_stack(mongo_uri: str) -> AsyncIterator[FastAPI]:
+    """Yield the started application wired to the local stand-ins.
+
+    ``mongo_uri`` names the database to use (``events_bench`` without a
+    path), it is dropped on exit.
+    """
+    db_name = mongo_uri.rsplit("/", 1)[-1].split("?")[0] or "events_bench"
+    mongo_client = _mongo_client_factory(mongo_uri, db_name)
+
+    async with AsyncExitStack() as stack:
+        stack.enter_context(
+            mock.patch("src.core.provider.Redis", _fake_redis_factory())
+        )
+        stack.enter_context(
+            mock.patch(
+                "src.core.database.provider.AsyncMongoClient", mongo_client
+            )
+        )
+
+        from src.container import container
+        from src.main import app
+
+        broker = await container.get(RabbitBroker)
+        await stack.enter_async_context(TestRabbitBroker(broker))
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        try:
+            yield app
+        finally:
+            shared = mongo_client()
+            await shared.drop_database(db_name)
+            await shared._client.close()
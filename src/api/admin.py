@@ -0,0 +1,59 @@
+import asyncio
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from starlette.responses import PlainTextResponse
+
+from src.core.auth.setup import CurrentAdmin
+from src.core.config import Config
+from src.core.database.slowlog import SLOW_QUERIES
+from src.core.manager import ServiceManager
+from src.core.profiling.middleware import PROFILE_ID_PATTERN
+from src.services.auth.schemas import ImportReport
+
+router = APIRouter(
+    prefix="/v1/admin", tags=["admin"], route_class=DishkaRoute
+)
+
+
+@router.get("/slow-queries")
+async def slow_queries(
+    _: CurrentAdmin,
+    limit: Annotated[int, Query(gt=0, le=200)] = 20
+) -> list[dict]:
+    """
+    Slowest query shapes of this worker by cumulative time.
+    """
+    return SLOW_QUERIES.top(limit)
+
+
+@router.get("/profiles/{request_id}")
+async def get_profile(
+    _: CurrentAdmin,
+    config: FromDishka[Config],
+    request_id: str
+) -> PlainTextResponse:
+    """
+    Folded stacks of a profiled request, ready for flamegraph.pl/speedscope.
+    """
+    path = Path(config.profiling.output_dir) / f"{request_id}.folded"
+    if not PROFILE_ID_PATTERN.match(request_id) or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    return PlainTextResponse(await asyncio.to_thread(path.read_text))
+
+
+@router.post("/users/import")
+async def import_users(
+    _: CurrentAdmin,
+    manager: FromDishka[ServiceManager],
+    request: Request
+) -> ImportReport:
+    """
+    Creates users from an NDJSON body, one registration record per line.
+    The body is read as it arrives; rejected rows are reported by line.
+    """
+    return await manager.auth.import_users(request.stream())
@@ -1,15 +1,22 @@
+from datetime import datetime, timezone
 from functools import wraps
+from http import HTTPStatus
 from typing import Annotated
 
 from fastapi import APIRouter
+from starlette.responses import JSONResponse
 from dishka.integrations.fastapi import DishkaRoute
 from dishka import FromComponent
 
 from src.core.application.utils import rate_limiter
 from src.core.auth.setup import CurrentUser
+from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.brokers.topology import USERS_UPDATED
 from src.core.manager import ServiceManager
+from src.services.auth.messages import UserMessage
 from src.services.auth.schemas import (
-    RegisterRequest, LoginRequest, TokenResponse, MeResponse, UserResponse
+    RegisterRequest, LoginRequest, TokenResponse, MeResponse, UserResponse,
+    ProfileUpdate, RefreshRequest
 )
 
 router = APIRouter(
@@ -38,6 +45,34 @@ async def login(
 ) -> TokenResponse:
     return await manager.auth.login(request=request)
 
+@router.post("/refresh")
+async def refresh(
+    manager: Annotated[
+        ServiceManager,
+        FromComponent("")
+    ],
+    request: RefreshRequest
+) -> TokenResponse:
+    """
+    Exchanges a refresh token for a new access and refresh token pair.
+    Each refresh token can be used once.
+    """
+    return await manager.auth.refresh(request.refresh_token)
+
+@router.post("/logout")
+async def logout(
+    manager: Annotated[
+        ServiceManager,
+        FromComponent("")
+    ],
+    user: CurrentUser
+):
+    """
+    Ends the session: its refresh token and access tokens stop working.
+    """
+    await manager.auth.logout(user)
+    return JSONResponse(content={"success": True}, status_code=HTTPStatus.OK)
+
 @router.get("/me")
 async def me(
     manager: Annotated[
@@ -50,3 +85,33 @@ async def me(
     Provides information about the current user.
     """
     return await manager.auth.get_user_info(user.user_id)
+
+
+@router.patch("/me")
+async def update_me(
+    manager: Annotated[
+        ServiceManager,
+        FromComponent("")
+    ],
+    publisher: Annotated[
+        RabbitMqPublisher,
+        FromComponent("")
+    ],
+    user: CurrentUser,
+    request: ProfileUpdate
+) -> MeResponse:
+    """
+    Updates the profile of the current user. The creator shown on the
+    user's events is refreshed in the background.
+    """
+    profile, changed = await manager.auth.update_profile(
+        user.user_id, request
+    )
+    if changed:
+        await publisher.publish(
+            UserMessage(
+                id=user.user_id, timestamp=datetime.now(tz=timezone.utc)
+            ),
+            USERS_UPDATED
+        )
+    return profile
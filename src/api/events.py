@@ -2,20 +2,24 @@ from datetime import datetime, timezone
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, status
 from starlette.responses import JSONResponse
 
-from dishka.integrations.fastapi import FromDishka, DishkaRoute
+from dishka.integrations.fastapi import FromDishka, DishkaRoute, inject
 
+from src.core.application.utils import IDEMPOTENCY_HEADER, idempotent
+from src.core.auth.schemas import UserInfo
 from src.core.auth.setup import CurrentUser
 from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.database.utils import parse_fields
 from src.core.exception.custom import UserError
 from src.core.exception.reason import Reason
 from src.core.manager import ServiceManager
-from src.core.schemas import TableRequest
+from src.services.events.feed import FeedHub
 from src.services.events.messages import EventMessage
 from src.services.events.schemas import (
-    EventCreate, EventResponse, EventListFilters, EventUpdate
+    EventBatchItem, EventBatchRequest, EventBatchResponse, EventCreate,
+    EventResponse, EventListRequest, EventStatsResponse, EventUpdate
 )
 from src.services.redis.service import RedisService
 
@@ -23,13 +27,24 @@ router = APIRouter(
     prefix="/v1/events", tags=["events"], route_class=DishkaRoute
 )
 
+IdempotencyKey = Annotated[
+    str | None, Header(alias=IDEMPOTENCY_HEADER, max_length=255)
+]
+Fields = Annotated[
+    str | None,
+    Query(max_length=500, description="Comma separated EventResponse fields")
+]
+
 
 @router.post("/")
+@idempotent(scope="events.create")
 async def create_event(
     user: CurrentUser,
     manager: FromDishka[ServiceManager],
     publisher: FromDishka[RabbitMqPublisher],
-    request: EventCreate
+    feed: FromDishka[FeedHub],
+    request: EventCreate,
+    idempotency_key: IdempotencyKey = None
 ) -> EventResponse:
     event_data = await manager.event.create_event(
         user_id=user.user_id, request=request
@@ -37,31 +52,89 @@ async def create_event(
     event_message = EventMessage(
         id=str(event_data.id), title=event_data.title, action="created",
         timestamp=datetime.now(tz=timezone.utc),
-        user_id=str(event_data.created_by.id)
+        user_id=str(event_data.created_by.id), version=event_data.version
     )
     await publisher.publish(
-        event_message.model_dump(),
+        event_message,
         "events.created",
     )
+    await feed.publish(event_message)
     return event_data
 
 
+@router.websocket("/ws")
+@inject
+async def events_feed(websocket: WebSocket, feed: FromDishka[FeedHub]):
+    """
+    Live feed of event changes. Clients send
+    {"action": "subscribe" | "unsubscribe", "event_ids": [...]} or
+    {"action": "filter", "filter": {"actions": [...], "user_id": ..., "title_contains": ...}}
+    and answer {"type": "ping"} frames with {"action": "pong"}.
+    """
+    try:
+        user = await websocket.state.dishka_container.get(
+            UserInfo, component="session_auth"
+        )
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    await feed.serve(websocket, user)
+
+
+@router.get("/stats")
+async def get_stats(
+    _: CurrentUser,
+    manager: FromDishka[ServiceManager]
+) -> EventStatsResponse:
+    """
+    Event counts per status, start day (UTC) and creator id, read from
+    counters maintained on writes.
+    """
+    return await manager.event.get_stats()
+
+
 @router.get("/{event_id}")
 async def get_event(
     _: CurrentUser,
     manager: FromDishka[ServiceManager],
-    event_id: str
+    event_id: str,
+    fields: Fields = None
 ) -> EventResponse:
-    return await manager.event.get_by_id(event_id)
+    selected = parse_fields(EventResponse, fields)
+    event = await manager.event.get_by_id(event_id, fields=selected)
+    if selected is None:
+        return event
+    # a partial event does not validate as EventResponse
+    return JSONResponse(content=event.model_dump(mode="json"))
+
+
+@router.post("/batch-get")
+async def batch_get_events(
+    _: CurrentUser,
+    manager: FromDishka[ServiceManager],
+    request: EventBatchRequest
+) -> EventBatchResponse:
+    events = await manager.event.get_by_ids(request.ids)
+    return EventBatchResponse(items=[
+        EventBatchItem(
+            id=event_id, found=event_id in events, event=events.get(event_id)
+        )
+        for event_id in request.ids
+    ])
 
 
 @router.get("/")
 async def list_events(
     _: CurrentUser,
     manager: FromDishka[ServiceManager],
-    request: Annotated[TableRequest[EventListFilters], Query()]
+    request: Annotated[EventListRequest, Query()]
 ):
-    return await manager.event.list_events(request=request)
+    selected = parse_fields(EventResponse, request.fields)
+    page = await manager.event.list_events(request=request, fields=selected)
+    if selected is None:
+        return page
+    return JSONResponse(content=page.model_dump(mode="json"))
 
 
 @router.patch("/{event_id}")
@@ -69,10 +142,11 @@ async def update_event(
     _: CurrentUser,
     manager: FromDishka[ServiceManager],
     publisher: FromDishka[RabbitMqPublisher],
+    feed: FromDishka[FeedHub],
     event_id: str,
     request: EventUpdate
 ) -> EventResponse:
-    event_data = await manager.event.update_by_id(
+    event_data, changes = await manager.event.update_by_id(
         event_id=event_id, request=request
     )
     event_message = EventMessage(
@@ -80,11 +154,14 @@ async def update_event(
         title=event_data.title,
         action="updated",
         timestamp=datetime.now(tz=timezone.utc),
-        user_id=str(event_data.created_by.id)
+        user_id=str(event_data.created_by.id),
+        version=event_data.version,
+        changes=changes
     )
     await publisher.publish(
-        event_message.model_dump(), "events.updated"
+        event_message, "events.updated"
     )
+    await feed.publish(event_message)
     return event_data
 
 
@@ -93,6 +170,7 @@ async def delete_event(
     _: CurrentUser,
     manager: FromDishka[ServiceManager],
     publisher: FromDishka[RabbitMqPublisher],
+    feed: FromDishka[FeedHub],
     event_id: str
 ):
     event_data = await manager.event.delete_by_id(event_id=event_id)
@@ -101,19 +179,24 @@ async def delete_event(
         title=event_data.title,
         action="deleted",
         timestamp=datetime.now(tz=timezone.utc),
-        user_id=str(event_data.created_by.id)
+        user_id=str(event_data.created_by.id),
+        # a deletion supersedes every update of the event
+        version=event_data.version + 1
     )
     await publisher.publish(
-        event_message.model_dump(), "events.deleted"
+        event_message, "events.deleted"
     )
+    await feed.publish(event_message)
     return event_data
 
 @router.post("/{event_id}/subscribe")
+@idempotent(scope="events.subscribe")
 async def subscribe(
     user: CurrentUser,
     manager: FromDishka[ServiceManager],
     redis_service: FromDishka[RedisService],
-    event_id: str
+    event_id: str,
+    idempotency_key: IdempotencyKey = None
 ):
     if not await manager.event.get_by_id(event_id):
         raise UserError(Reason.EVENT_NOT_FOUND)
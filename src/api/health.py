@@ -0,0 +1,44 @@
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, status
+from faststream.rabbit import RabbitBroker
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio.client import Redis
+from starlette.responses import JSONResponse
+
+from src.core.application.health import HEALTH
+from src.core.application.lifecycle import LIFECYCLE
+from src.core.config import Config
+
+router = APIRouter(prefix="/health", tags=["service"], route_class=DishkaRoute)
+
+
+@router.get("/live", include_in_schema=False)
+async def live() -> dict:
+    """
+    The worker process is up and its event loop responds.
+    """
+    return {"status": "alive", "state": LIFECYCLE.state}
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready(
+    config: FromDishka[Config],
+    database: FromDishka[AsyncDatabase],
+    redis: FromDishka[Redis],
+    broker: FromDishka[RabbitBroker],
+) -> JSONResponse:
+    """
+    Ready when the worker is not draining and Mongo, Redis and the broker
+    answer within the timeout without saturated connection pools.
+    """
+    is_ready, report = await HEALTH.readiness(
+        config, database=database, redis=redis, broker=broker
+    )
+    return JSONResponse(
+        report,
+        status_code=(
+            status.HTTP_200_OK if is_ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        headers={"Cache-Control": "no-store"},
+    )
@@ -0,0 +1,20 @@
+import asyncio
+
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.core.metrics.registry import REGISTRY
+
+router = APIRouter(tags=["service"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus metrics merged across all workers.
+    """
+    workers = await asyncio.to_thread(REGISTRY.read_workers)
+    return Response(
+        content=REGISTRY.render(workers),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,7 +1,4 @@
-from dishka import make_async_container
+from src.core.provider import core_container
 
-from src.core.provider import CORE_PROVIDERS
-
-container = make_async_container(
-    *CORE_PROVIDERS
-)
\ No newline at end of file
+# routes and services share one container, hence one set of client pools
+container = core_container
@@ -1,21 +1,64 @@
 import asyncio
+import logging
 from contextlib import asynccontextmanager
 from typing import Callable, Coroutine, Iterable
 
 from dishka.integrations.fastapi import setup_dishka
 from beanie import init_beanie
 from fastapi import FastAPI, APIRouter
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio.client import Redis
 
+from src.core.application.lifecycle import LIFECYCLE, LifecycleMiddleware
+
+from src.core.auth.admin import AdminAuthBackend
+from src.core.auth.revocation import RevocationList
+from src.core.brokers.rabbitmq import RabbitMqPublisher
 from src.core.config import Config
+from src.core.database.slowlog import SLOW_QUERIES
+from src.core.metrics.loop import LOOP_MONITOR
+from src.core.metrics.middleware import MetricsMiddleware
+from src.core.metrics.registry import REGISTRY
+from src.core.profiling.middleware import ProfilingMiddleware
+from src.core.provider import CoreProvider
 from src.services.auth.models import User
 from src.container import container
 from src.services.events.models import Event
 
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up():
+    """Open the connections a first request would otherwise pay for."""
+    async def ping_mongo():
+        database = await container.get(AsyncDatabase)
+        await database.command("ping")
+
+    async def ping_redis():
+        redis = await container.get(Redis)
+        await redis.ping()
+
+    async def connect_broker():
+        await container.get(RabbitMqPublisher)
+
+    async def load_revocations():
+        await container.get(RevocationList)
+
+    names = ("mongo", "redis", "broker", "revocations")
+    results = await asyncio.gather(
+        ping_mongo(), ping_redis(), connect_broker(), load_revocations(),
+        return_exceptions=True
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.warning("Warm-up of %s failed: %r", name, result)
+
 
 def create(
     *,
     base_router_path: str,
     routers: Iterable[APIRouter],
+    service_routers: Iterable[APIRouter] = (),
     startup_tasks: Iterable[Callable[[], Coroutine]] | None = None,
     shutdown_tasks: Iterable[Callable[[], Coroutine]] | None = None,
     **kwargs
@@ -24,20 +67,62 @@ def create(
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         config = await container.get(Config)
+        if config.metrics.enabled:
+            REGISTRY.start(
+                config.metrics.directory, config.metrics.flush_interval
+            )
+            LOOP_MONITOR.start(
+                interval=config.metrics.loop_lag_interval,
+                blocking_debug=config.metrics.blocking_debug,
+                blocking_threshold=config.metrics.blocking_threshold_ms / 1000,
+            )
+        SLOW_QUERIES.configure(
+            threshold_ms=config.database.slow_query_ms,
+            explain_sample_rate=config.database.explain_sample_rate,
+            max_shapes=config.database.slow_query_shapes,
+        )
         await init_beanie(
-            connection_string=config.database.db_uri,
+            database=await container.get(AsyncDatabase),
             document_models=[User, Event]
         )
         if startup_tasks:
             await asyncio.gather(*[task() for task in startup_tasks])
+        await _warm_up()
+        LIFECYCLE.configure(
+            max_requests=config.server.max_requests,
+            max_requests_jitter=config.server.max_requests_jitter,
+            drain_delay=config.server.drain_delay,
+            graceful_timeout=config.server.graceful_timeout,
+        )
+        LIFECYCLE.install_signal_handlers()
+        LIFECYCLE.mark_ready()
         yield
+        LIFECYCLE.mark_stopped()
         if shutdown_tasks:
             await asyncio.gather(*[task() for task in shutdown_tasks])
+        # runs the finalizers of app-scoped dependencies (feed hub, clients)
+        await container.close()
+        await LOOP_MONITOR.stop()
+        await REGISTRY.stop()
 
     app = FastAPI(lifespan=lifespan, **kwargs)
 
     for router in routers:
         app.include_router(router, prefix=base_router_path)
+    # service endpoints (metrics, health) are served outside the API prefix
+    for router in service_routers:
+        app.include_router(router)
+
+    config = CoreProvider().get_config()
+    app.add_middleware(LifecycleMiddleware, lifecycle=LIFECYCLE)
+    if config.metrics.enabled:
+        app.add_middleware(MetricsMiddleware)
+    if config.profiling.enabled:
+        app.add_middleware(
+            ProfilingMiddleware,
+            config=config.profiling,
+            admin=AdminAuthBackend(token=config.admin.token),
+        )
 
     setup_dishka(container, app)
     return app
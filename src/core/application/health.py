@@ -0,0 +1,143 @@
+"""Dependency probes behind the readiness endpoint."""
+import asyncio
+import os
+from time import monotonic, perf_counter
+from typing import Awaitable
+
+from faststream.rabbit import RabbitBroker
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio.client import Redis
+
+from src.core.application.lifecycle import LIFECYCLE
+from src.core.config import Config
+from src.core.metrics.pools import MONGO_POOL
+
+OK = "ok"
+DEGRADED = "degraded"
+DOWN = "down"
+
+
+class HealthChecker:
+    """Checks Mongo, Redis and the broker in parallel.
+
+    Results are cached for ``health.cache_ttl`` seconds and concurrent
+    probes share one round of checks, so probing does not add load. The
+    worker state is not cached: a draining worker is not ready at once.
+    """
+
+    def __init__(self):
+        self._checked_at = 0.0
+        self._checks: dict[str, dict] | None = None
+        self._pending: asyncio.Task | None = None
+
+    async def readiness(
+        self,
+        config: Config,
+        *,
+        database: AsyncDatabase,
+        redis: Redis,
+        broker: RabbitBroker,
+    ) -> tuple[bool, dict]:
+        checks = await self._cached_checks(config, database, redis, broker)
+        ready = LIFECYCLE.ready and all(
+            check["status"] == OK for check in checks.values()
+        )
+        return ready, {
+            "status": "ready" if ready else "not_ready",
+            "worker": {
+                "pid": os.getpid(),
+                "state": LIFECYCLE.state,
+                "in_flight": LIFECYCLE.in_flight,
+            },
+            "checks": checks,
+        }
+
+    async def _cached_checks(self, config, database, redis, broker):
+        if (
+            self._checks is not None
+            and monotonic() - self._checked_at < config.health.cache_ttl
+        ):
+            return self._checks
+        if self._pending is None:
+            self._pending = asyncio.create_task(
+                self._run_checks(config, database, redis, broker)
+            )
+            self._pending.add_done_callback(self._store)
+        return await asyncio.shield(self._pending)
+
+    def _store(self, task: asyncio.Task):
+        self._pending = None
+        if not task.cancelled() and task.exception() is None:
+            self._checks = task.result()
+            self._checked_at = monotonic()
+
+    async def _run_checks(self, config, database, redis, broker):
+        timeout = config.health.timeout
+        mongo, redis_check, broker_check = await asyncio.gather(
+            self._probe(database.command("ping"), timeout),
+            self._probe(redis.ping(), timeout),
+            self._probe(self._ping_broker(broker, timeout), timeout),
+        )
+        limit = config.health.max_pool_saturation
+        mongo["pool"] = _mongo_pool(config.database.max_pool_size)
+        redis_check["pool"] = _redis_pool(redis)
+        for check in (mongo, redis_check):
+            pool = check["pool"]
+            if (
+                check["status"] == OK
+                and pool is not None
+                and pool["saturation"] >= limit
+                and pool.get("waiting", 1) > 0
+            ):
+                check["status"] = DEGRADED
+        return {"mongo": mongo, "redis": redis_check, "broker": broker_check}
+
+    @staticmethod
+    async def _ping_broker(broker: RabbitBroker, timeout: float):
+        if not await broker.ping(timeout):
+            raise ConnectionError("broker is not connected")
+
+    @staticmethod
+    async def _probe(check: Awaitable, timeout: float) -> dict:
+        started = perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await check
+        except TimeoutError:
+            result = {"status": DOWN, "error": "timeout"}
+        except Exception as exc:
+            result = {"status": DOWN, "error": repr(exc)}
+        else:
+            result = {"status": OK}
+        result["latency_ms"] = round((perf_counter() - started) * 1000, 2)
+        return result
+
+
+def _mongo_pool(max_size: int) -> dict | None:
+    # the pool gauges are fed by listeners installed with metrics enabled
+    in_use = MONGO_POOL.labels("in_use").value
+    waiting = MONGO_POOL.labels("waiting").value
+    open_ = MONGO_POOL.labels("open").value
+    if not open_ and not in_use:
+        return None
+    return {
+        "open": int(open_),
+        "in_use": int(in_use),
+        "waiting": int(waiting),
+        "max": max_size,
+        "saturation": round(in_use / max_size, 3) if max_size else 0.0,
+    }
+
+
+def _redis_pool(redis: Redis) -> dict:
+    pool = redis.connection_pool
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    max_size = pool.max_connections
+    return {
+        "in_use": in_use,
+        "max": max_size,
+        "saturation": round(in_use / max_size, 3) if max_size else 0.0,
+    }
+
+
+HEALTH = HealthChecker()
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import random
+import signal
+import threading
+from enum import StrEnum
+from typing import Callable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# set by ``src.serve`` for workers running under the process supervisor,
+# only those may exit on their own since a replacement will be spawned
+SUPERVISED_ENV = "EVENTS_SERVICE_SUPERVISED"
+
+
+class WorkerState(StrEnum):
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+
+
+class WorkerLifecycle:
+    """Readiness, in-flight accounting and graceful drain of one worker.
+
+    SIGTERM does not stop the worker right away: it is switched to draining
+    (readiness fails) and keeps serving for ``drain_delay`` seconds so that
+    load balancers stop routing to it, then waits for in-flight requests and
+    hands the signal over to the server's own handler. Reaching the recycle
+    limit drains the same way, without the delay.
+    """
+
+    def __init__(self):
+        self.state = WorkerState.STARTING
+        self.in_flight = 0
+        self.served = 0
+        self.recycle_after: int | None = None
+        self._drain_delay = 0.0
+        self._graceful_timeout = 0.0
+        self._server_handler: Callable | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._drain_task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state is WorkerState.READY
+
+    @property
+    def draining(self) -> bool:
+        return self.state is WorkerState.DRAINING
+
+    def configure(
+        self,
+        *,
+        max_requests: int | None,
+        max_requests_jitter: int,
+        drain_delay: float,
+        graceful_timeout: float,
+    ):
+        self._drain_delay = drain_delay
+        self._graceful_timeout = graceful_timeout
+        self.recycle_after = None
+        if max_requests and os.getenv(SUPERVISED_ENV) == "1":
+            self.recycle_after = max_requests + random.randint(
+                0, max(max_requests_jitter, 0)
+            )
+
+    def install_signal_handlers(self):
+        """Wrap the SIGTERM handler installed by the server."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        handler = signal.getsignal(signal.SIGTERM)
+        if not callable(handler):
+            return
+        self._loop = asyncio.get_running_loop()
+        self._server_handler = handler
+        signal.signal(signal.SIGTERM, self._on_signal)
+
+    def mark_ready(self):
+        if self.state is WorkerState.STARTING:
+            self.state = WorkerState.READY
+
+    def mark_stopped(self):
+        self.state = WorkerState.DRAINING
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+
+    def request_started(self):
+        self.in_flight += 1
+
+    def request_finished(self):
+        self.in_flight -= 1
+        self.served += 1
+        if (
+            self.recycle_after is not None
+            and self.served >= self.recycle_after
+            and not self.draining
+        ):
+            self.drain(f"served {self.served} requests", delay=0.0)
+
+    def drain(self, reason: str, *, delay: float | None = None):
+        """Switch to draining and stop the worker once it is idle."""
+        if self.draining:
+            return
+        self.state = WorkerState.DRAINING
+        logger.info("Worker %s is draining: %s", os.getpid(), reason)
+        delay = self._drain_delay if delay is None else delay
+        self._drain_task = asyncio.get_running_loop().create_task(
+            self._drain(delay)
+        )
+
+    async def wait_idle(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.in_flight and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        return self.in_flight == 0
+
+    async def _drain(self, delay: float):
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if not await self.wait_idle(self._graceful_timeout):
+            logger.warning(
+                "Worker %s stops with %s requests in flight",
+                os.getpid(), self.in_flight
+            )
+        self._stop_server()
+
+    def _on_signal(self, sig: int, frame):
+        if self.draining:
+            # a repeated signal skips the remaining drain
+            self._stop_server(sig, frame)
+            return
+        self._loop.call_soon_threadsafe(self.drain, "received SIGTERM")
+
+    def _stop_server(self, sig: int = signal.SIGTERM, frame=None):
+        if self._server_handler is not None:
+            self._server_handler(sig, frame)
+
+
+class LifecycleMiddleware:
+    """Pure ASGI middleware counting in-flight HTTP requests."""
+
+    def __init__(self, app: ASGIApp, lifecycle: WorkerLifecycle):
+        self.app = app
+        self.lifecycle = lifecycle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.request_finished()
+
+
+LIFECYCLE = WorkerLifecycle()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 from functools import wraps
 from typing import Any, Awaitable, Callable
 
-from starlette.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse, Response
 from  pydantic import BaseModel
 from src.core.provider import core_container
 from src.services.redis.service import RedisService
@@ -37,4 +41,126 @@ def rate_limiter(
                 return res
 
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def idempotent(
+    *,
+    scope: str,
+    ttl: int = 24 * 60 * 60,
+    lock_ttl: int = 30,
+    wait_timeout: float = 10.0,
+    key_param: str = "idempotency_key",
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Run the endpoint once per Idempotency-Key and user, replay the stored
+    response for repeated requests. The endpoint has to accept the header
+    as ``key_param`` and the user as ``user``; requests without the header
+    are not affected.
+
+    The first request claims the key (SET NX, expiring after lock_ttl) and
+    stores its response for ttl seconds; concurrent duplicates wait for it
+    up to wait_timeout. A failed request releases the key, so a retry runs
+    again. Reusing a key with another payload is rejected.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            idempotency_key = kwargs.get(key_param)
+            if not idempotency_key:
+                return await func(*args, **kwargs)
+
+            user = kwargs.get("user")
+            key = (
+                f"idempotency:{scope}:{getattr(user, 'user_id', '-')}:"
+                f"{idempotency_key}"
+            )
+            fingerprint = _fingerprint(kwargs, exclude=(key_param, "user"))
+            async with core_container() as cnt:
+                redis_service: RedisService = await cnt.get(RedisService)
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + wait_timeout
+                delay = 0.02
+                while True:
+                    claimed = await redis_service.set_value(
+                        key, json.dumps({"fingerprint": fingerprint}),
+                        ttl=lock_ttl, only_new=True
+                    )
+                    if claimed:
+                        break
+                    raw = await redis_service.get(key)
+                    record = json.loads(raw) if raw is not None else None
+                    if record is not None:
+                        if record["fingerprint"] != fingerprint:
+                            return JSONResponse(
+                                content={"error": "Idempotency-Key reused with another request"},
+                                status_code=422
+                            )
+                        if "status" in record:
+                            return _replay(record)
+                    if loop.time() >= deadline:
+                        return JSONResponse(
+                            content={"error": "Request with this Idempotency-Key is in progress"},
+                            status_code=409
+                        )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 0.25)
+
+                try:
+                    res = await func(*args, **kwargs)
+                except BaseException:
+                    await redis_service.delete(key)
+                    raise
+                await redis_service.set_value(
+                    key, json.dumps(_record(res, fingerprint)), ttl=ttl
+                )
+                return res
+
+        return wrapper
+    return decorator
+
+
+def _fingerprint(kwargs: dict, exclude: tuple[str, ...]) -> str:
+    payload = {
+        name: (
+            value.model_dump(mode="json") if isinstance(value, BaseModel)
+            else value
+        )
+        for name, value in kwargs.items()
+        if name not in exclude and isinstance(value, (BaseModel, str, int))
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _record(res: Any, fingerprint: str) -> dict:
+    if isinstance(res, Response):
+        return {
+            "fingerprint": fingerprint,
+            "status": res.status_code,
+            "media_type": res.media_type,
+            "body": bytes(res.body).decode(),
+        }
+    body = (
+        res.model_dump_json() if isinstance(res, BaseModel)
+        else json.dumps(jsonable_encoder(res))
+    )
+    return {
+        "fingerprint": fingerprint,
+        "status": 200,
+        "media_type": "application/json",
+        "body": body,
+    }
+
+
+def _replay(record: dict) -> Response:
+    return Response(
+        content=record["body"],
+        status_code=record["status"],
+        media_type=record["media_type"],
+        headers={REPLAYED_HEADER: "true"},
+    )
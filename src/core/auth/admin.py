@@ -0,0 +1,29 @@
+import hmac
+from dataclasses import dataclass
+from typing import Mapping
+
+from fastapi import HTTPException, status
+from starlette.requests import HTTPConnection
+
+from src.core.auth.schemas import AdminInfo
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+@dataclass
+class AdminAuthBackend:
+    token: str | None
+
+    def is_admin(self, headers: Mapping[str, str]) -> bool:
+        provided = headers.get(ADMIN_TOKEN_HEADER)
+        if not self.token or not provided:
+            return False
+        return hmac.compare_digest(provided.encode(), self.token.encode())
+
+    async def __call__(self, request: HTTPConnection) -> AdminInfo:
+        if not self.is_admin(request.headers):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin token required"
+            )
+        return AdminInfo()
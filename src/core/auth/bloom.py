@@ -0,0 +1,49 @@
+"""Bloom filter for membership checks that are mostly negative."""
+import math
+from hashlib import blake2b
+from typing import Iterable
+
+
+class BloomFilter:
+    """Set membership with false positives but no false negatives.
+
+    Sized for ``capacity`` items at ``error_rate``; positions come from
+    double hashing of a single 128 bit blake2b digest.
+    """
+
+    __slots__ = ("_bits", "_size", "_hashes")
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._size = max(size, 8)
+        self._hashes = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+
+    @classmethod
+    def from_items(
+        cls, items: Iterable[str | bytes], capacity: int, error_rate: float
+    ) -> "BloomFilter":
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def add(self, item: str | bytes) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str | bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str | bytes):
+        if isinstance(item, str):
+            item = item.encode()
+        digest = blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for number in range(self._hashes):
+            yield (first + number * second) % self._size
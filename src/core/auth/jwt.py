@@ -5,7 +5,9 @@ from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer
 import jwt
 from starlette.requests import HTTPConnection
+from starlette.websockets import WebSocket
 
+from src.core.auth.revocation import RevocationList
 from src.core.auth.schemas import UserInfo
 
 
@@ -13,13 +15,19 @@ from src.core.auth.schemas import UserInfo
 class JWTAuthBackend:
     secret_key: str
     algorithm: str
+    revocations: RevocationList | None = None
 
     _security: HTTPBearer = field(default_factory=HTTPBearer, init=False)
 
     async def __call__(self, request: HTTPConnection) -> UserInfo:
-        creds = await self._security(request)
-        try:
+        token = None
+        if isinstance(request, WebSocket):
+            # browsers cannot set headers on WebSocket handshakes
+            token = request.query_params.get("token")
+        if token is None:
+            creds = await self._security(request)
             token = creds.credentials
+        try:
             payload = jwt.decode(
                 jwt=token, key=self.secret_key,
                 algorithms=[self.algorithm], options={
@@ -27,8 +35,7 @@ class JWTAuthBackend:
                     "verify_exp": True
                 }
             )
-            return UserInfo.model_validate(payload)
-
+            user = UserInfo.model_validate(payload)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,4 +45,12 @@ class JWTAuthBackend:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
-            )
\ No newline at end of file
+            )
+        if self.revocations is not None and await self.revocations.is_revoked(
+            user.jti and f"jti:{user.jti}", user.sid and f"sid:{user.sid}"
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+        return user
\ No newline at end of file
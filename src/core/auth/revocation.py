@@ -0,0 +1,120 @@
+"""Revoked access tokens, checked without a Redis round trip per request.
+
+Revocations are kept in the ``auth:revoked`` sorted set, scored by the time
+after which the revoked tokens expire anyway, so the set only holds entries
+younger than the access token lifetime. Every worker mirrors the set into a
+Bloom filter that is rebuilt when ``auth:revoked:version`` changes; only a
+token that hits the filter is confirmed in Redis. A revocation made by
+another worker is enforced after at most ``sync_interval`` seconds.
+"""
+import asyncio
+import logging
+import time
+
+from redis.asyncio.client import Redis
+
+from src.core.auth.bloom import BloomFilter
+from src.core.metrics.registry import Counter
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "auth:revoked"
+VERSION_KEY = "auth:revoked:version"
+
+REVOCATION_CHECKS = Counter(
+    "auth_revocation_checks_total", "Token revocation checks by outcome",
+    ("outcome",),
+)
+
+
+class RevocationList:
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+    ):
+        self._redis = redis
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._version: bytes | None = None
+        self._task: asyncio.Task | None = None
+        self._outcomes = {
+            outcome: REVOCATION_CHECKS.labels(outcome)
+            for outcome in ("passed", "revoked", "false_positive")
+        }
+
+    async def start(self) -> None:
+        try:
+            await self.sync()
+        except Exception:
+            # retried by the sync loop, authentication keeps working
+            logger.warning("Initial revocation list sync failed", exc_info=True)
+        self._task = asyncio.create_task(self._sync_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def revoke(self, *token_ids: str, ttl: float) -> None:
+        """Revoke token ids (``jti:...`` or ``sid:...``) for ``ttl`` seconds."""
+        expires_at = time.time() + ttl
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(
+                REVOKED_KEY,
+                {token_id: expires_at for token_id in token_ids}
+            )
+            pipe.incr(VERSION_KEY)
+            await pipe.execute()
+        for token_id in token_ids:
+            self._bloom.add(token_id)
+
+    async def is_revoked(self, *token_ids: str | None) -> bool:
+        candidates = [
+            token_id for token_id in token_ids
+            if token_id is not None and token_id in self._bloom
+        ]
+        if not candidates:
+            self._outcomes["passed"].inc()
+            return False
+        now = time.time()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for token_id in candidates:
+                pipe.zscore(REVOKED_KEY, token_id)
+            scores = await pipe.execute()
+        if any(score is not None and score > now for score in scores):
+            self._outcomes["revoked"].inc()
+            return True
+        self._outcomes["false_positive"].inc()
+        return False
+
+    async def sync(self) -> None:
+        """Rebuild the filter when the revocation set changed."""
+        version = await self._redis.get(VERSION_KEY)
+        if version is not None and version == self._version:
+            return
+        now = time.time()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", now)
+            pipe.zrange(REVOKED_KEY, 0, -1)
+            _, token_ids = await pipe.execute()
+        self._bloom = BloomFilter.from_items(
+            token_ids, max(self._capacity, 2 * len(token_ids)),
+            self._error_rate
+        )
+        self._version = version
+
+    async def _sync_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.warning("Revocation list sync failed", exc_info=True)
@@ -1,4 +1,10 @@
 from pydantic import BaseModel
 
 class UserInfo(BaseModel):
-    user_id: str
\ No newline at end of file
+    user_id: str
+    # token id and session (refresh token family), absent in older tokens
+    jti: str | None = None
+    sid: str | None = None
+
+class AdminInfo(BaseModel):
+    is_admin: bool = True
@@ -1,27 +1,56 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from fastapi import Request, WebSocket
+from redis.asyncio.client import Redis
 
-from dishka import FromComponent, Scope, provide
+from dishka import FromComponent, Provider, Scope, provide
 from dishka.integrations.fastapi import FastapiProvider
 
+from src.core.auth.admin import AdminAuthBackend
 from src.core.auth.jwt import JWTAuthBackend
-from src.core.auth.schemas import UserInfo
+from src.core.auth.revocation import RevocationList
+from src.core.auth.schemas import AdminInfo, UserInfo
 from src.core.config import Config
 
 
+class RevocationProvider(Provider):
+
+    @provide(scope=Scope.APP)
+    async def get_revocation_list(
+        self, redis: Redis, config: Config
+    ) -> AsyncIterator[RevocationList]:
+        revocations = RevocationList(
+            redis,
+            capacity=config.jwt.revocation_capacity,
+            error_rate=config.jwt.revocation_error_rate,
+            sync_interval=config.jwt.revocation_sync_interval,
+        )
+        await revocations.start()
+        yield revocations
+        await revocations.stop()
+
+
 class BaseAuthProvider(FastapiProvider):
 
     @provide(scope=Scope.APP)
     async def get_auth_backend(
         self,
-        config: Annotated[Config, FromComponent()]
+        config: Annotated[Config, FromComponent()],
+        revocations: Annotated[RevocationList, FromComponent()]
     ) -> JWTAuthBackend:
         return JWTAuthBackend(
             secret_key=config.jwt.secret_key,
             algorithm=config.jwt.algorithm,
+            revocations=revocations,
         )
 
+    @provide(scope=Scope.APP)
+    async def get_admin_backend(
+        self,
+        config: Annotated[Config, FromComponent()]
+    ) -> AdminAuthBackend:
+        return AdminAuthBackend(token=config.admin.token)
+
 class RequestAuthProvider(BaseAuthProvider):
     scope: Scope = Scope.REQUEST
     component: str = "request_auth"
@@ -37,6 +66,17 @@ class RequestAuthProvider(BaseAuthProvider):
     ) -> UserInfo:
         return await backend(request)
 
+    @provide
+    async def get_current_admin(
+        self,
+        request: Annotated[
+            Request,
+            FromComponent("request_auth"),
+        ],
+        backend: AdminAuthBackend,
+    ) -> AdminInfo:
+        return await backend(request)
+
 
 class SessionAuthProvider(BaseAuthProvider):
     scope: Scope = Scope.SESSION
@@ -56,4 +96,5 @@ class SessionAuthProvider(BaseAuthProvider):
 
 
 CurrentUser = Annotated[UserInfo, FromComponent("request_auth")]
-CurrentUserWS = Annotated[UserInfo, FromComponent("session_auth")]
\ No newline at end of file
+CurrentUserWS = Annotated[UserInfo, FromComponent("session_auth")]
+CurrentAdmin = Annotated[AdminInfo, FromComponent("request_auth")]
\ No newline at end of file
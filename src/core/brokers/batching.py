@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from zlib import crc32
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionedBatcher[T]:
+    """Hands items to ``handler`` in batches from a fixed set of partitions.
+
+    Items with the same key land in the same partition and are handled in
+    submission order; partitions run concurrently. A batch is closed when it
+    reaches ``batch_size`` or ``max_wait`` seconds after its first item.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[None]],
+        *,
+        partitions: int,
+        batch_size: int,
+        max_wait: float,
+    ):
+        self._handler = handler
+        self._batch_size = batch_size
+        self._max_wait = max_wait
+        self._queues: list[asyncio.Queue[T]] = [
+            asyncio.Queue() for _ in range(partitions)
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run(queue)) for queue in self._queues
+        ]
+
+    async def stop(self) -> None:
+        # items left in the queues are not acknowledged, the broker
+        # redelivers them to another consumer
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def submit(self, key: str, item: T) -> None:
+        queue = self._queues[crc32(key.encode()) % len(self._queues)]
+        queue.put_nowait(item)
+
+    async def _run(self, queue: asyncio.Queue[T]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+            try:
+                await self._handler(batch)
+            except Exception:
+                logger.exception("Batch handler failed for %s items", len(batch))
@@ -0,0 +1,120 @@
+"""Broker message codecs, selected by ``RabbitConfig.codec``.
+
+The codec of a message is signalled with its ``content_type``, consumers
+pick the decoder with ``codec_for``.
+
+The msgpack codec stores strings that look like ObjectIds as their 12 raw
+bytes and datetimes as msgpack timestamps (integer seconds and nanoseconds
+since the epoch), the two largest parts of a JSON event message. On decode
+12-byte binaries become hex strings again and timestamps UTC datetimes.
+"""
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+import msgpack
+from bson import ObjectId
+from pydantic import BaseModel
+
+
+class Codec(Protocol):
+    name: str
+    content_type: str
+
+    def encode(self, message: BaseModel | dict) -> bytes: ...
+
+    def decode(self, body: bytes) -> Any: ...
+
+
+class JsonCodec:
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, message: BaseModel | dict) -> bytes:
+        if isinstance(message, BaseModel):
+            return message.model_dump_json().encode()
+        return json.dumps(message, default=str).encode()
+
+    def decode(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+_OBJECT_ID = re.compile(r"[0-9a-f]{24}").fullmatch
+
+
+def _pack(value: Any) -> Any:
+    """Make ``value`` packable: ObjectId hex strings become 12 raw bytes,
+    naive datetimes are taken as UTC, models are packed by their fields."""
+    if type(value) is str:
+        if len(value) == 24 and _OBJECT_ID(value):
+            return bytes.fromhex(value)
+        return value
+    if isinstance(value, BaseModel):
+        value = value.__dict__
+    if isinstance(value, dict):
+        packed = {}
+        for key, item in value.items():
+            # flat str fields are the common case, skip the call for them
+            if type(item) is str and len(item) != 24:
+                packed[key] = item
+            else:
+                packed[key] = _pack(item)
+        return packed
+    if isinstance(value, (list, tuple)):
+        return [_pack(item) for item in value]
+    if isinstance(value, ObjectId):
+        return value.binary
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    if type(value) is bytes and len(value) == 12:
+        return value.hex()
+    if type(value) is dict:
+        return {key: _unpack(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_unpack(item) for item in value]
+    return value
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        # a Packer reuses its buffer, packb allocates one per call
+        self._packer = msgpack.Packer(datetime=True)
+
+    def encode(self, message: BaseModel | dict) -> bytes:
+        return self._packer.pack(_pack(message))
+
+    def decode(self, body: bytes) -> Any:
+        return _unpack(msgpack.unpackb(body, timestamp=3))
+
+
+CODECS: dict[str, Codec] = {
+    codec.name: codec for codec in (JsonCodec(), MsgpackCodec())
+}
+_BY_CONTENT_TYPE = {codec.content_type: codec for codec in CODECS.values()}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown codec {name!r}, expected one of {sorted(CODECS)}"
+        ) from None
+
+
+def codec_for(content_type: str | None) -> Codec:
+    """Codec of a received message, JSON when the type is missing."""
+    if not content_type:
+        return CODECS["json"]
+    codec = _BY_CONTENT_TYPE.get(content_type.split(";", 1)[0].strip())
+    if codec is None:
+        raise ValueError(f"Unsupported content type {content_type!r}")
+    return codec
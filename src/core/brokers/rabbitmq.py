@@ -1,22 +1,105 @@
-import json
+import asyncio
+import logging
+from time import perf_counter
 
 from faststream.rabbit import RabbitBroker, RabbitExchange, RabbitQueue
+from pydantic import BaseModel
+
+from src.core.brokers.codecs import Codec, JsonCodec
+from src.core.brokers.spool import SPOOL_MESSAGES, Spool, SpoolFullError
+from src.core.metrics.instrument import PUBLISH_ERRORS, PUBLISH_LATENCY
+
+logger = logging.getLogger(__name__)
+
 
 class RabbitMqPublisher:
     def __init__(
         self,
         broker: RabbitBroker,
         exchange: RabbitExchange,
-        queue_map: dict[str, RabbitQueue]
+        queue_map: dict[str, RabbitQueue],
+        timeout: float | None = None,
+        codec: Codec | None = None,
     ):
         self._broker = broker
         self._exchange = exchange
         self._queue_map = queue_map
+        self._timeout = timeout
+        self._codec = codec or JsonCodec()
+        self._spool: Spool | None = None
+        self._connected = False
+        self._metrics: dict[str, tuple] = {}
+
+    async def connect(self) -> None:
+        await self._broker.connect()
+        await self._broker.declare_exchange(self._exchange)
+        self._connected = True
+
+    def attach_spool(self, spool: Spool) -> None:
+        """Fall back to ``spool`` when the broker does not accept a message."""
+        self._spool = spool
+
+    async def publish(
+        self,
+        message: BaseModel | dict,
+        routing_key: str,
+        *,
+        drop_if_full: bool = True,
+    ) -> None:
+        """
+        Send ``message``, or spool it when the broker does not accept it.
+        A message the full spool cannot take is logged and dropped (counted
+        as ``dropped`` spool messages), as the change it announces is
+        already stored; without ``drop_if_full`` SpoolFullError is raised.
+        """
+        body = self._codec.encode(message)
+        content_type = self._codec.content_type
+        spool = self._spool
+        try:
+            if spool is not None and spool.pending:
+                # keeps the order: nothing goes out before the spooled messages
+                spool.append(routing_key, body, content_type)
+                return
+            try:
+                await self.send(routing_key, body, content_type)
+            except Exception as exc:
+                if spool is None:
+                    raise
+                logger.warning("Publish to %s spooled: %r", routing_key, exc)
+                spool.append(routing_key, body, content_type)
+        except SpoolFullError as exc:
+            if not drop_if_full:
+                raise
+            SPOOL_MESSAGES.labels("dropped").inc()
+            logger.error("Publish to %s dropped: %s", routing_key, exc)
+
+    async def send(self, routing_key: str, body: bytes, content_type: str) -> None:
+        """Publish an encoded message, failing after the publish timeout."""
+        latency, errors = self._metric_children(routing_key)
+        started = perf_counter()
+        try:
+            async with asyncio.timeout(self._timeout):
+                if not self._connected:
+                    # the first connect failed, the robust connection only
+                    # reconnects once it was established
+                    await self.connect()
+                await self._broker.publish(
+                    message=body,
+                    routing_key=routing_key,
+                    exchange=self._exchange,
+                    content_type=content_type
+                )
+        except BaseException:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(perf_counter() - started)
 
-    async def publish(self, message: dict, routing_key: str) -> None:
-        await self._broker.publish(
-            message=json.dumps(message).encode(),
-            routing_key=routing_key,
-            exchange=self._exchange,
-            content_type="application/json"
-        )
\ No newline at end of file
+    def _metric_children(self, routing_key: str) -> tuple:
+        children = self._metrics.get(routing_key)
+        if children is None:
+            children = self._metrics[routing_key] = (
+                PUBLISH_LATENCY.labels(routing_key),
+                PUBLISH_ERRORS.labels(routing_key),
+            )
+        return children
@@ -1,13 +1,17 @@
+import logging
 from typing import AsyncIterator
 
 from dishka import Provider, Scope, provide
-from faststream.rabbit import (
-    RabbitBroker, RabbitExchange, ExchangeType, RabbitQueue, QueueType
-)
+from faststream.rabbit import RabbitBroker
 
+from src.core.brokers.codecs import get_codec
 from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.brokers.spool import Spool
+from src.core.brokers.topology import build_exchange, build_queue_map
 from src.core.config import Config
 
+logger = logging.getLogger(__name__)
+
 
 class MessagingProvider(Provider):
     scope = Scope.APP
@@ -23,22 +27,33 @@ class MessagingProvider(Provider):
     async def get_publisher(
         self, broker: RabbitBroker, conf: Config
     ) -> AsyncIterator[RabbitMqPublisher]:
-        exchange = RabbitExchange(
-            name=conf.rabbit.exchange, type=ExchangeType.TOPIC,
-            durable=True, auto_delete=False, declare=True, robust=True
-        )
-        actions = conf.rabbit.actions
-        queue_map = {
-            action: RabbitQueue(
-                queue_type=QueueType.CLASSIC,
-                name=action, routing_key=f"events.{action}"
-            )
-            for action in actions
-        }
+        exchange = build_exchange(conf.rabbit)
+        queue_map = build_queue_map(conf.rabbit)
         publisher = RabbitMqPublisher(
-            broker=broker, exchange=exchange, queue_map=queue_map
+            broker=broker, exchange=exchange, queue_map=queue_map,
+            timeout=conf.spool.publish_timeout if conf.spool.enabled else None,
+            codec=get_codec(conf.rabbit.codec),
         )
-        await self._broker.connect()
-        await self._broker.declare_exchange(exchange)
+        spool = None
+        if conf.spool.enabled:
+            spool = Spool(
+                publisher.send,
+                directory=conf.spool.directory,
+                max_bytes=conf.spool.max_bytes,
+                segment_bytes=conf.spool.segment_bytes,
+                fsync_interval=conf.spool.fsync_interval_ms / 1000,
+                backoff=conf.spool.replay_backoff_ms / 1000,
+                max_backoff=conf.spool.replay_max_backoff_ms / 1000,
+            )
+            await spool.start()
+            publisher.attach_spool(spool)
+        try:
+            await publisher.connect()
+        except Exception:
+            if spool is None:
+                raise
+            logger.warning("Broker is unavailable, publishing to the spool")
         yield publisher
+        if spool is not None:
+            await spool.stop()
         await self._broker.stop()
\ No newline at end of file
@@ -0,0 +1,314 @@
+"""Append-only local spool for messages the broker did not accept.
+
+Records are framed as ``length (u32) | crc32 (u32) | payload`` where the
+payload is ``key length (u8) | routing key | type length (u8) | content
+type | body``. Appends go to an in-memory buffer that a background task
+writes and fsyncs every ``fsync_interval_ms``, so the request path never
+waits for the disk. Each process writes its own segment files and holds an
+exclusive ``flock`` on them; segments left by a dead process are adopted
+and replayed by a live one.
+"""
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Awaitable, BinaryIO, Callable
+from zlib import crc32
+
+from src.core.metrics.registry import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct(">II")
+SUFFIX = ".spool"
+
+Sender = Callable[[str, bytes, str], Awaitable[None]]
+
+SPOOL_MESSAGES = Counter(
+    "broker_spool_messages_total", "Spooled broker messages by outcome",
+    ("outcome",),
+)
+SPOOL_BYTES = Gauge("broker_spool_bytes", "Bytes held by the broker spool")
+SPOOL_PENDING = Gauge(
+    "broker_spool_pending", "1 while publishes are routed to the spool"
+)
+
+
+class SpoolFullError(Exception):
+    """The spool reached ``max_bytes``."""
+
+
+def encode_record(routing_key: str, body: bytes, content_type: str) -> bytes:
+    key = routing_key.encode()
+    ctype = content_type.encode()
+    payload = b"".join((
+        bytes((len(key),)), key, bytes((len(ctype),)), ctype, body
+    ))
+    return HEADER.pack(len(payload), crc32(payload)) + payload
+
+
+def decode_records(data: bytes, offset: int = 0):
+    """Yield ``(next_offset, routing_key, body, content_type)`` records.
+
+    Stops at the first truncated or corrupted record (a torn write).
+    """
+    end = len(data)
+    while offset + HEADER.size <= end:
+        length, checksum = HEADER.unpack_from(data, offset)
+        start = offset + HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or crc32(payload) != checksum:
+            SPOOL_MESSAGES.labels("corrupt").inc()
+            logger.error("Corrupted spool record at offset %s", offset)
+            return
+        key_len = payload[0]
+        routing_key = payload[1:1 + key_len].decode()
+        ctype_len = payload[1 + key_len]
+        ctype_start = 2 + key_len
+        content_type = payload[ctype_start:ctype_start + ctype_len].decode()
+        offset = start + length
+        yield offset, routing_key, payload[ctype_start + ctype_len:], content_type
+
+
+class Segment:
+    __slots__ = ("path", "file", "size", "offset")
+
+    def __init__(self, path: Path, file: BinaryIO, size: int = 0):
+        self.path = path
+        self.file = file
+        self.size = size
+        # replayed bytes, records before it are already published
+        self.offset = 0
+
+    @classmethod
+    def claim(cls, path: Path) -> "Segment | None":
+        """Lock an existing segment, None if its owner is still alive."""
+        try:
+            file = open(path, "ab")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return None
+        return cls(path, file, size=os.fstat(file.fileno()).st_size)
+
+    def release(self, delete: bool = False) -> None:
+        if delete:
+            self.path.unlink(missing_ok=True)
+        self.file.close()
+
+
+class Spool:
+    """Buffers messages on disk while the broker is unavailable.
+
+    While anything is spooled the spool stays ``pending`` and new messages
+    must be appended as well, so that replay keeps the publish order. The
+    replay task sends records in order and backs off exponentially on
+    failure; once everything is sent, ``pending`` is cleared.
+    """
+
+    def __init__(
+        self,
+        sender: Sender,
+        *,
+        directory: str,
+        max_bytes: int,
+        segment_bytes: int,
+        fsync_interval: float,
+        backoff: float,
+        max_backoff: float,
+    ):
+        self._sender = sender
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._segment_bytes = segment_bytes
+        self._fsync_interval = fsync_interval
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        self._active: Segment | None = None
+        self._closed: list[Segment] = []
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self.pending = False
+
+    @property
+    def size(self) -> int:
+        closed = sum(s.size - s.offset for s in self._closed)
+        active = self._active.size if self._active is not None else 0
+        return closed + active + self._buffered
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._directory.mkdir, parents=True, exist_ok=True)
+        await self._adopt_orphans()
+        _spools.append(self)
+        self._tasks = [
+            asyncio.create_task(self._flush_forever()),
+            asyncio.create_task(self._replay_forever()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self._flush()
+        # unreplayed segments stay on disk for the next process
+        for segment in self._closed:
+            segment.release(delete=segment.offset >= segment.size)
+        if self._active is not None:
+            self._active.release(delete=self._active.size == 0)
+        self._closed.clear()
+        self._active = None
+        if self in _spools:
+            _spools.remove(self)
+
+    def append(self, routing_key: str, body: bytes, content_type: str) -> None:
+        record = encode_record(routing_key, body, content_type)
+        if self.size + len(record) > self._max_bytes:
+            raise SpoolFullError(f"spool is full ({self._max_bytes} bytes)")
+        self._buffer.append(record)
+        self._buffered += len(record)
+        self._set_pending(True)
+        SPOOL_MESSAGES.labels("spooled").inc()
+        self._wakeup.set()
+
+    # writing
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._fsync_interval)
+            if self._buffer:
+                try:
+                    await self._flush()
+                except OSError:
+                    logger.exception("Spool flush failed")
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            if not self._buffer:
+                return
+            # records appended while writing stay buffered for the next flush
+            count = len(self._buffer)
+            data = b"".join(self._buffer[:count])
+            if self._active is None:
+                self._active = await asyncio.to_thread(self._new_segment)
+            await asyncio.to_thread(_write_and_sync, self._active.file, data)
+            del self._buffer[:count]
+            self._buffered -= len(data)
+            self._active.size += len(data)
+            if self._active.size >= self._segment_bytes:
+                self._rotate()
+
+    def _new_segment(self) -> Segment:
+        name = f"{time.time_ns():020d}-{os.getpid()}{SUFFIX}"
+        segment = Segment.claim(self._directory / name)
+        if segment is None:
+            raise OSError(f"cannot lock spool segment {name}")
+        return segment
+
+    def _rotate(self) -> None:
+        if self._active is not None:
+            self._closed.append(self._active)
+            self._active = None
+
+    async def _adopt_orphans(self) -> None:
+        known = {s.path for s in self._closed}
+        if self._active is not None:
+            known.add(self._active.path)
+        paths = await asyncio.to_thread(
+            lambda: sorted(self._directory.glob(f"*{SUFFIX}"))
+        )
+        adopted = []
+        for path in paths:
+            if path in known:
+                continue
+            segment = await asyncio.to_thread(Segment.claim, path)
+            if segment is None:
+                continue
+            if segment.size == 0:
+                segment.release(delete=True)
+                continue
+            adopted.append(segment)
+        if adopted:
+            logger.warning("Adopted %s spool segments", len(adopted))
+            self._closed = sorted(
+                self._closed + adopted, key=lambda s: s.path.name
+            )
+            self._set_pending(True)
+
+    # replay
+
+    async def _replay_forever(self) -> None:
+        backoff = self._backoff
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=30.0)
+            except TimeoutError:
+                await self._adopt_orphans()
+            self._wakeup.clear()
+            while self.pending:
+                try:
+                    await self._replay()
+                    backoff = self._backoff
+                except Exception as exc:
+                    logger.warning(
+                        "Spool replay failed, retrying in %.1fs: %r",
+                        backoff, exc
+                    )
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self._max_backoff)
+
+    async def _replay(self) -> None:
+        while True:
+            if not self._closed:
+                await self._flush()
+                async with self._lock:
+                    if self._active is not None and self._active.size:
+                        self._rotate()
+                    elif not self._closed and not self._buffer:
+                        self._set_pending(False)
+                        return
+                continue
+            segment = self._closed[0]
+            data = await asyncio.to_thread(segment.path.read_bytes)
+            for offset, routing_key, body, content_type in decode_records(
+                data, segment.offset
+            ):
+                await self._sender(routing_key, body, content_type)
+                segment.offset = offset
+                SPOOL_MESSAGES.labels("replayed").inc()
+            # the tail after a corrupted record cannot be recovered
+            segment.offset = segment.size
+            self._closed.pop(0)
+            await asyncio.to_thread(segment.release, True)
+
+    def _set_pending(self, pending: bool) -> None:
+        if self.pending != pending:
+            self.pending = pending
+            SPOOL_PENDING.labels().set(1 if pending else 0)
+            if not pending:
+                logger.info("Spool drained, publishing to the broker again")
+
+
+def _write_and_sync(file: BinaryIO, data: bytes) -> None:
+    file.write(data)
+    file.flush()
+    os.fsync(file.fileno())
+
+
+_spools: list[Spool] = []
+
+
+def _collect_spool_bytes():
+    return [((), sum(spool.size for spool in _spools))]
+
+
+SPOOL_BYTES.set_function(_collect_spool_bytes)
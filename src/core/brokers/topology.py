@@ -0,0 +1,78 @@
+"""Exchange and queue definitions shared by the publisher and the worker."""
+from faststream.rabbit import ExchangeType, QueueType, RabbitExchange, RabbitQueue
+
+from src.core.config import RabbitConfig
+
+USERS_UPDATED = "users.updated"
+
+
+def build_exchange(conf: RabbitConfig) -> RabbitExchange:
+    return RabbitExchange(
+        name=conf.exchange, type=ExchangeType.TOPIC,
+        durable=True, auto_delete=False, declare=True, robust=True
+    )
+
+
+def build_dead_letter_exchange(conf: RabbitConfig) -> RabbitExchange:
+    return RabbitExchange(
+        name=f"{conf.exchange}.dlx", type=ExchangeType.TOPIC,
+        durable=True, auto_delete=False, declare=True, robust=True
+    )
+
+
+def build_queue_map(conf: RabbitConfig) -> dict[str, RabbitQueue]:
+    """Work queues by action; rejected messages go to the dead-letter exchange."""
+    dead_letter_exchange = build_dead_letter_exchange(conf)
+    return {
+        action: RabbitQueue(
+            queue_type=QueueType.CLASSIC,
+            name=action, routing_key=f"events.{action}", durable=True,
+            arguments={
+                "x-dead-letter-exchange": dead_letter_exchange.name,
+                "x-dead-letter-routing-key": f"events.{action}.dead",
+            }
+        )
+        for action in conf.actions
+    }
+
+
+def build_retry_queue(action: str) -> RabbitQueue:
+    """Consumer-less queue holding retries until their expiration.
+
+    Expired messages are dead-lettered through the default exchange straight
+    back to the work queue, so other queues bound to the routing key do not
+    see the retry.
+    """
+    return RabbitQueue(
+        queue_type=QueueType.CLASSIC, name=f"{action}.retry", durable=True,
+        arguments={
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": action,
+        }
+    )
+
+
+def build_dead_letter_queue(action: str) -> RabbitQueue:
+    return RabbitQueue(
+        queue_type=QueueType.CLASSIC, name=f"{action}.dead", durable=True,
+        routing_key=f"events.{action}.dead"
+    )
+
+
+def build_user_queue(conf: RabbitConfig) -> RabbitQueue:
+    """Profile changes, consumed to refresh the creator snapshots of events."""
+    return RabbitQueue(
+        queue_type=QueueType.CLASSIC,
+        name=USERS_UPDATED, routing_key=USERS_UPDATED, durable=True,
+        arguments={
+            "x-dead-letter-exchange": build_dead_letter_exchange(conf).name,
+            "x-dead-letter-routing-key": f"{USERS_UPDATED}.dead",
+        }
+    )
+
+
+def build_user_dead_letter_queue() -> RabbitQueue:
+    return RabbitQueue(
+        queue_type=QueueType.CLASSIC, name=f"{USERS_UPDATED}.dead",
+        durable=True, routing_key=f"{USERS_UPDATED}.dead"
+    )
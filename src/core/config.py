@@ -58,8 +58,10 @@ class RabbitConfig(BaseConfig):
     port: int
     user: str
     password: str
-    actions: list[str] = ["created", "updated", "deleted"]
+    actions: list[str] = ["created", "updated", "deleted", "reminder"]
     exchange: str = "events"
+    # message encoding of published messages, see src/core/brokers/codecs.py
+    codec: str = "json"
 
     @property
     def rabbit_uri(self):
@@ -85,6 +87,26 @@ class DatabaseConfig(BaseConfig):
     user: str = Field(validation_alias="mongo_user")
     password: str = Field(validation_alias="mongo_password")
     db_name: str = Field(default="main", validation_alias="mongo_db")
+    slow_query_ms: float = 100.0
+    explain_sample_rate: float = 0.1
+    slow_query_shapes: int = 500
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: int | None = None
+    wait_queue_timeout_ms: int | None = None
+    compressors: str | None = None
+
+    @property
+    def pool_options(self) -> dict:
+        """Connection pool and wire compression options for the client."""
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "compressors": self.compressors,
+        }
+        return {k: v for k, v in options.items() if v is not None}
 
     @property
     def mongo_uri(self):
@@ -104,11 +126,158 @@ class DatabaseConfig(BaseConfig):
 
 
 class JwtConfig(BaseConfig):
-    """JWT security configuration values."""
+    """JWT security configuration values.
+
+    Refresh tokens are rotated on every use; revocations of access tokens
+    reach the other workers within ``revocation_sync_interval`` seconds.
+    """
     secret_key: str
     algorithm: str = "HS256"
     ttl_minutes: int = 30
     bcrypt_rounds: int = 12
+    refresh_ttl_days: int = 30
+    revocation_sync_interval: float = 5.0
+    revocation_capacity: int = 100_000
+    revocation_error_rate: float = 0.001
+
+
+class AdminConfig(BaseConfig):
+    """Access to the administrative endpoints, disabled without a token."""
+    token: str | None = None
+
+
+class MetricsConfig(BaseConfig):
+    """Metrics collection and multi-worker aggregation settings."""
+    enabled: bool = True
+    directory: str | None = "/tmp/events-service-metrics"
+    flush_interval: float = 5.0
+    loop_lag_interval: float = 0.25
+    blocking_debug: bool = False
+    blocking_threshold_ms: float = 100.0
+
+
+class ProfilingConfig(BaseConfig):
+    """On-demand request profiling; the middleware is not installed when off.
+
+    Only the newest ``max_files`` profiles are kept in ``output_dir``.
+    """
+    enabled: bool = False
+    sample_rate: float = 0.0
+    interval_ms: float = 5.0
+    output_dir: str = "/tmp/events-service-profiles"
+    max_files: int = 1000
+
+
+class HealthConfig(BaseConfig):
+    """Readiness probe settings: per-dependency timeout and result caching."""
+    timeout: float = 1.0
+    cache_ttl: float = 2.0
+    max_pool_saturation: float = 0.9
+
+
+class FeedConfig(BaseConfig):
+    """Live event feed over WebSocket, fanned out through Redis pub/sub."""
+    channel: str = "events:feed"
+    queue_size: int = 64
+    max_overflows: int = 256
+    max_subscriptions: int = 500
+    heartbeat_interval: float = 20.0
+    idle_timeout: float = 60.0
+
+
+class SpoolConfig(BaseConfig):
+    """Local spool for broker publishes while RabbitMQ is unavailable."""
+    enabled: bool = True
+    directory: str = "/tmp/events-service-spool"
+    max_bytes: int = 256 * 1024 * 1024
+    segment_bytes: int = 4 * 1024 * 1024
+    fsync_interval_ms: float = 50.0
+    publish_timeout: float = 1.0
+    replay_backoff_ms: float = 500.0
+    replay_max_backoff_ms: float = 30_000.0
+
+
+class CacheConfig(BaseConfig):
+    """Redis read-through cache of event reads and user profiles.
+
+    List pages are not invalidated on writes and are kept only briefly, as
+    are profiles in the per-worker LRU. An invalidated entry is not written
+    back by loads that started before it, as long as they finish within
+    ``invalidation_window`` seconds.
+    """
+    enabled: bool = True
+    event_ttl: int = 300
+    list_ttl: int = 5
+    lease_ttl: int = 5
+    lease_wait_ms: float = 1000.0
+    poll_interval_ms: float = 25.0
+    profile_ttl: int = 3600
+    profile_local_size: int = 10000
+    profile_local_ttl: float = 10.0
+    unknown_login_ttl: int = 300
+    invalidation_window: int = 60
+
+
+class ImportConfig(BaseConfig):
+    """Bulk user import: rows per insert and the password hashing pool.
+
+    ``workers`` defaults to the number of CPUs; each pool task hashes
+    ``hash_batch`` passwords.
+    """
+    chunk_size: int = 500
+    workers: int | None = None
+    hash_batch: int = 25
+
+
+class ReminderConfig(BaseConfig):
+    """Reminders sent to subscribers ``lead_minutes`` before an event starts.
+
+    Jobs are scheduled by the API and dispatched by ``src.worker``; a
+    claimed job is retried after ``visibility_timeout`` seconds.
+    """
+    enabled: bool = True
+    lead_minutes: int = 30
+    batch_size: int = 500
+    visibility_timeout: float = 60.0
+    poll_interval: float = 1.0
+
+
+class StatsConfig(BaseConfig):
+    """Event statistics counters and their periodic rebuild by the worker."""
+    enabled: bool = True
+    reconcile_interval: float = 600.0
+
+
+class WorkerConfig(BaseConfig):
+    """Queue consumer settings of ``python -m src.worker``."""
+    prefetch: int = 64
+    partitions: int = 16
+    batch_size: int = 50
+    batch_max_wait_ms: float = 20.0
+    max_retries: int = 5
+    retry_delay_ms: int = 1000
+    retry_max_delay_ms: int = 300_000
+
+
+class ServerConfig(BaseConfig):
+    """Production server settings used by ``python -m src.serve``.
+
+    Workers default to the number of usable CPUs. Each worker restarts after
+    ``max_requests`` plus a random jitter so that they do not recycle at once.
+    """
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int | None = None
+    backlog: int = 2048
+    keep_alive_timeout: int = 65
+    max_requests: int | None = 20000
+    max_requests_jitter: int = 2000
+    drain_delay: float = 5.0
+    graceful_timeout: float = 30.0
+    access_log: bool = False
+    # a compression context per connection is too costly for idle sockets
+    ws_per_message_deflate: bool = False
+    forwarded_allow_ips: str = "127.0.0.1"
 
 
 class Config(BaseConfig):
@@ -121,4 +290,16 @@ class Config(BaseConfig):
     redis: RedisConfig
     rabbit: RabbitConfig
     database: DatabaseConfig
-    messages: dict
\ No newline at end of file
+    messages: dict
+    metrics: MetricsConfig = MetricsConfig()
+    admin: AdminConfig = AdminConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
+    server: ServerConfig = ServerConfig()
+    health: HealthConfig = HealthConfig()
+    feed: FeedConfig = FeedConfig()
+    worker: WorkerConfig = WorkerConfig()
+    spool: SpoolConfig = SpoolConfig()
+    cache: CacheConfig = CacheConfig()
+    user_import: ImportConfig = ImportConfig()
+    reminders: ReminderConfig = ReminderConfig()
+    stats: StatsConfig = StatsConfig()
\ No newline at end of file
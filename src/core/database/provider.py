@@ -1,9 +1,11 @@
 from typing import AsyncIterator
 
 from dishka import provide, Provider, Scope
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 
 from src.core.config import Config
+from src.core.metrics.pools import MongoCommandListener, MongoPoolListener
 from src.core.repository import BeanieRepository
 
 
@@ -11,26 +13,31 @@ class DatabaseConnectionProvider(Provider):
     scope: Scope = Scope.APP
 
     @provide
-    async def get_motor_client(
+    async def get_mongo_client(
         self, conf: Config
-    ) -> AsyncIterator[AsyncIOMotorClient]:
+    ) -> AsyncIterator[AsyncMongoClient]:
         """
-        Provides a database client for the application.
+        Provides the MongoDB client shared by Beanie and the application.
         """
-        client = AsyncIOMotorClient(
-            conf.database.mongo_uri, uuidRepresentation="standard"
+        listeners = []
+        if conf.metrics.enabled:
+            listeners = [MongoPoolListener(), MongoCommandListener()]
+        client = AsyncMongoClient(
+            conf.database.db_uri,
+            uuidRepresentation="standard",
+            event_listeners=listeners,
+            **conf.database.pool_options
         )
         try:
             yield client
         finally:
-            if client and client.is_connected:
-                client.close()
+            await client.close()
 
 
     @provide
     async def get_database(
-        self, client: AsyncIOMotorClient, conf: Config
-    ) -> AsyncIOMotorDatabase:
+        self, client: AsyncMongoClient, conf: Config
+    ) -> AsyncDatabase:
         """ Provides a database. """
         return client[conf.database.db_name]
 
@@ -0,0 +1,185 @@
+"""Slow query log for BeanieRepository.
+
+Queries slower than the configured threshold are logged as one JSON record
+with a normalized shape (literal values replaced by ``"?"``), aggregated per
+shape, and a sample of them has its ``explain`` plan captured in the
+background. Statistics are kept per worker process.
+"""
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+from beanie import Document
+from beanie.odm.queries.find import FindMany, FindOne
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(value: Any) -> Any:
+    """Replace literal values of a filter by ``"?"``, keeping its structure."""
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if all(not isinstance(item, (dict, list, tuple)) for item in value):
+            return ["?"] if value else []
+        return [normalize(item) for item in value]
+    return "?"
+
+
+def summarize_plan(plan: dict) -> str:
+    """Compact ``FETCH > IXSCAN(start_time_1)`` view of a winning plan."""
+    stages = []
+    while plan:
+        stage = plan.get("stage", "?")
+        if index := plan.get("indexName"):
+            stage = f"{stage}({index})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " > ".join(stages)
+
+
+@dataclass
+class ShapeStats:
+    model: str
+    operation: str
+    filter: Any
+    sort: list
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    plan: str | None = None
+    winning_plan: dict | None = field(default=None, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "operation": self.operation,
+            "filter": self.filter,
+            "sort": self.sort,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3),
+            "max_ms": round(self.max_ms, 3),
+            "plan": self.plan,
+            "winning_plan": self.winning_plan,
+        }
+
+
+class SlowQueryLog:
+
+    def __init__(
+        self,
+        threshold_ms: float = 100.0,
+        explain_sample_rate: float = 0.1,
+        max_shapes: int = 500,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.max_shapes = max_shapes
+        self._shapes: dict[str, ShapeStats] = {}
+        self._explaining: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def configure(
+        self,
+        *,
+        threshold_ms: float,
+        explain_sample_rate: float,
+        max_shapes: int,
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.max_shapes = max_shapes
+
+    def observe(
+        self,
+        model_cls: type[Document],
+        operation: str,
+        query: FindMany | FindOne,
+        elapsed: float,
+    ) -> None:
+        """Record ``query`` if it took longer than the threshold."""
+        if elapsed < self.threshold:
+            return
+
+        query_filter = query.get_filter_query()
+        # a FindOne (update_one) has no sort
+        sort = [
+            [name, int(direction)]
+            for name, direction in getattr(query, "sort_expressions", ())
+        ]
+        shape = normalize(query_filter)
+        key = json.dumps(
+            [model_cls.__name__, operation, shape, sort], default=str
+        )
+        stats = self._shapes.get(key)
+        if stats is None:
+            if len(self._shapes) >= self.max_shapes:
+                self._evict()
+            stats = self._shapes[key] = ShapeStats(
+                model=model_cls.__name__, operation=operation,
+                filter=shape, sort=sort,
+            )
+        elapsed_ms = elapsed * 1000
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+        logger.warning("slow query %s", json.dumps({
+            "model": stats.model,
+            "collection": model_cls.get_collection_name(),
+            "operation": operation,
+            "shape": shape,
+            "sort": sort,
+            "duration_ms": round(elapsed_ms, 3),
+        }, default=str))
+
+        if key not in self._explaining and (
+            stats.plan is None or random.random() < self.explain_sample_rate
+        ):
+            self._explaining.add(key)
+            task = asyncio.create_task(
+                self._explain(key, model_cls, dict(query_filter), sort)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def top(self, limit: int = 20) -> list[dict]:
+        """Shapes with the highest cumulative time first."""
+        ordered = sorted(
+            self._shapes.values(), key=lambda s: s.total_ms, reverse=True
+        )
+        return [stats.as_dict() for stats in ordered[:limit]]
+
+    def _evict(self) -> None:
+        # drop the cheapest shape, the summary only reports the top ones
+        key = min(self._shapes, key=lambda k: self._shapes[k].total_ms)
+        del self._shapes[key]
+
+    async def _explain(
+        self, key: str, model_cls: type[Document], query_filter: dict,
+        sort: list,
+    ) -> None:
+        command = {"find": model_cls.get_collection_name(), "filter": query_filter}
+        if sort:
+            command["sort"] = dict(sort)
+        try:
+            result = await model_cls.get_pymongo_collection().database.command(
+                {"explain": command, "verbosity": "queryPlanner"}
+            )
+            winning = result.get("queryPlanner", {}).get("winningPlan", {})
+            # the slot based engine nests the classic plan under queryPlan
+            winning = winning.get("queryPlan", winning)
+            if stats := self._shapes.get(key):
+                stats.winning_plan = winning
+                stats.plan = summarize_plan(winning)
+        except Exception:
+            logger.exception("explain failed for slow query %s", key)
+        finally:
+            self._explaining.discard(key)
+
+
+SLOW_QUERIES = SlowQueryLog()
@@ -1,7 +1,12 @@
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Iterable
+
+from pydantic import BaseModel, create_model
 from beanie import Document
 from beanie.odm.operators.find.logical import And
 
+from src.core.exception.custom import UserError
+from src.core.exception.reason import Reason
 from src.core.schemas import RangeFilter
 
 
@@ -20,4 +25,71 @@ def parse_filters[Filters: BaseModel](
                     if min_val is not None:
                         clause = And(clause, item >= min_val)
                     if max_val is not None:
-                        clause = And(clause, item <= max_val)
\ No newline at end of file
+                        clause = And(clause, item <= max_val)
+
+
+def parse_fields(
+    model: type[BaseModel], fields: str | None
+) -> frozenset[str] | None:
+    """
+    Field names of a comma separated ``fields`` parameter, validated
+    against the top-level fields of the response model. ``id`` is always
+    included; None when no fields were requested.
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - model.model_fields.keys()
+    if not names or unknown:
+        raise UserError(
+            Reason.INVALID_FIELDS, details={"fields": sorted(unknown)}
+        )
+    return frozenset(names | {"id"})
+
+
+def build_projection(
+    model: type[BaseModel], fields: Iterable[str]
+) -> dict[str, int]:
+    """
+    Mongo projection of response fields. Nested models (a fetched link)
+    are projected to their own fields only.
+    """
+    projection = {}
+    for name in fields:
+        annotation = model.model_fields[name].annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            for nested in annotation.model_fields:
+                projection[f"{name}.{_stored_name(nested)}"] = 1
+        else:
+            projection[_stored_name(name)] = 1
+    return projection
+
+
+@lru_cache(maxsize=256)
+def partial_model[Model: BaseModel](
+    model: type[Model], fields: frozenset[str]
+) -> type[BaseModel]:
+    """Response model restricted to ``fields``, with the same validation."""
+    return create_model(
+        f"{model.__name__}Fields",
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items() if name in fields
+        }
+    )
+
+
+def from_stored(data: dict) -> dict:
+    """Rename the ``_id`` keys of a projected document (and its links)."""
+    return {
+        _field_name(key): from_stored(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
+def _stored_name(field: str) -> str:
+    return "_id" if field == "id" else field
+
+
+def _field_name(key: str) -> str:
+    return "id" if key == "_id" else key
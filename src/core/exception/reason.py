@@ -11,4 +11,7 @@ class Reason(Enum):
     UPPER_PASSWORD: str = "UPPER_PASSWORD"
     CHAR_PASSWORD: str = "CHAR_PASSWORD"
     DIGIT_PASSWORD: str = "DIGIT_PASSWORD"
-    INVALID_CREDS: str = "INVALID_CREDS"
\ No newline at end of file
+    INVALID_CREDS: str = "INVALID_CREDS"
+    INVALID_FIELDS: str = "INVALID_FIELDS"
+    INVALID_REFRESH_TOKEN: str = "INVALID_REFRESH_TOKEN"
+    INVALID_USER_RECORD: str = "INVALID_USER_RECORD"
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Service metrics and the decorators recording them."""
+from functools import wraps
+from time import perf_counter
+
+from src.core.metrics.registry import Counter, Histogram
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+HTTP_ERRORS = Counter(
+    "http_request_errors_total",
+    "HTTP requests that raised or ended with a 5xx status",
+    ("method", "route"),
+)
+REPOSITORY_LATENCY = Histogram(
+    "repository_operation_duration_seconds",
+    "BeanieRepository call latency", ("model", "operation"),
+)
+REPOSITORY_ERRORS = Counter(
+    "repository_operation_errors_total",
+    "BeanieRepository calls that raised", ("model", "operation"),
+)
+REDIS_LATENCY = Histogram(
+    "redis_operation_duration_seconds", "RedisService call latency",
+    ("operation",),
+)
+REDIS_ERRORS = Counter(
+    "redis_operation_errors_total", "RedisService calls that raised",
+    ("operation",),
+)
+PUBLISH_LATENCY = Histogram(
+    "broker_publish_duration_seconds", "RabbitMqPublisher.publish latency",
+    ("routing_key",),
+)
+PUBLISH_ERRORS = Counter(
+    "broker_publish_errors_total", "RabbitMqPublisher.publish calls that raised",
+    ("routing_key",),
+)
+
+
+def timed(histogram: Histogram, errors: Counter, *labels: str):
+    """Record latency and errors of a coroutine function.
+
+    The metric children are resolved once, at decoration time.
+    """
+    latency_child = histogram.labels(*labels)
+    error_child = errors.labels(*labels)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                error_child.inc()
+                raise
+            finally:
+                latency_child.observe(perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def timed_repository(operation: str):
+    """Like :func:`timed`, labelled with the repository's model name."""
+    children: dict[str, tuple] = {}
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            model = self.model_cls.__name__
+            pair = children.get(model)
+            if pair is None:
+                pair = children[model] = (
+                    REPOSITORY_LATENCY.labels(model, operation),
+                    REPOSITORY_ERRORS.labels(model, operation),
+                )
+            started = perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            except BaseException:
+                pair[1].inc()
+                raise
+            finally:
+                pair[0].observe(perf_counter() - started)
+        return wrapper
+    return decorator
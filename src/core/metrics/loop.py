@@ -0,0 +1,117 @@
+"""Event-loop lag monitor and blocking-call detector.
+
+The lag monitor sleeps for a fixed interval and records how late it was woken
+up: the scheduling delay every other callback on the loop suffers as well.
+
+In debug mode a watchdog thread additionally watches a heartbeat the loop
+updates several times per threshold. When the loop misses it for longer than
+the threshold, the loop thread's stack is captured once per stall, logged and
+attributed to the innermost frame of the service code (``src.*``).
+"""
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from time import monotonic
+from types import FrameType
+
+from src.core.metrics.registry import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Event loop scheduling delay",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Loop stalls above the blocking threshold by culprit function",
+    ("module", "function"),
+)
+
+
+def find_culprit(frame: FrameType) -> FrameType:
+    """Innermost frame belonging to the service, else the innermost one."""
+    innermost = current = frame
+    while current is not None:
+        if current.f_globals.get("__name__", "").startswith("src."):
+            return current
+        current = current.f_back
+    return innermost
+
+
+class LoopMonitor:
+
+    def __init__(self):
+        self._tasks: list[asyncio.Task] = []
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._heartbeat = monotonic()
+
+    def start(
+        self,
+        interval: float,
+        blocking_debug: bool = False,
+        blocking_threshold: float = 0.1,
+    ) -> None:
+        if self._tasks:
+            return
+        self._stop.clear()
+        self._tasks.append(asyncio.create_task(self._measure(interval)))
+        if blocking_debug:
+            self._heartbeat = monotonic()
+            self._tasks.append(
+                asyncio.create_task(self._beat(blocking_threshold / 4))
+            )
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(), blocking_threshold),
+                name="loop-watchdog", daemon=True,
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._watchdog is not None:
+            self._stop.set()
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _measure(self, interval: float) -> None:
+        lag = LOOP_LAG.labels()
+        while True:
+            expected = monotonic() + interval
+            await asyncio.sleep(interval)
+            lag.observe(max(monotonic() - expected, 0.0))
+
+    async def _beat(self, interval: float) -> None:
+        while True:
+            self._heartbeat = monotonic()
+            await asyncio.sleep(interval)
+
+    def _watch(self, loop_thread_id: int, threshold: float) -> None:
+        reported = None
+        while not self._stop.wait(threshold / 4):
+            beat = self._heartbeat
+            stalled = monotonic() - beat
+            if stalled < threshold or beat == reported:
+                continue
+            frame = sys._current_frames().get(loop_thread_id)
+            if frame is None:
+                continue
+            reported = beat
+            culprit = find_culprit(frame)
+            module = culprit.f_globals.get("__name__", "?")
+            function = culprit.f_code.co_qualname
+            LOOP_BLOCKED.labels(module, function).inc()
+            logger.warning(
+                "event loop blocked for over %.0f ms in %s.%s\n%s",
+                stalled * 1000, module, function,
+                "".join(traceback.format_stack(frame)),
+            )
+
+
+LOOP_MONITOR = LoopMonitor()
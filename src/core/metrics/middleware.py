@@ -0,0 +1,53 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics.instrument import HTTP_ERRORS, HTTP_LATENCY
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # route -> method -> status -> histogram child
+        self._latency: dict[str, dict[str, dict[int, object]]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        started = perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            self._latency_child(path, method, status).observe(
+                perf_counter() - started
+            )
+            if status >= 500:
+                HTTP_ERRORS.labels(method, path).inc()
+
+    def _latency_child(self, path: str, method: str, status: int):
+        by_method = self._latency.get(path)
+        if by_method is None:
+            by_method = self._latency[path] = {}
+        by_status = by_method.get(method)
+        if by_status is None:
+            by_status = by_method[method] = {}
+        child = by_status.get(status)
+        if child is None:
+            child = by_status[status] = HTTP_LATENCY.labels(
+                method, path, str(status)
+            )
+        return child
@@ -0,0 +1,118 @@
+"""Connection-pool telemetry for the MongoDB client and redis-py."""
+import weakref
+
+from pymongo import monitoring
+from redis.asyncio.client import Redis
+
+from src.core.metrics.registry import Counter, Gauge, Histogram
+
+MONGO_POOL = Gauge(
+    "mongo_pool_connections", "MongoDB connection pool connections by state",
+    ("state",),
+)
+MONGO_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled MongoDB connection",
+)
+MONGO_CHECKOUT_FAILED = Counter(
+    "mongo_pool_checkout_failed_total",
+    "Failed MongoDB connection checkouts by reason", ("reason",),
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency",
+    ("command",),
+)
+MONGO_COMMAND_FAILED = Counter(
+    "mongo_command_failed_total", "Failed MongoDB commands", ("command",),
+)
+REDIS_POOL = Gauge(
+    "redis_pool_connections", "Redis connection pool connections by state",
+    ("state",),
+)
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Tracks pool usage and checkout wait time of a MongoDB client."""
+
+    def __init__(self):
+        self.open = MONGO_POOL.labels("open")
+        self.in_use = MONGO_POOL.labels("in_use")
+        self.waiting = MONGO_POOL.labels("waiting")
+        self.checkout_wait = MONGO_CHECKOUT_WAIT.labels()
+
+    def connection_created(self, event):
+        self.open.inc()
+
+    def connection_closed(self, event):
+        self.open.dec()
+
+    def connection_check_out_started(self, event):
+        self.waiting.inc()
+
+    def connection_check_out_failed(self, event):
+        self.waiting.dec()
+        MONGO_CHECKOUT_FAILED.labels(str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        self.waiting.dec()
+        self.in_use.inc()
+        if event.duration is not None:
+            self.checkout_wait.observe(event.duration)
+
+    def connection_checked_in(self, event):
+        self.in_use.dec()
+
+    def pool_created(self, event): ...
+
+    def pool_ready(self, event): ...
+
+    def pool_cleared(self, event): ...
+
+    def pool_closed(self, event): ...
+
+    def connection_ready(self, event): ...
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records MongoDB command latency by command name."""
+
+    def __init__(self):
+        self._latency: dict[str, object] = {}
+
+    def started(self, event): ...
+
+    def succeeded(self, event):
+        self._observe(event.command_name, event.duration_micros)
+
+    def failed(self, event):
+        MONGO_COMMAND_FAILED.labels(event.command_name).inc()
+        self._observe(event.command_name, event.duration_micros)
+
+    def _observe(self, command: str, duration_micros: int) -> None:
+        child = self._latency.get(command)
+        if child is None:
+            child = self._latency[command] = MONGO_COMMAND_LATENCY.labels(
+                command
+            )
+        child.observe(duration_micros / 1_000_000)
+
+
+_redis_clients: "weakref.WeakSet[Redis]" = weakref.WeakSet()
+
+
+def _collect_redis_pools():
+    in_use = available = 0
+    for client in _redis_clients:
+        pool = client.connection_pool
+        in_use += len(getattr(pool, "_in_use_connections", ()))
+        available += len(getattr(pool, "_available_connections", ()))
+    return [(("in_use",), in_use), (("available",), available)]
+
+
+REDIS_POOL.set_function(_collect_redis_pools)
+
+
+def track_redis_pool(client: Redis) -> None:
+    """Report the pool of ``client`` in ``redis_pool_connections``."""
+    _redis_clients.add(client)
+
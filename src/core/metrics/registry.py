@@ -0,0 +1,336 @@
+"""Minimal Prometheus-compatible metrics registry.
+
+Metric children are created once per label set and cached, so recording a
+sample on the hot path is a dict lookup plus an integer/float bump.
+
+With several uvicorn workers every process periodically dumps its samples to
+``<metrics_dir>/<pid>.json``; the ``/metrics`` endpoint merges the snapshots
+of all workers. Counters and histograms are summed over every snapshot found;
+gauges are summed over live workers only. A starting worker folds the
+counters and histograms of exited workers into ``exited.json`` and removes
+their snapshots, so values of exited workers are kept (like Prometheus
+counters) without a file per past pid, and a worker reusing the pid of an
+exited one does not overwrite its values.
+"""
+import asyncio
+import fcntl
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+EXITED = "exited"
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # the extra slot is the +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    type: str = ""
+    child_cls: type = CounterChild
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "Registry | None" = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[LabelValues, object] = {}
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        return self.child_cls()
+
+    def labels(self, *values: str):
+        """Return the cached child for ``values``, creating it once."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self) -> list[tuple[LabelValues, object]]:
+        return [
+            (labels, self._dump(child))
+            for labels, child in self._children.items()
+        ]
+
+    @staticmethod
+    def _dump(child) -> object:
+        return child.value
+
+
+class Counter(Metric):
+    type = "counter"
+
+
+class Gauge(Metric):
+    type = "gauge"
+    child_cls = GaugeChild
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._collectors: list[Callable[[], Iterable[tuple[LabelValues, float]]]] = []
+
+    def set_function(
+        self, collector: Callable[[], Iterable[tuple[LabelValues, float]]]
+    ) -> None:
+        """Register a callback evaluated at collection time."""
+        self._collectors.append(collector)
+
+    def samples(self) -> list[tuple[LabelValues, object]]:
+        values = {labels: value for labels, value in super().samples()}
+        for collector in self._collectors:
+            for labels, value in collector():
+                values[labels] = values.get(labels, 0.0) + value
+        return list(values.items())
+
+
+class Histogram(Metric):
+    type = "histogram"
+    child_cls = HistogramChild
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    @staticmethod
+    def _dump(child: HistogramChild) -> object:
+        return {"counts": list(child.counts), "sum": child.sum}
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._directory: Path | None = None
+        self._task: asyncio.Task | None = None
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def snapshot(self) -> dict:
+        return {
+            name: [[list(labels), value] for labels, value in metric.samples()]
+            for name, metric in self._metrics.items()
+        }
+
+    # multiprocess support
+
+    def start(self, directory: str | None, interval: float) -> None:
+        """Start dumping this worker's samples into ``directory``."""
+        if not directory or self._task is not None:
+            return
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._collect_exited()
+        self._task = asyncio.create_task(self._flush_forever(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        await asyncio.to_thread(self._write, self.snapshot())
+
+    async def _flush_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self._write, self.snapshot())
+
+    def _write(self, snapshot: dict, name: str | None = None) -> None:
+        path = self._directory / f"{name or os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot))
+        tmp.replace(path)
+
+    def _collect_exited(self) -> None:
+        """
+        Fold the snapshots of exited workers into ``exited.json`` and remove
+        them. A snapshot named after this process's pid is from an exited
+        process whose pid was reused. Gauges of exited workers are dropped.
+        """
+        with open(self._directory / f"{EXITED}.lock", "w") as lock:
+            # workers starting together must not fold the same snapshot
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            exited = [
+                path for path in self._directory.glob("*.json")
+                if path.stem.isdigit() and (
+                    int(path.stem) == os.getpid()
+                    or not _is_alive(int(path.stem))
+                )
+            ]
+            if not exited:
+                return
+            merged: dict[str, dict] = {}
+            for path in [self._directory / f"{EXITED}.json", *exited]:
+                try:
+                    snapshot = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, samples in snapshot.items():
+                    metric = self._metrics.get(name)
+                    if metric is not None and metric.type == "gauge":
+                        continue
+                    target = merged.setdefault(name, {})
+                    for labels, value in samples:
+                        labels = tuple(labels)
+                        target[labels] = _merge(target.get(labels), value)
+            self._write(
+                {
+                    name: [
+                        [list(labels), value]
+                        for labels, value in target.items()
+                    ]
+                    for name, target in merged.items()
+                },
+                EXITED
+            )
+            for path in exited:
+                path.unlink(missing_ok=True)
+
+    def read_workers(self) -> dict[str, dict]:
+        """
+        Read the snapshots of the other workers and of the exited ones,
+        by file name (blocking I/O).
+        """
+        if self._directory is None:
+            return {}
+        workers = {}
+        for path in self._directory.glob("*.json"):
+            if path.stem == str(os.getpid()):
+                continue
+            try:
+                workers[path.stem] = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+        return workers
+
+    # exposition
+
+    def render(self, workers: dict[str, dict] | None = None) -> str:
+        """Render merged samples in the Prometheus text format (0.0.4)."""
+        merged = {
+            name: {tuple(labels): value for labels, value in samples}
+            for name, samples in self.snapshot().items()
+        }
+        for worker, snapshot in (workers or {}).items():
+            alive = worker.isdigit() and _is_alive(int(worker))
+            for name, samples in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                target = merged.setdefault(name, {})
+                for labels, value in samples:
+                    labels = tuple(labels)
+                    target[labels] = _merge(target.get(labels), value)
+
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for labels, value in merged.get(name, {}).items():
+                pairs = list(zip(metric.labelnames, labels))
+                if metric.type == "histogram":
+                    lines.extend(_render_histogram(name, metric, pairs, value))
+                else:
+                    lines.append(f"{name}{_format_labels(pairs)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(current, value):
+    if current is None:
+        return value
+    if isinstance(value, dict):
+        return {
+            "counts": [a + b for a, b in zip(current["counts"], value["counts"])],
+            "sum": current["sum"] + value["sum"],
+        }
+    return current + value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _render_histogram(name, metric: Histogram, pairs, value) -> list[str]:
+    lines = []
+    cumulative = 0
+    bounds = [*map(str, metric.buckets), "+Inf"]
+    for bound, count in zip(bounds, value["counts"]):
+        cumulative += count
+        labels = _format_labels([*pairs, ("le", bound)])
+        lines.append(f"{name}_bucket{labels} {cumulative}")
+    lines.append(f"{name}_count{_format_labels(pairs)} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(pairs)} {value['sum']}")
+    return lines
+
+
+REGISTRY = Registry()
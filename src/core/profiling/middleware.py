@@ -0,0 +1,93 @@
+import asyncio
+import random
+import re
+import uuid
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.auth.admin import AdminAuthBackend
+from src.core.config import ProfilingConfig
+from src.core.profiling.sampler import TaskSampler
+
+PROFILE_HEADER = "x-profile"
+REQUEST_ID_HEADER = "x-request-id"
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ProfilingMiddleware:
+    """Profiles requests on demand and stores folded stacks per request ID.
+
+    A request is profiled when it carries ``X-Profile: 1`` together with a
+    valid admin token, or when it is picked by ``sample_rate``. The response
+    then carries ``X-Request-ID`` and ``X-Profile-Id``, the profile is stored
+    as ``<output_dir>/<request id>.folded``. Beyond ``max_files`` profiles
+    the oldest ones are deleted.
+    """
+
+    def __init__(
+        self, app: ASGIApp, config: ProfilingConfig, admin: AdminAuthBackend
+    ):
+        self.app = app
+        self.config = config
+        self.admin = admin
+        self.output_dir = Path(config.output_dir)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        request_id = headers.get(REQUEST_ID_HEADER, "")
+        if not PROFILE_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [
+                    *message["headers"],
+                    (b"x-request-id", request_id.encode()),
+                    (b"x-profile-id", request_id.encode()),
+                ]
+            await send(message)
+
+        sampler = TaskSampler(
+            asyncio.current_task(),
+            interval=self.config.interval_ms / 1000,
+            root=f"{scope['method']} {scope['path']}",
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            await asyncio.to_thread(self._store, request_id, sampler.folded())
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if random.random() < self.config.sample_rate:
+            return True
+        headers = Headers(scope=scope)
+        return headers.get(PROFILE_HEADER) == "1" and self.admin.is_admin(
+            headers
+        )
+
+    def _store(self, request_id: str, folded: str) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / f"{request_id}.folded").write_text(folded)
+        self._prune()
+
+    def _prune(self) -> None:
+        profiles = []
+        for path in self.output_dir.glob("*.folded"):
+            try:
+                profiles.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                # deleted by another worker
+                continue
+        excess = len(profiles) - self.config.max_files
+        if excess > 0:
+            for _, path in sorted(profiles)[:excess]:
+                path.unlink(missing_ok=True)
+
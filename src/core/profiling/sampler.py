@@ -0,0 +1,97 @@
+"""Wall-clock sampling profiler for a single asyncio task.
+
+A daemon thread periodically captures where the task is:
+
+- when the task is running, the loop thread's stack from the task's
+  outermost coroutine down (this includes blocking sync calls);
+- when the task is suspended, its coroutine ``await`` chain, ending with
+  the awaited object (e.g. a socket future).
+
+Samples are aggregated into the "folded stacks" format understood by
+flamegraph.pl, speedscope and inferno.
+"""
+import asyncio
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _await_chain(coro) -> tuple[list[FrameType], object]:
+    frames = []
+    awaited = coro
+    while awaited is not None:
+        frame = getattr(awaited, "cr_frame", None) or getattr(
+            awaited, "gi_frame", None
+        )
+        if frame is None:
+            break
+        frames.append(frame)
+        awaited = getattr(awaited, "cr_await", None) or getattr(
+            awaited, "gi_yieldfrom", None
+        )
+    return frames, awaited
+
+
+class TaskSampler:
+
+    def __init__(self, task: asyncio.Task, interval: float, root: str):
+        self.task = task
+        self.interval = interval
+        self.root = root
+        self.samples: Counter[str] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="task-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.items()
+        )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except (RuntimeError, ValueError):
+                # the task moved on while it was being inspected
+                continue
+
+    def _sample(self) -> None:
+        coro = self.task.get_coro()
+        if coro is None:
+            return
+        chain, awaited = _await_chain(coro)
+        if not chain:
+            return
+
+        if getattr(coro, "cr_running", False):
+            stack = []
+            frame = sys._current_frames().get(self._thread_id)
+            outermost = chain[0]
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                if frame is outermost:
+                    break
+                frame = frame.f_back
+            stack.reverse()
+            state = "[running]"
+        else:
+            stack = [_frame_label(frame) for frame in chain]
+            state = f"[awaiting {type(awaited).__name__}]"
+
+        self.samples[";".join((self.root, *stack, state))] += 1
@@ -5,12 +5,21 @@ from dishka import provide, Scope, make_async_container
 from dishka.integrations.fastapi import FastapiProvider
 from redis.asyncio.client import Redis
 
-from src.core.auth.setup import RequestAuthProvider, SessionAuthProvider
+from src.core.auth.setup import (
+    RequestAuthProvider, RevocationProvider, SessionAuthProvider
+)
 from src.core.brokers.setup import MessagingProvider
 from src.services.provider import RepositoryProvider
 from src.core.config import Config
 from src.core.database.provider import DatabaseConnectionProvider
+from src.core.metrics.pools import track_redis_pool
 from src.core.manager import ServiceManagerProvider
+from src.services.auth.setup import (
+    ImportProvider, ProfileProvider, TokenProvider
+)
+from src.services.events.setup import (
+    FeedProvider, ReminderProvider, StatsProvider
+)
 from src.services.redis.setup import RedisServiceProvider
 
 CONFIG_DEFAULT_PATH = "settings/config.json"
@@ -18,9 +27,14 @@ CONFIG_DEFAULT_PATH = "settings/config.json"
 class CoreProvider(DatabaseConnectionProvider):
     scope: Scope = Scope.APP
     config_path: str = os.getenv("CONFIG_PATH", CONFIG_DEFAULT_PATH)
+    # parsed once per process: get_config() is called on hot paths
+    # (password hashing, token issuing, error handlers)
+    _config: Config | None = None
 
     def get_config(self) -> Config:
-        return Config.parse(self.config_path)
+        if CoreProvider._config is None:
+            CoreProvider._config = Config.parse(self.config_path)
+        return CoreProvider._config
 
     @provide
     def get_core_config(self) -> Config:
@@ -32,6 +46,7 @@ class CoreProvider(DatabaseConnectionProvider):
             config.redis.redis_uri,
             max_connections=config.redis.max_connections
         )
+        track_redis_pool(redis)
         try:
             yield redis
         finally:
@@ -44,6 +59,13 @@ CORE_PROVIDERS = (
     MessagingProvider(),
     RepositoryProvider(),
     RedisServiceProvider(),
+    FeedProvider(),
+    ReminderProvider(),
+    StatsProvider(),
+    ProfileProvider(),
+    TokenProvider(),
+    ImportProvider(),
+    RevocationProvider(),
     RequestAuthProvider(),
     SessionAuthProvider(),
     FastapiProvider()
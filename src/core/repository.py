@@ -1,34 +1,66 @@
 from datetime import datetime, timezone
-from typing import Any, Iterable, Sequence, TypeAlias, overload
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Awaitable, Iterable, Sequence, TypeAlias, overload
 
-from beanie import Document
-from beanie.odm.operators.update.general import Set
+from beanie import Document, UpdateResponse
+from beanie.odm.operators.update.general import Inc, Set
 from beanie.odm.queries.find import FindMany, FindOne
 from beanie.odm.operators.find.logical import (
     LogicalOperatorForListOfExpressions
 )
-from motor.motor_asyncio import AsyncIOMotorClientSession
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo.asynchronous.client_session import AsyncClientSession
+
+from src.core.database.slowlog import SLOW_QUERIES
+from src.core.metrics.instrument import timed_repository
 
 ColumnItem: TypeAlias = str | Any
 
 
+class Projection(BaseModel):
+    """Result of a projected query: ``id`` plus the projected fields."""
+    model_config = ConfigDict(extra="allow")
+
+    id: Any = Field(default=None, alias="_id")
+
+
+@lru_cache(maxsize=256)
+def _projection_model(fields: tuple[tuple[str, int], ...]) -> type[Projection]:
+    # Beanie takes projections as models, Settings.projection wins over
+    # the model fields
+    settings = type("Settings", (), {"projection": dict(fields)})
+    return type(
+        "Projection", (Projection,),
+        {"Settings": settings, "__module__": __name__}
+    )
+
+
 class BeanieRepository[TDoc: Document]:
     model_cls: TDoc
 
     def __init__(self, model_cls: TDoc):
         self.model_cls = model_cls
 
+    @timed_repository("count")
     async def count(self, where: dict | None = None) -> int:
         where = where or {}
-        return await self.model_cls.find(where).count()
+        query = self.model_cls.find(where)
+        return await self._execute("count", query, query.count())
 
+    @timed_repository("create")
     async def create(self, **values) -> TDoc:
         doc = self.model_cls(**values)
         return await doc.insert()
 
-    async def add_many(self, items: Iterable[TDoc]) -> list[TDoc]:
-        return await self.model_cls.insert_many(items)
+    @timed_repository("add_many")
+    async def add_many(
+        self, items: Iterable[TDoc], ordered: bool = True
+    ) -> list[TDoc]:
+        """With ``ordered=False`` a failing document does not stop the rest."""
+        return await self.model_cls.insert_many(items, ordered=ordered)
 
+    @timed_repository("get_one")
     async def get_one(
         self,
         *,
@@ -38,7 +70,7 @@ class BeanieRepository[TDoc: Document]:
         skip: int = 0,
         fetch_links: bool = False,
         project: dict[str, int] | None = None,
-        session: AsyncIOMotorClientSession | None = None,
+        session: AsyncClientSession | None = None,
     ) -> TDoc | None:
         """
         Return a single document matching the filter or None.
@@ -51,8 +83,9 @@ class BeanieRepository[TDoc: Document]:
         query = self._apply_projection(query, project)
         query = query.skip(skip).limit(1)
         query.fetch_links = fetch_links
-        return await query.first_or_none()
+        return await self._execute("get_one", query, query.first_or_none())
 
+    @timed_repository("get_many")
     async def get_many(
         self,
         *,
@@ -63,7 +96,7 @@ class BeanieRepository[TDoc: Document]:
         skip: int | None = None,
         fetch_links: bool = False,
         project: dict[str, int] | None = None,
-        session: AsyncIOMotorClientSession | None = None,
+        session: AsyncClientSession | None = None,
     ) -> list[TDoc]:
         where = where or {}
         query = self.model_cls.find(where, session=session)
@@ -74,14 +107,29 @@ class BeanieRepository[TDoc: Document]:
         if limit:
             query = query.limit(limit)
         query.fetch_links = fetch_links
-        return await query.to_list()
+        return await self._execute("get_many", query, query.to_list())
+
+    @timed_repository("aggregate")
+    async def aggregate(
+        self,
+        pipeline: list[dict],
+        *,
+        where: dict | LogicalOperatorForListOfExpressions | None = None,
+        session: AsyncClientSession | None = None,
+    ) -> list[dict]:
+        """Run ``pipeline`` on the documents matching ``where``."""
+        query = self.model_cls.find(where or {}, session=session)
+        return await self._execute(
+            "aggregate", query, query.aggregate(pipeline).to_list()
+        )
 
+    @timed_repository("get_unique")
     async def get_unique(
         self,
         *,
         where: dict | LogicalOperatorForListOfExpressions,
         fetch_links: bool = False,
-        session: AsyncIOMotorClientSession | None = None,
+        session: AsyncClientSession | None = None,
     ) -> TDoc | None:
         """
         Ensure the result set contains at most one document.
@@ -90,7 +138,8 @@ class BeanieRepository[TDoc: Document]:
         """
         query = self.model_cls.find(where, session=session)
         query.fetch_links = fetch_links
-        docs = await query.limit(2).to_list()
+        query = query.limit(2)
+        docs = await self._execute("get_unique", query, query.to_list())
         if len(docs) > 1:
             raise ValueError(f"Invalid where: {where}")
         return docs[0] if docs else None
@@ -101,6 +150,7 @@ class BeanieRepository[TDoc: Document]:
     @overload
     async def update(self, *docs: TDoc, **values) -> int: ...
 
+    @timed_repository("update")
     async def update(
         self,
         *docs: TDoc,
@@ -117,7 +167,10 @@ class BeanieRepository[TDoc: Document]:
             return 0
 
         if where is not None:
-            res = await self.model_cls.find(where).update_many(Set(values))
+            query = self.model_cls.find(where)
+            res = await self._execute(
+                "update", query, query.update_many(Set(values))
+            )
             return int(res.modified_count)
 
         if docs:
@@ -132,12 +185,39 @@ class BeanieRepository[TDoc: Document]:
 
         raise ValueError("Only where or *docs supported")
 
+    @timed_repository("update_one")
+    async def update_one(
+        self,
+        *,
+        where: dict | LogicalOperatorForListOfExpressions,
+        set_values: dict,
+        increment: dict | None = None,
+        return_old: bool = False,
+    ) -> TDoc | None:
+        """
+        Atomically update a single document (findOneAndUpdate).
+        Returns the document as it was before the update when return_old is
+        set, the updated document otherwise; None if nothing matched.
+        """
+        operators = [Set(set_values)]
+        if increment:
+            operators.append(Inc(increment))
+        query = self.model_cls.find_one(where)
+        return await self._execute("update_one", query, query.update(
+            *operators,
+            response_type=(
+                UpdateResponse.OLD_DOCUMENT if return_old
+                else UpdateResponse.NEW_DOCUMENT
+            ),
+        ))
+
     @overload
     async def delete(self, *docs: TDoc, soft: bool = True) -> int: ...
 
     @overload
     async def delete(self, *, where: dict, soft: bool = True) -> int: ...
 
+    @timed_repository("delete")
     async def delete(
         self, *docs: TDoc, where: dict | None = None,
         soft: bool = True,
@@ -156,9 +236,10 @@ class BeanieRepository[TDoc: Document]:
                 )
             tz = timezone.utc  # Use consistent timezone awareness for Mongo
             if where is not None:
-                res = await self.model_cls.find(where).update_many(
+                query = self.model_cls.find(where)
+                res = await self._execute("delete", query, query.update_many(
                     Set({"deleted_at": datetime.now(tz)})
-                )
+                ))
                 return int(res.modified_count)
             if docs:
                 modified = 0
@@ -170,7 +251,8 @@ class BeanieRepository[TDoc: Document]:
             raise ValueError("Only where or *docs supported")
 
         if where is not None:
-            res = await self.model_cls.find(where).delete()
+            query = self.model_cls.find(where)
+            res = await self._execute("delete", query, query.delete())
             return int(getattr(res, "deleted_count", 0))
         if docs:
             deleted = 0
@@ -181,6 +263,7 @@ class BeanieRepository[TDoc: Document]:
 
         raise ValueError("Only where or *docs supported")
 
+    @timed_repository("upsert_one")
     async def upsert_one(
         self,
         *,
@@ -192,12 +275,27 @@ class BeanieRepository[TDoc: Document]:
         set_values = set_values or {}
         set_on_insert = set_on_insert or {}
 
-        await self.model_cls.find(where).upsert_one(
+        query = self.model_cls.find(where)
+        await self._execute("upsert_one", query, query.upsert_one(
             on_insert={**where, **set_on_insert},  # что вставлять, если нет
             on_update=Set(set_values),             # что обновлять, если есть
-        )
+        ))
         return await self.model_cls.find_one(where)
 
+    async def _execute[TResult](
+        self,
+        operation: str,
+        query: FindMany[TDoc] | FindOne[TDoc],
+        pending: Awaitable[TResult],
+    ) -> TResult:
+        """Await a built query, reporting it to the slow query log."""
+        started = perf_counter()
+        try:
+            return await pending
+        finally:
+            SLOW_QUERIES.observe(
+                self.model_cls, operation, query, perf_counter() - started
+            )
 
     def _resolve_field(self, item: ColumnItem):
         if isinstance(item, str):
@@ -233,4 +331,8 @@ class BeanieRepository[TDoc: Document]:
         query: FindMany[TDoc] | FindOne[TDoc],
         project: dict[str, int] | None,
     ):
-        return query.project(project) if project else query
+        """Projected queries return ``Projection`` instances, not documents."""
+        if not project:
+            return query
+        fields = tuple(sorted(project.items()))
+        return query.project(_projection_model(fields))
@@ -1,10 +1,11 @@
 from src.core.application.factory import create
-from src.api import auth, events
+from src.api import admin, auth, events, health, metrics
 from src.core.exception.handlers import exception_handlers
 
 app = create(
     base_router_path="/api",
-    routers=(auth.router, events.router),
+    routers=(auth.router, events.router, admin.router),
+    service_routers=(metrics.router, health.router),
     startup_tasks=(),
     shutdown_tasks=(),
     exception_handlers=exception_handlers,
@@ -0,0 +1,20 @@
+import asyncio
+import logging
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from src.core.provider import core_container
+from src.migrations.runner import run_pending
+
+
+async def main() -> None:
+    try:
+        applied = await run_pending(await core_container.get(AsyncDatabase))
+        logging.info("Applied migrations: %s", ", ".join(applied) or "none")
+    finally:
+        await core_container.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
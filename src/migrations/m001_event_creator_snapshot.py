@@ -0,0 +1,34 @@
+"""Embed the creator snapshot (``Event.creator``) into existing events."""
+from pymongo import UpdateMany
+from pymongo.asynchronous.database import AsyncDatabase
+
+BATCH_SIZE = 500
+
+
+async def up(db: AsyncDatabase) -> None:
+    missing = {"creator": None}
+    creator_ids = {
+        doc["created_by"].id
+        async for doc in db["events"].find(missing, {"created_by": 1})
+    }
+    creator_ids = list(creator_ids)
+    for start in range(0, len(creator_ids), BATCH_SIZE):
+        batch = creator_ids[start:start + BATCH_SIZE]
+        users = db["users"].find(
+            {"_id": {"$in": batch}},
+            {"email": 1, "username": 1, "full_name": 1}
+        )
+        requests = [
+            UpdateMany(
+                {"created_by.$id": user["_id"], **missing},
+                {"$set": {"creator": {
+                    "id": user["_id"],
+                    "email": user["email"],
+                    "username": user["username"],
+                    "full_name": user.get("full_name"),
+                }}}
+            )
+            async for user in users
+        ]
+        if requests:
+            await db["events"].bulk_write(requests, ordered=False)
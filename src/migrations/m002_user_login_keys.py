@@ -0,0 +1,51 @@
+"""Fill ``User.login_keys`` and create its unique multikey index.
+
+Users whose normalized username or email collides with another user's
+fail the migration; they have to be fixed by hand before it is rerun.
+"""
+import logging
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError
+
+from src.services.auth.models import LOGIN_KEYS_INDEX, build_login_keys
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+async def up(db: AsyncDatabase) -> None:
+    users = db["users"]
+    # the index must exist first so that colliding keys are rejected
+    await users.create_indexes([LOGIN_KEYS_INDEX])
+    requests = []
+    cursor = users.find(
+        {"login_keys": {"$not": {"$type": "string"}}},
+        {"username": 1, "email": 1}
+    )
+    async for user in cursor:
+        keys = build_login_keys(user["username"], user["email"])
+        requests.append(
+            ({"_id": user["_id"]}, {"$set": {"login_keys": keys}})
+        )
+        if len(requests) >= BATCH_SIZE:
+            await _write(users, requests)
+            requests = []
+    if requests:
+        await _write(users, requests)
+
+
+async def _write(users, requests: list[tuple]) -> None:
+    try:
+        await users.bulk_write(
+            [UpdateOne(*request) for request in requests], ordered=False
+        )
+    except BulkWriteError as exc:
+        for error in exc.details["writeErrors"]:
+            logger.error(
+                "Login key collision for user %s: %s",
+                requests[error["index"]][0]["_id"], error["errmsg"]
+            )
+        raise
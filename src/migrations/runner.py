@@ -0,0 +1,72 @@
+"""Ordered data migrations: ``python -m src.migrations``.
+
+Migrations are the ``mNNN_<name>`` modules of this package, applied in
+name order. Each defines ``async def up(db: AsyncDatabase)`` and must be
+safe to run again if it was interrupted. Applied migrations are recorded
+in the ``migrations`` collection; a lock document keeps concurrent runners
+(several containers starting at once) from applying them twice.
+"""
+import asyncio
+import importlib
+import logging
+import pkgutil
+import re
+from datetime import datetime, timedelta, timezone
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+import src.migrations
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_NAME = re.compile(r"m\d{3}_\w+")
+LOCK_ID = "__lock__"
+
+
+def discover() -> list[str]:
+    return sorted(
+        module.name for module in pkgutil.iter_modules(src.migrations.__path__)
+        if MIGRATION_NAME.fullmatch(module.name)
+    )
+
+
+async def run_pending(
+    db: AsyncDatabase,
+    *,
+    lock_timeout: timedelta = timedelta(minutes=30),
+    poll_interval: float = 1.0,
+) -> list[str]:
+    """Apply the migrations not applied yet; returns their names."""
+    collection = db["migrations"]
+    await _acquire(collection, lock_timeout, poll_interval)
+    try:
+        applied = {
+            doc["_id"] async for doc in collection.find({}, {"_id": 1})
+        }
+        pending = [name for name in discover() if name not in applied]
+        for name in pending:
+            module = importlib.import_module(f"{src.migrations.__name__}.{name}")
+            logger.info("Applying migration %s", name)
+            await module.up(db)
+            await collection.insert_one(
+                {"_id": name, "applied_at": datetime.now(tz=timezone.utc)}
+            )
+        return pending
+    finally:
+        await collection.delete_one({"_id": LOCK_ID})
+
+
+async def _acquire(collection, lock_timeout: timedelta, poll_interval: float):
+    while True:
+        now = datetime.now(tz=timezone.utc)
+        # a lock older than lock_timeout belongs to a runner that died
+        await collection.delete_one(
+            {"_id": LOCK_ID, "locked_at": {"$lt": now - lock_timeout}}
+        )
+        try:
+            await collection.insert_one({"_id": LOCK_ID, "locked_at": now})
+            return
+        except DuplicateKeyError:
+            logger.info("Waiting for another migration runner")
+            await asyncio.sleep(poll_interval)
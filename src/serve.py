@@ -0,0 +1,70 @@
+"""Production entry point: ``python -m src.serve``.
+
+Runs ``src.main:app`` under the uvicorn process supervisor with the
+settings from the ``server`` section of the configuration.
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+
+import uvicorn
+
+from src.core.application.lifecycle import SUPERVISED_ENV
+from src.core.provider import CoreProvider
+
+APP = "src.main:app"
+
+
+def _usable_cpus() -> int:
+    # respects cpuset limits of containers, unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def _http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def main(argv: list[str] | None = None):
+    config = CoreProvider().get_config()
+    server = config.server
+
+    parser = argparse.ArgumentParser(description="Run the Events Service")
+    parser.add_argument("--host", default=server.host)
+    parser.add_argument("--port", type=int, default=server.port)
+    parser.add_argument("--workers", type=int, default=server.workers)
+    args = parser.parse_args(argv)
+
+    workers = args.workers or _usable_cpus()
+    if workers > 1:
+        os.environ[SUPERVISED_ENV] = "1"
+    # snapshots of a previous run would be merged as live workers otherwise
+    if config.metrics.enabled and config.metrics.directory:
+        shutil.rmtree(config.metrics.directory, ignore_errors=True)
+
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=_event_loop(),
+        http=_http_protocol(),
+        backlog=server.backlog,
+        timeout_keep_alive=server.keep_alive_timeout,
+        # the worker drains on its own before uvicorn starts shutting down
+        timeout_graceful_shutdown=server.graceful_timeout,
+        access_log=server.access_log,
+        ws_per_message_deflate=server.ws_per_message_deflate,
+        proxy_headers=True,
+        forwarded_allow_ips=server.forwarded_allow_ips,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Bulk import of user accounts from NDJSON.
+
+Rows are validated like registrations and collected into chunks. The
+passwords of a chunk are hashed in parallel by a process pool while the
+previous chunk is written with an unordered ``insert_many``, so a duplicate
+only fails its own row.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from src.core.config import ImportConfig
+from src.core.exception.custom import UserError
+from src.core.exception.reason import Reason
+from src.services.auth.hashing import hash_passwords
+from src.services.auth.models import User, build_login_keys
+from src.services.auth.profiles import UnknownLogins
+from src.services.auth.repository import AuthRepository
+from src.services.auth.schemas import (
+    ImportReport, ImportRowError, RegisterRequest
+)
+
+DUPLICATE_KEY = 11000
+
+
+class PasswordHasher:
+    """bcrypt across a pool of processes, off the event loop."""
+
+    def __init__(self, *, workers: int | None, rounds: int, batch_size: int):
+        # forking a process that runs an event loop and threads is unsafe.
+        # A spawned process imports the parent's __main__ (src.serve, so
+        # the whole application) once when started; the pool keeps its
+        # processes, so that cost is paid once per worker, not per chunk.
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._rounds = rounds
+        self._batch_size = batch_size
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._pool, hash_passwords,
+                passwords[start:start + self._batch_size], self._rounds
+            )
+            for start in range(0, len(passwords), self._batch_size)
+        ))
+        return [hashed for batch in batches for hashed in batch]
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class UserImporter:
+
+    def __init__(
+        self,
+        auth_repo: AuthRepository,
+        hasher: PasswordHasher,
+        unknown_logins: UnknownLogins,
+        config: ImportConfig,
+    ):
+        self._auth_repo = auth_repo
+        self._hasher = hasher
+        self._unknown_logins = unknown_logins
+        self._chunk_size = config.chunk_size
+
+    async def run(self, body: AsyncIterable[bytes]) -> ImportReport:
+        report = ImportReport()
+        chunk: list[tuple[int, RegisterRequest]] = []
+        writing: asyncio.Task | None = None
+        async for number, line in _lines(body):
+            report.received += 1
+            if (request := _parse(number, line, report)) is not None:
+                chunk.append((number, request))
+            if len(chunk) >= self._chunk_size:
+                writing = await self._flush(chunk, writing, report)
+                chunk = []
+        writing = await self._flush(chunk, writing, report)
+        if writing is not None:
+            await writing
+        report.failed.sort(key=lambda row: row.line)
+        return report
+
+    async def _flush(
+        self,
+        chunk: list[tuple[int, RegisterRequest]],
+        writing: asyncio.Task | None,
+        report: ImportReport,
+    ) -> asyncio.Task | None:
+        """Hash ``chunk`` while the previous one is written, then write it."""
+        if not chunk:
+            if writing is not None:
+                await writing
+            return None
+        hashes = await self._hasher.hash_many(
+            [request.password for _, request in chunk]
+        )
+        if writing is not None:
+            await writing
+        now = datetime.now(tz=timezone.utc)
+        users = []
+        for (_, request), password_hash in zip(chunk, hashes):
+            values = request.model_dump(exclude={"password"})
+            users.append(User(
+                **values,
+                password_hash=password_hash,
+                login_keys=build_login_keys(
+                    values["username"], values["email"]
+                ),
+                created_at=now,
+                updated_at=now
+            ))
+        return asyncio.create_task(
+            self._write([number for number, _ in chunk], users, report)
+        )
+
+    async def _write(
+        self, numbers: list[int], users: list[User], report: ImportReport
+    ) -> None:
+        failed: dict[int, ImportRowError] = {}
+        try:
+            await self._auth_repo.add_many(users, ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details["writeErrors"]:
+                index = error["index"]
+                if error["code"] == DUPLICATE_KEY:
+                    failed[index] = ImportRowError(
+                        line=numbers[index],
+                        reason=Reason.USER_ALREADY_EXISTS,
+                        details=", ".join(error.get("keyValue") or ())
+                    )
+                else:
+                    failed[index] = ImportRowError(
+                        line=numbers[index],
+                        reason=Reason.INVALID_USER_RECORD,
+                        details=error.get("errmsg")
+                    )
+        report.failed.extend(failed.values())
+        created = [
+            user for index, user in enumerate(users) if index not in failed
+        ]
+        report.created += len(created)
+        if created:
+            await self._unknown_logins.discard(
+                *(key for user in created for key in user.login_keys)
+            )
+
+
+def _parse(
+    number: int, line: bytes, report: ImportReport
+) -> RegisterRequest | None:
+    try:
+        return RegisterRequest.model_validate_json(line)
+    except UserError as exc:
+        error = ImportRowError(line=number, reason=exc.reason)
+    except ValidationError as exc:
+        error = ImportRowError(
+            line=number,
+            reason=Reason.INVALID_USER_RECORD,
+            details="; ".join(
+                ".".join(map(str, item["loc"])) + f": {item['msg']}"
+                for item in exc.errors()
+            )
+        )
+    report.failed.append(error)
+    return None
+
+
+async def _lines(
+    body: AsyncIterable[bytes]
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Non-blank lines of a chunked body with their 1-based numbers."""
+    number, rest = 0, b""
+    async for data in body:
+        *lines, rest = (rest + data).split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if rest.strip():
+        yield number + 1, rest
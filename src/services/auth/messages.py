@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from pydantic import BaseModel, field_serializer
+
+
+class UserMessage(BaseModel):
+    """A user profile changed; consumers read the current profile by id."""
+    id: str
+    timestamp: datetime
+
+    @field_serializer("timestamp", when_used="json")
+    def serialize_timestamp(self, v: datetime) -> str:
+        return v.isoformat()
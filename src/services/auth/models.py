@@ -2,6 +2,25 @@ from datetime import datetime
 from typing import Optional, Annotated
 
 from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+def normalize_login(value: str) -> str:
+    return value.strip().lower()
+
+
+def build_login_keys(username: str, email: str) -> list[str]:
+    """Values a user can log in with, normalized for exact matching."""
+    return sorted({normalize_login(username), normalize_login(email)})
+
+
+LOGIN_KEYS_INDEX = IndexModel(
+    [("login_keys", ASCENDING)], name="login_keys", unique=True,
+    # users without keys (before migration m002) are not indexed
+    partialFilterExpression={"login_keys": {"$type": "string"}}
+)
+
 
 class User(Document):
     email: Annotated[str, Indexed(unique=True)]
@@ -11,6 +30,8 @@ class User(Document):
     is_verified: bool = True
     created_at: datetime
     updated_at: datetime
+    login_keys: list[str] = Field(default_factory=list)
 
     class Settings:
-        name = "users"
\ No newline at end of file
+        name = "users"
+        indexes = [LOGIN_KEYS_INDEX]
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""Public user profiles cached in-process and in Redis.
+
+Only the public fields are cached, never the password hash. The local LRU
+of a worker is not notified of changes made through other workers, its
+entries live for ``profile_local_ttl`` seconds; the Redis entry is
+invalidated on every profile change, and profiles loaded before the change
+are not written back over it.
+
+``UnknownLogins`` remembers login keys that matched no user, so repeated
+attempts with unregistered names do not reach MongoDB.
+"""
+from collections import OrderedDict
+from time import monotonic
+from typing import Iterable
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pydantic import BaseModel
+
+from src.core.config import CacheConfig
+from src.services.auth.repository import AuthRepository
+from src.services.redis.cache import CACHE_REQUESTS, cache_key
+from src.services.redis.service import RedisService
+
+PROFILE_FIELDS = {"email": 1, "username": 1, "full_name": 1}
+
+
+class UserProfile(BaseModel):
+    id: PydanticObjectId
+    email: str
+    username: str
+    full_name: str | None = None
+
+
+class ProfileCache:
+    """Profiles by user id: local LRU, then one MGET, then one $in query."""
+
+    def __init__(self, redis: RedisService, config: CacheConfig):
+        self._redis = redis
+        self._enabled = config.enabled
+        self._ttl = config.profile_ttl
+        self._window = config.invalidation_window
+        self._local_size = config.profile_local_size
+        self._local_ttl = config.profile_local_ttl
+        self._local: OrderedDict[str, tuple[float, UserProfile]] = OrderedDict()
+        self._metrics = {
+            outcome: CACHE_REQUESTS.labels("profiles", outcome)
+            for outcome in ("local_hit", "hit", "miss")
+        }
+
+    async def get(
+        self, user_id: str, repo: AuthRepository
+    ) -> UserProfile | None:
+        return (await self.get_many([user_id], repo)).get(user_id)
+
+    async def get_many(
+        self, user_ids: Iterable[str], repo: AuthRepository
+    ) -> dict[str, UserProfile]:
+        """Profiles of the given users; unknown users are left out."""
+        missing = list(dict.fromkeys(user_ids))
+        found: dict[str, UserProfile] = {}
+        generations: dict[str, bytes | None] = {}
+        if self._enabled:
+            missing = self._from_local(missing, found)
+        if missing and self._enabled:
+            cached = await self._redis.get_versioned(
+                [cache_key("profiles", user_id) for user_id in missing]
+            )
+            for user_id, (data, generation) in zip(missing, cached):
+                if data is not None:
+                    found[user_id] = self._remember(
+                        user_id, UserProfile.model_validate_json(data)
+                    )
+                generations[user_id] = generation
+            self._metrics["hit"].inc(
+                len(missing) - [data for data, _ in cached].count(None)
+            )
+            missing = [user_id for user_id in missing if user_id not in found]
+        if not missing:
+            return found
+
+        users = await repo.get_many(
+            where={"_id": {"$in": [ObjectId(user_id) for user_id in missing]}},
+            project=PROFILE_FIELDS
+        )
+        loaded = {
+            str(user.id): UserProfile(**user.model_dump()) for user in users
+        }
+        if self._enabled:
+            self._metrics["miss"].inc(len(missing))
+            if loaded:
+                await self._redis.set_unchanged(
+                    {
+                        cache_key("profiles", user_id): (
+                            profile.model_dump_json(),
+                            generations.get(user_id)
+                        )
+                        for user_id, profile in loaded.items()
+                    },
+                    ttl=self._ttl
+                )
+            for user_id, profile in loaded.items():
+                self._remember(user_id, profile)
+        found.update(loaded)
+        return found
+
+    async def invalidate(self, user_id: str) -> None:
+        self._local.pop(user_id, None)
+        if self._enabled:
+            await self._redis.invalidate(
+                cache_key("profiles", user_id), window=self._window
+            )
+
+    def _from_local(
+        self, user_ids: list[str], found: dict[str, UserProfile]
+    ) -> list[str]:
+        now = monotonic()
+        missing = []
+        for user_id in user_ids:
+            entry = self._local.get(user_id)
+            if entry is None or entry[0] < now:
+                missing.append(user_id)
+                continue
+            self._local.move_to_end(user_id)
+            found[user_id] = entry[1]
+        self._metrics["local_hit"].inc(len(user_ids) - len(missing))
+        return missing
+
+    def _remember(self, user_id: str, profile: UserProfile) -> UserProfile:
+        self._local[user_id] = (monotonic() + self._local_ttl, profile)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self._local_size:
+            self._local.popitem(last=False)
+        return profile
+
+
+class UnknownLogins:
+    """Negative cache of normalized login keys, cleared when a key is taken.
+
+    ``add`` writes only if the key was not taken (``discard``) since its
+    ``lookup``, so a login that missed just before a registration does not
+    hide the new user.
+    """
+
+    def __init__(self, redis: RedisService, config: CacheConfig):
+        self._redis = redis
+        self._enabled = config.enabled
+        self._ttl = config.unknown_login_ttl
+        self._window = config.invalidation_window
+        self._hit = CACHE_REQUESTS.labels("unknown_logins", "hit")
+        self._miss = CACHE_REQUESTS.labels("unknown_logins", "miss")
+
+    async def lookup(self, login_key: str) -> tuple[bool, bytes | None]:
+        """Whether the key matches no user, and its generation for ``add``."""
+        if not self._enabled:
+            return False, None
+        [(value, generation)] = await self._redis.get_versioned(
+            [cache_key("unknown_logins", login_key)]
+        )
+        if value is not None:
+            self._hit.inc()
+            return True, generation
+        self._miss.inc()
+        return False, generation
+
+    async def add(self, login_key: str, generation: bytes | None) -> None:
+        if self._enabled:
+            await self._redis.set_unchanged(
+                {cache_key("unknown_logins", login_key): (b"1", generation)},
+                ttl=self._ttl
+            )
+
+    async def discard(self, *login_keys: str) -> None:
+        if self._enabled and login_keys:
+            await self._redis.invalidate(
+                *(cache_key("unknown_logins", key) for key in login_keys),
+                window=self._window
+            )
@@ -1,13 +1,14 @@
 from src.core.repository import BeanieRepository
-from src.services.auth.models import User
+from src.services.auth.models import User, normalize_login
 
-from beanie.operators import Or
 
 class AuthRepository(BeanieRepository):
 
     def __init__(self):
         super().__init__(model_cls=User)
 
-    async def find_by_email_or_username(self, username: str) -> User | None:
-        clause = Or(User.username == username, User.email == username)
-        return await self.get_one(where=clause)
\ No newline at end of file
+    async def find_by_login(self, login: str) -> User | None:
+        """Exact match on the multikey login_keys index (username or email)."""
+        return await self.get_one(
+            where=(User.login_keys == normalize_login(login))
+        )
@@ -37,12 +37,42 @@ class RegisterRequest(BaseModel):
             raise UserError(Reason.CHAR_PASSWORD)
         return v
 
+class ProfileUpdate(BaseModel):
+    email: Optional[EmailStr] = None
+    username: Optional[str] = Field(
+        default=None,
+        min_length=3,
+        max_length=50,
+        pattern=r'^[A-Za-z0-9_]+$'
+    )
+    full_name: Optional[str] = Field(default=None, max_length=100)
+
+    @field_serializer("email", "username")
+    def make_lower(self, v):
+        if isinstance(v, str):
+            return v.lower()
+        return v
+
 class LoginRequest(BaseModel):
     username: str
     password: str
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(min_length=1, max_length=100)
+
+class ImportRowError(BaseModel):
+    line: int
+    reason: Reason
+    details: Optional[str] = None
+
+class ImportReport(BaseModel):
+    received: int = 0
+    created: int = 0
+    failed: list[ImportRowError] = Field(default_factory=list)
 
 class ObjId(BaseModel):
     id: BeanieObjectId
@@ -1,20 +1,35 @@
+import logging
+import uuid
 from datetime import datetime, timezone, timedelta
+from typing import AsyncIterable
 
-import bcrypt
 import jwt
 
+from src.core.auth.revocation import RevocationList
+from src.core.auth.schemas import UserInfo
 from src.core.exception.custom import UserError
 from src.core.exception.reason import Reason
 from src.core.provider import CoreProvider, core_container
-from src.services.auth.models import User
+from src.services.auth.hashing import hash_password, verify_password
+from src.services.auth.importer import PasswordHasher, UserImporter
+from src.services.auth.models import User, build_login_keys, normalize_login
+from src.services.auth.profiles import ProfileCache, UnknownLogins
 from src.services.auth.repository import AuthRepository
 from src.services.auth.schemas import (
-    RegisterRequest, LoginRequest, TokenResponse, MeResponse, UserResponse
+    RegisterRequest, LoginRequest, TokenResponse, MeResponse, UserResponse,
+    ProfileUpdate, ImportReport
 )
+from src.services.auth.tokens import RefreshTokenError, RefreshTokenStore
 
+from beanie.operators import And
 from bson import ObjectId
 from pymongo.errors import DuplicateKeyError
 
+logger = logging.getLogger(__name__)
+
+# a profile update retries when the user changed username or email meanwhile
+UPDATE_ATTEMPTS = 3
+
 
 class AuthService:
 
@@ -26,40 +41,161 @@ class AuthService:
         request["password_hash"] = self._hash_password(
             plain_pwd=request["password"]
         )
+        login_keys = build_login_keys(request["username"], request["email"])
         create_payload = {
             "created_at": now,
             "updated_at": now,
+            "login_keys": login_keys,
             **request
         }
         async with core_container() as cnt:
             auth_repo = await cnt.get(AuthRepository)
             try:
                 user = await auth_repo.create(**create_payload)
-                return UserResponse(**user.model_dump())
             except DuplicateKeyError as e:
                 raise UserError(Reason.USER_ALREADY_EXISTS)
+            await (await cnt.get(UnknownLogins)).discard(*login_keys)
+            return UserResponse(**user.model_dump())
+
+    async def import_users(self, body: AsyncIterable[bytes]) -> ImportReport:
+        """
+        Create users from NDJSON registration records. Invalid and duplicate
+        rows are reported by line number and do not stop the import.
+        """
+        async with core_container() as cnt:
+            importer = UserImporter(
+                auth_repo=await cnt.get(AuthRepository),
+                hasher=await cnt.get(PasswordHasher),
+                unknown_logins=await cnt.get(UnknownLogins),
+                config=CoreProvider().get_config().user_import
+            )
+            return await importer.run(body)
 
     async def login(self, request: LoginRequest):
+        login_key = normalize_login(request.username)
         async with core_container() as cnt:
             auth_repo = await cnt.get(AuthRepository)
-            user = await auth_repo.find_by_email_or_username(
-                username=request.username
-            )
+            unknown_logins = await cnt.get(UnknownLogins)
+            unknown, generation = await unknown_logins.lookup(login_key)
+            if unknown:
+                raise UserError(Reason.INVALID_CREDS)
+            user = await auth_repo.find_by_login(login_key)
+            if not user:
+                await unknown_logins.add(login_key, generation)
             if not user or not self._verify_password(
                 plain=request.password, hashed=user.password_hash
             ):
                 raise UserError(Reason.INVALID_CREDS)
+            store = await cnt.get(RefreshTokenStore)
+            refresh = await store.issue(str(user.id))
             return TokenResponse(
-                access_token=self.create_jwt_token(str(user.id))
+                access_token=self.create_jwt_token(
+                    str(user.id), sid=refresh.family
+                ),
+                refresh_token=refresh.token
             )
 
+    async def refresh(self, refresh_token: str) -> TokenResponse:
+        """
+        Exchange a refresh token for new access and refresh tokens. Reusing
+        an exchanged token ends its session, including its access tokens.
+        """
+        async with core_container() as cnt:
+            store = await cnt.get(RefreshTokenStore)
+            try:
+                refresh = await store.rotate(refresh_token)
+            except RefreshTokenError as exc:
+                if exc.reason == "reused":
+                    logger.warning(
+                        "Refresh token reused, ending session %s", exc.family
+                    )
+                    await self._revoke(cnt, f"sid:{exc.family}")
+                raise UserError(Reason.INVALID_REFRESH_TOKEN)
+            return TokenResponse(
+                access_token=self.create_jwt_token(
+                    refresh.user_id, sid=refresh.family
+                ),
+                refresh_token=refresh.token
+            )
+
+    async def logout(self, user: UserInfo) -> None:
+        """End the session of the token, or revoke the token without one."""
+        async with core_container() as cnt:
+            if user.sid is not None:
+                await (await cnt.get(RefreshTokenStore)).end_family(user.sid)
+                await self._revoke(cnt, f"sid:{user.sid}")
+            elif user.jti is not None:
+                await self._revoke(cnt, f"jti:{user.jti}")
+
     async def get_user_info(self, user_id: str) -> MeResponse:
         async with core_container() as cnt:
             auth_repo = await cnt.get(AuthRepository)
-            clause = (User.id == ObjectId(user_id))
-            if not (user := await auth_repo.get_one(where=clause)):
+            profiles = await cnt.get(ProfileCache)
+            if not (profile := await profiles.get(user_id, auth_repo)):
+                raise UserError(Reason.USER_NOT_FOUND)
+            return MeResponse(**profile.model_dump())
+
+    async def update_profile(
+        self, user_id: str, request: ProfileUpdate
+    ) -> tuple[MeResponse, bool]:
+        """
+        Update the given profile fields.
+        Returns the new profile and whether any value changed.
+        """
+        values = request.model_dump(exclude_none=True)
+        if not values:
+            return await self.get_user_info(user_id), False
+        async with core_container() as cnt:
+            auth_repo = await cnt.get(AuthRepository)
+            for _ in range(UPDATE_ATTEMPTS):
+                old = await self._update_user(auth_repo, user_id, values)
+                if old:
+                    break
+            else:
                 raise UserError(Reason.USER_NOT_FOUND)
-            return MeResponse(**user.model_dump())
+            await (await cnt.get(ProfileCache)).invalidate(user_id)
+            await (await cnt.get(UnknownLogins)).discard(
+                *build_login_keys(
+                    values.get("username", old.username),
+                    values.get("email", old.email)
+                )
+            )
+            changed = any(
+                getattr(old, field) != value for field, value in values.items()
+            )
+            return MeResponse(**{**old.model_dump(), **values}), changed
+
+    async def _update_user(
+        self, auth_repo: AuthRepository, user_id: str, values: dict
+    ) -> User | None:
+        """
+        Set ``values`` and return the user as it was before. A new username
+        or email also replaces login_keys; that update only applies if both
+        are unchanged since they were read, None otherwise.
+        """
+        where = (User.id == ObjectId(user_id))
+        set_values = {**values, "updated_at": datetime.now(tz=timezone.utc)}
+        if values.keys() & {"username", "email"}:
+            current = await auth_repo.get_one(
+                where=where, project={"username": 1, "email": 1}
+            )
+            if not current:
+                raise UserError(Reason.USER_NOT_FOUND)
+            set_values["login_keys"] = build_login_keys(
+                values.get("username", current.username),
+                values.get("email", current.email)
+            )
+            where = And(
+                where,
+                User.username == current.username,
+                User.email == current.email
+            )
+        try:
+            return await auth_repo.update_one(
+                where=where, set_values=set_values, return_old=True
+            )
+        except DuplicateKeyError:
+            raise UserError(Reason.USER_ALREADY_EXISTS)
 
     def create_jwt_token(
         self, user_id: str, **kwargs
@@ -68,6 +204,7 @@ class AuthService:
         access_delta = timedelta(minutes=conf.jwt.ttl_minutes)
         payload = {
             "user_id": user_id,
+            "jti": uuid.uuid4().hex,
             "exp": datetime.now(tz=timezone.utc) + access_delta,
             **kwargs
         }
@@ -75,13 +212,15 @@ class AuthService:
             payload, conf.jwt.secret_key, algorithm=conf.jwt.algorithm
         )
 
+    async def _revoke(self, cnt, token_id: str) -> None:
+        # access tokens issued before now expire within ttl_minutes
+        conf = CoreProvider().get_config()
+        revocations = await cnt.get(RevocationList)
+        await revocations.revoke(token_id, ttl=conf.jwt.ttl_minutes * 60)
+
     def _hash_password(self, plain_pwd: str) -> str:
         conf = CoreProvider().get_config()
-        salt = bcrypt.gensalt(rounds=conf.jwt.bcrypt_rounds)
-        return bcrypt.hashpw(plain_pwd.encode("utf-8"), salt).decode("utf-8")
+        return hash_password(plain_pwd, rounds=conf.jwt.bcrypt_rounds)
 
     def _verify_password(self, plain: str, hashed: str) -> bool:
-        try:
-            return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
-        except Exception:
-            return False
+        return verify_password(plain, hashed)
@@ -0,0 +1,49 @@
+from typing import AsyncIterator
+
+from dishka import Provider, Scope, provide
+from redis.asyncio.client import Redis
+
+from src.core.config import Config
+from src.services.auth.importer import PasswordHasher
+from src.services.auth.profiles import ProfileCache, UnknownLogins
+from src.services.auth.tokens import RefreshTokenStore
+from src.services.redis.service import RedisService
+
+
+class ProfileProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_profile_cache(
+        self, redis_service: RedisService, config: Config
+    ) -> ProfileCache:
+        return ProfileCache(redis=redis_service, config=config.cache)
+
+    @provide(scope=Scope.APP)
+    async def get_unknown_logins(
+        self, redis_service: RedisService, config: Config
+    ) -> UnknownLogins:
+        return UnknownLogins(redis=redis_service, config=config.cache)
+
+
+class TokenProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_refresh_token_store(
+        self, redis: Redis, config: Config
+    ) -> RefreshTokenStore:
+        return RefreshTokenStore(
+            redis=redis, ttl=config.jwt.refresh_ttl_days * 24 * 60 * 60
+        )
+
+
+class ImportProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_password_hasher(
+        self, config: Config
+    ) -> AsyncIterator[PasswordHasher]:
+        # the pool starts with the first import, not with the application
+        hasher = PasswordHasher(
+            workers=config.user_import.workers,
+            rounds=config.jwt.bcrypt_rounds,
+            batch_size=config.user_import.hash_batch
+        )
+        yield hasher
+        hasher.close()
@@ -0,0 +1,103 @@
+"""Rotating refresh tokens stored in Redis.
+
+A login starts a token family (the session, ``sid`` of its access tokens).
+Refreshing marks the presented token as used and issues the next token of
+the family in one script call. Presenting a used token again means it was
+stolen or replayed: the whole family is ended. Only hashes of the tokens
+are stored.
+"""
+import hashlib
+import secrets
+import uuid
+from dataclasses import dataclass
+
+from redis.asyncio.client import Redis
+
+TOKEN_KEY = "auth:refresh:{}"
+FAMILY_KEY = "auth:refresh_family:{}"
+
+# KEYS: presented token, next token; ARGV: family key prefix, hashes of the
+# presented and the next token, ttl. The family key is read from the record.
+ROTATE = """
+local record = redis.call('HMGET', KEYS[1], 'user_id', 'family', 'used')
+if not record[1] then
+   return false
+end
+local family_key = ARGV[1] .. record[2]
+if record[3] == '1' then
+   redis.call('DEL', family_key)
+   return {'reused', record[1], record[2]}
+end
+if redis.call('GET', family_key) ~= ARGV[2] then
+   return {'ended', record[1], record[2]}
+end
+redis.call('HSET', KEYS[1], 'used', '1')
+redis.call('HSET', KEYS[2], 'user_id', record[1], 'family', record[2], 'used', '0')
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('SET', family_key, ARGV[3], 'EX', ARGV[4])
+return {'ok', record[1], record[2]}
+"""
+
+
+class RefreshTokenError(Exception):
+    """The token is unknown, expired, reused or its session ended."""
+
+    def __init__(self, reason: str, family: str | None = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.family = family
+
+
+@dataclass(slots=True)
+class RefreshToken:
+    token: str
+    user_id: str
+    family: str
+
+
+class RefreshTokenStore:
+
+    def __init__(self, redis: Redis, ttl: int):
+        self._redis = redis
+        self._ttl = ttl
+        self._rotate = redis.register_script(ROTATE)
+
+    async def issue(self, user_id: str) -> RefreshToken:
+        """First token of a new family."""
+        token, digest = _new_token()
+        family = uuid.uuid4().hex
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(TOKEN_KEY.format(digest), mapping={
+                "user_id": user_id, "family": family, "used": "0"
+            })
+            pipe.expire(TOKEN_KEY.format(digest), self._ttl)
+            pipe.set(FAMILY_KEY.format(family), digest, ex=self._ttl)
+            await pipe.execute()
+        return RefreshToken(token=token, user_id=user_id, family=family)
+
+    async def rotate(self, token: str) -> RefreshToken:
+        """Exchange a token for the next one of its family."""
+        digest = _digest(token)
+        new_token, new_digest = _new_token()
+        result = await self._rotate(
+            keys=[TOKEN_KEY.format(digest), TOKEN_KEY.format(new_digest)],
+            args=[FAMILY_KEY.format(""), digest, new_digest, self._ttl],
+        )
+        if not result:
+            raise RefreshTokenError("unknown")
+        outcome, user_id, family = (value.decode() for value in result)
+        if outcome != "ok":
+            raise RefreshTokenError(outcome, family=family)
+        return RefreshToken(token=new_token, user_id=user_id, family=family)
+
+    async def end_family(self, family: str) -> None:
+        await self._redis.delete(FAMILY_KEY.format(family))
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_token() -> tuple[str, str]:
+    token = secrets.token_urlsafe(32)
+    return token, _digest(token)
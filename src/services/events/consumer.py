@@ -0,0 +1,159 @@
+"""Processing of event messages consumed by ``src.worker``."""
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from faststream.rabbit import RabbitBroker
+from faststream.rabbit.message import RabbitMessage
+from pymongo.errors import BulkWriteError
+
+from src.core.brokers.topology import build_retry_queue
+from src.core.config import WorkerConfig
+from src.core.metrics.registry import Counter, Histogram
+from src.core.provider import core_container
+from src.services.events.models import EventNotification
+from src.services.events.repository import EventNotificationRepository
+from src.services.redis.service import RedisService
+
+logger = logging.getLogger(__name__)
+
+RETRIES_HEADER = "x-retries"
+DUPLICATE_KEY = 11000
+
+CONSUMED = Counter(
+    "consumer_messages_total", "Consumed messages by queue and outcome",
+    ("queue", "outcome"),
+)
+BATCH_LATENCY = Histogram(
+    "consumer_batch_duration_seconds", "Time to process a batch of messages",
+)
+BATCH_SIZE = Histogram(
+    "consumer_batch_size", "Messages per processed batch",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+
+@dataclass(slots=True)
+class Delivery:
+    action: str
+    body: dict
+    message: RabbitMessage
+
+
+class EventConsumer:
+    """Acknowledges, retries or dead-letters deliveries after processing.
+
+    A batch is processed as a whole first; when that fails its deliveries
+    are processed one by one so a single bad message does not retry the
+    others; notifications a failed attempt already stored are not stored
+    twice, as they are keyed by the message they come from. Retries are
+    republished to the action's retry queue with an exponential expiration
+    and an incremented ``x-retries`` header, after ``max_retries`` the
+    delivery is rejected to the dead-letter queue.
+    """
+
+    def __init__(self, broker: RabbitBroker, config: WorkerConfig):
+        self._broker = broker
+        self._config = config
+        self._retry_queues = {}
+
+    async def handle_batch(self, batch: list[Delivery]) -> None:
+        started = perf_counter()
+        try:
+            await self._notify_subscribers(batch)
+        except Exception:
+            logger.warning(
+                "Batch of %s failed, processing one by one", len(batch),
+                exc_info=True
+            )
+            await self._handle_one_by_one(batch)
+        else:
+            await asyncio.gather(*(self._ack(delivery) for delivery in batch))
+        BATCH_SIZE.labels().observe(len(batch))
+        BATCH_LATENCY.labels().observe(perf_counter() - started)
+
+    async def _handle_one_by_one(self, batch: list[Delivery]) -> None:
+        for delivery in batch:
+            try:
+                await self._notify_subscribers([delivery])
+            except Exception:
+                logger.exception(
+                    "Message %s of %s failed", delivery.body.get("id"),
+                    delivery.action
+                )
+                await self._retry(delivery)
+            else:
+                await self._ack(delivery)
+
+    async def _notify_subscribers(self, batch: list[Delivery]) -> None:
+        """Store a notification for every subscriber of a changed event."""
+        keys = [
+            f"event:{delivery.body['id']}:subscribers" for delivery in batch
+        ]
+        async with core_container() as cnt:
+            redis_service = await cnt.get(RedisService)
+            subscribers = await redis_service.members_many(keys)
+            now = datetime.now(tz=timezone.utc)
+            notifications = [
+                EventNotification(
+                    event_id=delivery.body["id"],
+                    user_id=user_id.decode(),
+                    action=delivery.body.get("action"),
+                    timestamp=now,
+                    message_id=_message_id(delivery),
+                )
+                for delivery, members in zip(batch, subscribers)
+                for user_id in members
+            ]
+            if notifications:
+                repo = await cnt.get(EventNotificationRepository)
+                try:
+                    await repo.add_many(notifications, ordered=False)
+                except BulkWriteError as exc:
+                    # stored by an earlier delivery of the same message
+                    if exc.details.get("writeConcernErrors") or any(
+                        error["code"] != DUPLICATE_KEY
+                        for error in exc.details["writeErrors"]
+                    ):
+                        raise
+
+    async def _ack(self, delivery: Delivery) -> None:
+        await delivery.message.ack()
+        CONSUMED.labels(delivery.action, "ack").inc()
+
+    async def _retry(self, delivery: Delivery) -> None:
+        message = delivery.message
+        retries = int(message.headers.get(RETRIES_HEADER, 0))
+        if retries >= self._config.max_retries:
+            await message.reject(requeue=False)
+            CONSUMED.labels(delivery.action, "dead_letter").inc()
+            return
+
+        delay_ms = min(
+            self._config.retry_delay_ms * 2 ** retries,
+            self._config.retry_max_delay_ms
+        )
+        await self._broker.publish(
+            message.body,
+            queue=self._retry_queue(delivery.action),
+            headers={**message.headers, RETRIES_HEADER: retries + 1},
+            content_type=message.content_type,
+            expiration=timedelta(milliseconds=delay_ms),
+            persist=True,
+        )
+        await message.ack()
+        CONSUMED.labels(delivery.action, "retry").inc()
+
+    def _retry_queue(self, action: str):
+        queue = self._retry_queues.get(action)
+        if queue is None:
+            queue = self._retry_queues[action] = build_retry_queue(action)
+        return queue
+
+
+def _message_id(delivery: Delivery) -> str:
+    """Same for redeliveries and retries, which republish the body as is."""
+    return hashlib.blake2b(delivery.message.body, digest_size=16).hexdigest()
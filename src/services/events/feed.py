@@ -0,0 +1,244 @@
+"""Live event feed: Redis pub/sub fan-out to WebSocket connections.
+
+Every worker holds one pub/sub subscription and pushes each change to the
+connections that subscribed to the event id or whose filter matches it.
+A frame is encoded once per change and shared by all its recipients.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from time import monotonic
+
+from pydantic import ValidationError
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+from starlette import status
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from src.core.auth.schemas import UserInfo
+from src.core.config import FeedConfig
+from src.core.metrics.registry import Counter, Gauge
+from src.services.events.messages import EventMessage
+from src.services.events.schemas import FeedCommand, FeedFilter
+from src.services.redis.service import RedisService
+
+logger = logging.getLogger(__name__)
+
+FEED_CONNECTIONS = Gauge(
+    "feed_connections", "Open live feed WebSocket connections"
+)
+FEED_DROPPED = Counter(
+    "feed_frames_dropped_total",
+    "Feed frames dropped from full connection queues",
+)
+FEED_EVICTED = Counter(
+    "feed_connections_evicted_total",
+    "Feed connections closed by the server", ("reason",),
+)
+
+PING_FRAME = json.dumps({"type": "ping"})
+
+
+class FeedConnection:
+    """One client: a bounded send queue that drops its oldest frames."""
+
+    __slots__ = (
+        "websocket", "user_id", "event_ids", "filter", "last_seen",
+        "overflows", "close_code", "_queue", "_ready",
+    )
+
+    def __init__(self, websocket: WebSocket, user_id: str, queue_size: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.event_ids: set[str] = set()
+        self.filter: FeedFilter | None = None
+        self.last_seen = monotonic()
+        # frames dropped since the writer last caught up
+        self.overflows = 0
+        self.close_code: int | None = None
+        self._queue: deque[str] = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+
+    def push(self, frame: str) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.overflows += 1
+            FEED_DROPPED.labels().inc()
+        self._queue.append(frame)
+        self._ready.set()
+
+    def evict(self, code: int, reason: str) -> None:
+        if self.close_code is None:
+            self.close_code = code
+            FEED_EVICTED.labels(reason).inc()
+            self._ready.set()
+
+    async def write_forever(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                if self.close_code is not None:
+                    await self.websocket.close(self.close_code)
+                    return
+                while self._queue:
+                    await self.websocket.send_text(self._queue.popleft())
+                self.overflows = 0
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            # the client is gone, the receiving side will notice it
+            return
+
+
+class FeedHub:
+    """Per-worker registry of feed connections."""
+
+    def __init__(self, redis: Redis, redis_service: RedisService, config: FeedConfig):
+        self._redis = redis
+        self._redis_service = redis_service
+        self._config = config
+        self._connections: set[FeedConnection] = set()
+        self._by_event: dict[str, set[FeedConnection]] = {}
+        self._filtered: set[FeedConnection] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    async def publish(self, message: EventMessage) -> None:
+        """Send a change to the feed of every worker, best effort."""
+        try:
+            await self._redis_service.publish(
+                self._config.channel, message.model_dump_json()
+            )
+        except RedisError:
+            logger.warning("Feed publish of %s failed", message.id, exc_info=True)
+
+    async def serve(self, websocket: WebSocket, user: UserInfo) -> None:
+        """Run an accepted connection until either side closes it."""
+        self._start()
+        conn = FeedConnection(websocket, user.user_id, self._config.queue_size)
+        self._connections.add(conn)
+        FEED_CONNECTIONS.labels().inc()
+        writer = asyncio.create_task(conn.write_forever())
+        try:
+            while True:
+                raw = await websocket.receive_text()
+                conn.last_seen = monotonic()
+                self._handle(conn, raw)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            writer.cancel()
+            self._forget(conn)
+            FEED_CONNECTIONS.labels().dec()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._listen_forever()),
+                asyncio.create_task(self._heartbeat_forever()),
+            ]
+
+    def _handle(self, conn: FeedConnection, raw: str) -> None:
+        try:
+            command = FeedCommand.model_validate_json(raw)
+        except ValidationError as exc:
+            conn.push(json.dumps({
+                "type": "error",
+                "errors": exc.errors(include_url=False, include_context=False),
+            }, default=str))
+            return
+
+        if command.action == "subscribe":
+            room = self._config.max_subscriptions - len(conn.event_ids)
+            for event_id in command.event_ids[:max(room, 0)]:
+                conn.event_ids.add(event_id)
+                self._by_event.setdefault(event_id, set()).add(conn)
+        elif command.action == "unsubscribe":
+            for event_id in command.event_ids:
+                conn.event_ids.discard(event_id)
+                self._unindex(event_id, conn)
+        elif command.action == "filter":
+            conn.filter = command.filter
+            if command.filter is None:
+                self._filtered.discard(conn)
+            else:
+                self._filtered.add(conn)
+        else:
+            return
+        conn.push(json.dumps({
+            "type": "ack",
+            "event_ids": sorted(conn.event_ids),
+            "filter": conn.filter.model_dump(mode="json") if conn.filter else None,
+        }))
+
+    def _dispatch(self, data: bytes | str) -> None:
+        message = json.loads(data)
+        event_id = message.get("id")
+        targets = set(self._by_event.get(event_id, ()))
+        for conn in self._filtered:
+            if conn.filter.matches(message):
+                targets.add(conn)
+        if not targets:
+            return
+
+        frame = json.dumps({"type": "event", "data": message})
+        limit = self._config.max_overflows
+        for conn in targets:
+            conn.push(frame)
+            if conn.overflows > limit:
+                conn.evict(status.WS_1013_TRY_AGAIN_LATER, "slow_consumer")
+
+        if message.get("action") == "deleted":
+            for conn in self._by_event.pop(event_id, ()):
+                conn.event_ids.discard(event_id)
+
+    async def _listen_forever(self) -> None:
+        backoff = 0.5
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._config.channel)
+                backoff = 0.5
+                async for item in pubsub.listen():
+                    if item["type"] == "message":
+                        self._dispatch(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Feed subscription lost, retrying in %.1fs", backoff,
+                    exc_info=True
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                await pubsub.aclose()
+
+    async def _heartbeat_forever(self) -> None:
+        # a single loop for all connections keeps idle ones free of timers
+        interval = self._config.heartbeat_interval
+        while True:
+            await asyncio.sleep(interval)
+            deadline = monotonic() - self._config.idle_timeout
+            for conn in list(self._connections):
+                if conn.last_seen < deadline:
+                    conn.evict(status.WS_1001_GOING_AWAY, "idle")
+                else:
+                    conn.push(PING_FRAME)
+
+    def _forget(self, conn: FeedConnection) -> None:
+        self._connections.discard(conn)
+        self._filtered.discard(conn)
+        for event_id in conn.event_ids:
+            self._unindex(event_id, conn)
+
+    def _unindex(self, event_id: str, conn: FeedConnection) -> None:
+        subscribers = self._by_event.get(event_id)
+        if subscribers is not None:
+            subscribers.discard(conn)
+            if not subscribers:
+                del self._by_event[event_id]
@@ -3,15 +3,27 @@ from typing import Literal
 from pydantic import BaseModel, field_serializer
 from datetime import datetime
 
+from src.services.events.schemas import FieldChange
+
 class EventMessage(BaseModel):
     id: str
     title: str
     action: str = Literal["created", "updated", "deleted"]
     timestamp: datetime | str
     user_id: str
+    version: int | None = None
+    # updated fields only, {"title": {"old": ..., "new": ...}}
+    changes: dict[str, FieldChange] | None = None
 
-    @field_serializer("timestamp")
+    @field_serializer("timestamp", when_used="json")
     def serialize_timestamp(self, v: datetime) -> str | datetime:
         if isinstance(v, datetime):
             return v.isoformat()
-        return v
\ No newline at end of file
+        return v
+
+
+class ReminderMessage(BaseModel):
+    """Published when the reminder of an event is due."""
+    id: str
+    action: str = "reminder"
+    timestamp: datetime
@@ -1,12 +1,21 @@
 from datetime import datetime
 
-from beanie import Document, Link
-from pydantic import Field
+from beanie import Document, Link, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
 
 from src.services.auth.models import User
 from src.services.events.types import EventStatus
 
 
+class EventCreator(BaseModel):
+    """Public profile of the creator, embedded so that reads need no join."""
+    id: PydanticObjectId
+    email: str
+    username: str
+    full_name: str | None = None
+
+
 class Event(Document):
     title: str = Field(max_length=100)
     description: str = Field(max_length=500)
@@ -14,14 +23,38 @@ class Event(Document):
     start_time: datetime
     end_time: datetime
     created_by: Link[User]
+    # snapshot of created_by, refreshed by the worker on profile changes
+    creator: EventCreator | None = None
     tags: list[str] = []
     max_attendees: int
     status: EventStatus
+    # incremented by every update, lets consumers drop stale messages
+    version: int = 0
 
     class Settings:
         name = "events"
+        indexes = [
+            IndexModel([("created_by.$id", ASCENDING)], name="created_by_id")
+        ]
 
 class EventNotification(Document):
     event_id: str
     user_id: str
-    timestamp: datetime
\ No newline at end of file
+    action: str | None = None
+    timestamp: datetime
+    # digest of the message body, the same for every delivery of a message
+    message_id: str | None = None
+
+    class Settings:
+        name = "event_notifications"
+        indexes = [
+            # redeliveries insert nothing; older documents have no message_id
+            IndexModel(
+                [
+                    ("event_id", ASCENDING), ("user_id", ASCENDING),
+                    ("action", ASCENDING), ("message_id", ASCENDING),
+                ],
+                name="delivery", unique=True,
+                partialFilterExpression={"message_id": {"$type": "string"}},
+            )
+        ]
\ No newline at end of file
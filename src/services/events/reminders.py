@@ -0,0 +1,143 @@
+"""Delayed reminder jobs kept in Redis sorted sets.
+
+There is one job per event, scored by the time its reminder is due
+(``lead_minutes`` before ``start_time``), so pending jobs cost a sorted set
+entry and nothing is read from MongoDB until they are due. Dispatchers in
+``src.worker`` claim due jobs in batches by moving them to
+``reminders:claimed``, scored by the end of their visibility timeout, and
+publish a ``reminder`` message per job; the consumer turns it into
+notifications for the event's subscribers. A job whose dispatcher died
+before completing it becomes due again once its visibility timeout passes.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from redis.asyncio.client import Redis
+
+from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.config import ReminderConfig
+from src.core.metrics.registry import Counter
+from src.services.events.messages import ReminderMessage
+
+logger = logging.getLogger(__name__)
+
+REMINDER_ACTION = "reminder"
+DUE_KEY = "reminders:due"
+CLAIMED_KEY = "reminders:claimed"
+
+REMINDER_JOBS = Counter(
+    "reminder_jobs_total", "Reminder jobs by outcome", ("outcome",),
+)
+
+# KEYS: due, claimed; ARGV: now, batch size, visibility deadline.
+# Expired claims are returned to the due set first, unless the job was
+# rescheduled meanwhile.
+CLAIM = """
+local expired = redis.call(
+   'ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]
+)
+for _, job in ipairs(expired) do
+   redis.call('ZREM', KEYS[2], job)
+   redis.call('ZADD', KEYS[1], 'NX', ARGV[1], job)
+end
+local jobs = redis.call(
+   'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]
+)
+for _, job in ipairs(jobs) do
+   redis.call('ZREM', KEYS[1], job)
+   redis.call('ZADD', KEYS[2], ARGV[3], job)
+end
+return jobs
+"""
+
+
+class ReminderQueue:
+
+    def __init__(self, redis: Redis, config: ReminderConfig):
+        self._redis = redis
+        self._config = config
+        self._claim = redis.register_script(CLAIM)
+
+    async def schedule(
+        self, event_id: str, start_time: datetime, *, only_new: bool = False
+    ) -> None:
+        """
+        Schedule (or move) the reminder of an event. An event starting
+        sooner than ``lead_minutes`` is reminded at once, one that already
+        started is not. With ``only_new`` an existing job is kept and a due
+        time in the past schedules nothing, as the reminder was likely sent.
+        """
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        now = time.time()
+        due = start_time.timestamp() - self._config.lead_minutes * 60
+        if start_time.timestamp() <= now or (only_new and due <= now):
+            if not only_new:
+                await self.cancel(event_id)
+            return
+        await self._redis.zadd(
+            DUE_KEY, {event_id: max(due, now)}, nx=only_new
+        )
+
+    async def cancel(self, *event_ids: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(DUE_KEY, *event_ids)
+            pipe.zrem(CLAIMED_KEY, *event_ids)
+            await pipe.execute()
+
+    async def claim(self) -> list[str]:
+        """Claim up to ``batch_size`` due jobs for ``visibility_timeout``."""
+        now = time.time()
+        jobs = await self._claim(
+            keys=[DUE_KEY, CLAIMED_KEY],
+            args=[
+                now, self._config.batch_size,
+                now + self._config.visibility_timeout
+            ],
+        )
+        return [job.decode() for job in jobs]
+
+    async def complete(self, *event_ids: str) -> None:
+        await self._redis.zrem(CLAIMED_KEY, *event_ids)
+
+    async def dispatch_forever(self, publisher: RabbitMqPublisher) -> None:
+        """Publish due reminders; polls Redis only while nothing is due."""
+        while True:
+            try:
+                jobs = await self.claim()
+                if jobs:
+                    await self._dispatch(publisher, jobs)
+            except Exception:
+                logger.warning("Reminder dispatch failed", exc_info=True)
+                jobs = []
+            if len(jobs) < self._config.batch_size:
+                await asyncio.sleep(self._config.poll_interval)
+
+    async def _dispatch(
+        self, publisher: RabbitMqPublisher, jobs: list[str]
+    ) -> None:
+        now = datetime.now(tz=timezone.utc)
+        results = await asyncio.gather(
+            *(
+                publisher.publish(
+                    ReminderMessage(id=event_id, timestamp=now),
+                    f"events.{REMINDER_ACTION}",
+                    # the job is kept and retried instead
+                    drop_if_full=False
+                )
+                for event_id in jobs
+            ),
+            return_exceptions=True
+        )
+        published = [
+            event_id for event_id, result in zip(jobs, results)
+            if not isinstance(result, Exception)
+        ]
+        # failed jobs stay claimed and are retried after the timeout
+        if published:
+            await self.complete(*published)
+        REMINDER_JOBS.labels("published").inc(len(published))
+        if failed := len(jobs) - len(published):
+            REMINDER_JOBS.labels("failed").inc(failed)
@@ -1,8 +1,14 @@
 from src.core.repository import BeanieRepository
-from src.services.events.models import Event
+from src.services.events.models import Event, EventNotification
 
 
 class EventRepository(BeanieRepository):
 
     def __init__(self):
-        super().__init__(model_cls=Event)
\ No newline at end of file
+        super().__init__(model_cls=Event)
+
+
+class EventNotificationRepository(BeanieRepository):
+
+    def __init__(self):
+        super().__init__(model_cls=EventNotification)
@@ -1,11 +1,11 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 from pydantic import BaseModel, Field, field_validator, model_validator
 from beanie import BeanieObjectId
 
 from src.core.exception.custom import UserError
 from src.core.exception.reason import Reason
-from src.core.schemas import RangeFilter
+from src.core.schemas import RangeFilter, TableRequest
 from src.services.auth.models import User
 from src.services.auth.schemas import UserResponse
 from src.services.events.types import EventStatus
@@ -56,8 +56,66 @@ class EventResponse(BaseModel):
     tags: List[str]
     max_attendees: int
     status: EventStatus
+    version: int = 0
+
+
+class EventBatchRequest(BaseModel):
+    ids: list[str] = Field(min_length=1, max_length=100)
+
+
+class EventBatchItem(BaseModel):
+    id: str
+    found: bool
+    event: EventResponse | None = None
+
+
+class EventBatchResponse(BaseModel):
+    """Events in the order of the requested ids."""
+    items: list[EventBatchItem]
+
+
+class EventStatsResponse(BaseModel):
+    """Event counts; days are the UTC dates of start_time."""
+    total: int
+    by_status: dict[str, int]
+    by_day: dict[str, int]
+    by_creator: dict[str, int]
+
+
+class FieldChange(BaseModel):
+    old: Any
+    new: Any
 
 
 class EventListFilters(BaseModel):
     start_time: RangeFilter[datetime] | None = None
-    end_time: RangeFilter[datetime] | None = None
\ No newline at end of file
+    end_time: RangeFilter[datetime] | None = None
+
+
+class EventListRequest(TableRequest[EventListFilters]):
+    # a field of the query model: FastAPI reads a query model only when it
+    # is the sole query parameter
+    fields: str | None = Field(default=None, max_length=500)
+
+
+class FeedFilter(BaseModel):
+    """Filter expression of a feed connection; empty fields match anything."""
+    actions: set[Literal["created", "updated", "deleted"]] | None = None
+    user_id: str | None = None
+    title_contains: str | None = Field(default=None, min_length=1)
+
+    def matches(self, message: dict) -> bool:
+        if self.actions is not None and message.get("action") not in self.actions:
+            return False
+        if self.user_id is not None and message.get("user_id") != self.user_id:
+            return False
+        if self.title_contains is not None:
+            return self.title_contains.lower() in message.get("title", "").lower()
+        return True
+
+
+class FeedCommand(BaseModel):
+    """Message sent by a client of the live feed."""
+    action: Literal["subscribe", "unsubscribe", "filter", "pong"]
+    event_ids: list[str] = Field(default_factory=list, max_length=100)
+    filter: FeedFilter | None = None
@@ -1,21 +1,63 @@
+import hashlib
 import math
-from src.core.database.utils import parse_filters
+from datetime import datetime
+
+from src.core.config import Config
+from src.core.database.utils import (
+   build_projection, from_stored, parse_filters, partial_model
+)
 from src.core.exception.custom import UserError
 from src.core.exception.reason import Reason
 from src.core.provider import core_container
 from src.core.schemas import TableRequest, TableResponse
 from src.services.auth.models import User
+from src.services.auth.profiles import PROFILE_FIELDS, ProfileCache
 from src.services.auth.repository import AuthRepository
-from src.services.events.models import Event
+from src.services.events.models import Event, EventCreator
+from src.services.events.reminders import ReminderQueue
+from src.services.events.stats import EventStats, stat_fields
+from src.services.events.types import EventStatus
 from src.services.events.repository import EventRepository
 from src.services.events.schemas import (
-   EventCreate, EventResponse, EventListFilters, EventUpdate
+   EventCreate, EventResponse, EventListFilters, EventStatsResponse,
+   EventUpdate, FieldChange
 )
 
 from bson import ObjectId
+from pydantic import BaseModel
 
+from src.services.redis.cache import (
+   CACHE_REQUESTS, LeasedCache, Loader, SingleFlight, cache_key
+)
 from src.services.redis.service import RedisService
 
+EVENT_READS = SingleFlight("events")
+LIST_READS = SingleFlight("event_lists")
+
+def to_response[Model: BaseModel](model: type[Model], data: dict) -> Model:
+   """
+   Build a response from a (projected) event document; the embedded creator
+   snapshot is returned as created_by.
+   """
+   data = from_stored(data)
+   if (creator := data.pop("creator", None)) is not None:
+      data["created_by"] = creator
+   return model(**data)
+
+
+def _creator_id(doc: dict) -> str:
+   # a Link of a loaded document or the DBRef of a projected one
+   ref = doc["created_by"]
+   return str(getattr(ref, "ref", ref).id)
+
+
+def event_projection(fields: frozenset[str]) -> dict[str, int]:
+   project = build_projection(EventResponse, fields - {"created_by"})
+   if "created_by" in fields:
+      # the reference resolves the creator of events without a snapshot
+      project.update(creator=1, created_by=1)
+   return project
+
 
 class EventService:
 
@@ -25,34 +67,174 @@ class EventService:
       async with core_container() as cnt:
          auth_repo = await cnt.get(AuthRepository)
          event_repo = await cnt.get(EventRepository)
-         user = await auth_repo.get_one(where=(User.id == ObjectId(user_id)))
-         if not user:
+         profiles = await cnt.get(ProfileCache)
+         profile = await profiles.get(user_id, auth_repo)
+         if not profile:
             raise UserError(Reason.USER_NOT_FOUND)
-         request.created_by = user
-         event = await event_repo.create(**request.model_dump())
-         return EventResponse(**event.model_dump())
+         event = await event_repo.create(
+            **request.model_dump(exclude={"created_by"}),
+            created_by=profile.id,
+            creator=EventCreator(**profile.model_dump())
+         )
+         await self._schedule_reminder(
+            cnt, str(event.id), event.status, event.start_time
+         )
+         await self._count(cnt, new=stat_fields(
+            event.status, event.start_time, str(profile.id)
+         ))
+         return to_response(EventResponse, event.model_dump())
+
+   async def get_by_id(
+       self, event_id: str, fields: frozenset[str] | None = None
+   ) -> EventResponse | BaseModel:
+      """
+      Concurrent reads of the same event share one lookup. With ``fields``
+      only those are read from MongoDB (bypassing the event cache) into a
+      partial EventResponse.
+      """
+      if fields is not None:
+         return await EVENT_READS.do(
+            (event_id, fields), lambda: self._read_fields(event_id, fields)
+         )
+      return await EVENT_READS.do(event_id, lambda: self._read_event(event_id))
+
+   async def _read_event(self, event_id: str) -> EventResponse:
+      async with core_container() as cnt:
+         event_repo = await cnt.get(EventRepository)
+
+         async def load() -> str:
+            event = await event_repo.get_one(
+               where=(Event.id == ObjectId(event_id))
+            )
+            if not event:
+               raise UserError(Reason.EVENT_NOT_FOUND)
+            [response] = await self._responses(
+               cnt, EventResponse, [event.model_dump()]
+            )
+            return response.model_dump_json()
+
+         ttl = (await cnt.get(Config)).cache.event_ttl
+         data = await self._cached(cnt, "events", event_id, load, ttl)
+         return EventResponse.model_validate_json(data)
 
-   async def get_by_id(self, event_id: str) -> EventResponse:
+   async def _read_fields(
+       self, event_id: str, fields: frozenset[str]
+   ) -> BaseModel:
       async with core_container() as cnt:
          event_repo = await cnt.get(EventRepository)
          event = await event_repo.get_one(
-            where=(Event.id == ObjectId(event_id)), fetch_links=True
+            where=(Event.id == ObjectId(event_id)),
+            project=event_projection(fields)
          )
          if not event:
             raise UserError(Reason.EVENT_NOT_FOUND)
-         return EventResponse(**event.model_dump())
+         [response] = await self._responses(
+            cnt, partial_model(EventResponse, fields), [event.model_dump()]
+         )
+         return response
+
+   async def get_by_ids(
+       self, event_ids: list[str]
+   ) -> dict[str, EventResponse]:
+      """
+      Resolve several events at once: cached ones with a single MGET, the
+      rest with one $in query. Ids that do not exist are missing from the
+      result.
+      """
+      wanted = list(dict.fromkeys(
+         event_id for event_id in event_ids if ObjectId.is_valid(event_id)
+      ))
+      found: dict[str, EventResponse] = {}
+      if not wanted:
+         return found
+      async with core_container() as cnt:
+         config = (await cnt.get(Config)).cache
+         redis = await cnt.get(RedisService) if config.enabled else None
+         generations: dict[str, bytes | None] = {}
+         if redis is not None:
+            cached = await redis.get_versioned(
+               [cache_key("events", event_id) for event_id in wanted]
+            )
+            for event_id, (data, generation) in zip(wanted, cached):
+               if data is not None:
+                  found[event_id] = EventResponse.model_validate_json(data)
+               generations[event_id] = generation
+            CACHE_REQUESTS.labels("events", "hit").inc(len(found))
+         missing = [event_id for event_id in wanted if event_id not in found]
+         if not missing:
+            return found
+         loaded = await self._load_events(cnt, missing)
+         found.update(loaded)
+         if redis is not None:
+            CACHE_REQUESTS.labels("events", "miss").inc(len(missing))
+            if loaded:
+               # skipped for events invalidated while they were loaded
+               await redis.set_unchanged(
+                  {
+                     cache_key("events", event_id): (
+                        event.model_dump_json(), generations.get(event_id)
+                     )
+                     for event_id, event in loaded.items()
+                  },
+                  ttl=config.event_ttl
+               )
+         return found
+
+   async def _load_events(
+       self, cnt, event_ids: list[str]
+   ) -> dict[str, EventResponse]:
+      event_repo = await cnt.get(EventRepository)
+      events = await event_repo.get_many(
+         where={"_id": {"$in": [ObjectId(event_id) for event_id in event_ids]}}
+      )
+      responses = await self._responses(
+         cnt, EventResponse, [event.model_dump() for event in events]
+      )
+      return {str(response.id): response for response in responses}
 
-   async def update_by_id(self, event_id: str, request: EventUpdate) -> EventResponse:
+   async def update_by_id(
+       self, event_id: str, request: EventUpdate
+   ) -> tuple[EventResponse, dict[str, FieldChange]]:
+      """
+      Apply the update atomically and bump the event version.
+      Returns the updated event and the fields whose value changed.
+      """
+      values = request.model_dump(exclude_none=True)
       async with core_container() as cnt:
          event_repo = await cnt.get(EventRepository)
-         await event_repo.update(
-            where=(Event.id == ObjectId(event_id)),
-            **request.model_dump(exclude_none=True)
-         )
-         event = await event_repo.get_one(
-            where=(Event.id == ObjectId(event_id)), fetch_links=True
+         where = (Event.id == ObjectId(event_id))
+         if not values:
+            return await self.get_by_id(event_id), {}
+         old = await event_repo.update_one(
+            where=where, set_values=values,
+            increment={Event.version: 1}, return_old=True
          )
-         return EventResponse(**event.model_dump())
+         if not old:
+            raise UserError(Reason.EVENT_NOT_FOUND)
+         changes = {
+            field: FieldChange(old=getattr(old, field), new=value)
+            for field, value in values.items()
+            if getattr(old, field) != value
+         }
+         [response] = await self._responses(cnt, EventResponse, [{
+            **old.model_dump(), **values, "version": old.version + 1
+         }])
+         await self._invalidate(cnt, event_id)
+         # start_time is not updatable, the status decides on the reminder
+         if "status" in changes:
+            await self._schedule_reminder(
+               cnt, event_id, response.status, response.start_time
+            )
+         if changes.keys() & {"status", "start_time"}:
+            creator_id = str(response.created_by.id)
+            await self._count(
+               cnt,
+               old=stat_fields(old.status, old.start_time, creator_id),
+               new=stat_fields(
+                  response.status, response.start_time, creator_id
+               )
+            )
+         return response, changes
 
    async def delete_by_id(self, event_id: str) -> EventResponse:
       async with core_container() as cnt:
@@ -62,28 +244,152 @@ class EventService:
          )
          if not event:
             raise UserError(Reason.EVENT_NOT_FOUND)
-         response = EventResponse(**event.model_dump())
-         await event_repo.delete(event)
+         [response] = await self._responses(
+            cnt, EventResponse, [event.model_dump()]
+         )
+         await event_repo.delete(event, soft=False)
+         await self._invalidate(cnt, event_id)
+         if (await cnt.get(Config)).reminders.enabled:
+            await (await cnt.get(ReminderQueue)).cancel(event_id)
+         await self._count(cnt, old=stat_fields(
+            event.status, event.start_time, str(response.created_by.id)
+         ))
          return response
 
    async def list_events(
-       self, request: TableRequest[EventListFilters]
-   ) -> TableResponse[EventResponse]:
+       self, request: TableRequest[EventListFilters],
+       fields: frozenset[str] | None = None
+   ) -> TableResponse:
+      """
+      Concurrent requests for the same page share one lookup. With
+      ``fields`` the page is projected as in get_by_id.
+      """
+      key = hashlib.sha1(
+         (request.model_dump_json() + ",".join(sorted(fields or ()))).encode()
+      ).hexdigest()
+      return await LIST_READS.do(
+         key, lambda: self._read_page(key, request, fields)
+      )
+
+   async def _read_page(
+       self, key: str, request: TableRequest[EventListFilters],
+       fields: frozenset[str] | None
+   ) -> TableResponse:
       clause = parse_filters(model=Event, filters=request.filters)
+      if fields is None:
+         model, project = EventResponse, None
+      else:
+         model = partial_model(EventResponse, fields)
+         project = event_projection(fields)
       async with core_container() as cnt:
          event_repo = await cnt.get(EventRepository)
-         offset = request.page_size * (request.page - 1)
-         events = await event_repo.get_many(
-            where=clause, limit=request.page_size, skip=offset, fetch_links=True
+
+         async def load() -> str:
+            offset = request.page_size * (request.page - 1)
+            events = await event_repo.get_many(
+               where=clause, limit=request.page_size, skip=offset,
+               project=project
+            )
+            count = await event_repo.count(where=clause)
+            return TableResponse[model](
+               page=request.page,
+               pages=math.ceil(count / request.page_size),
+               total_count=count,
+               items=await self._responses(
+                  cnt, model, [event.model_dump() for event in events]
+               )
+            ).model_dump_json()
+
+         ttl = (await cnt.get(Config)).cache.list_ttl
+         data = await self._cached(cnt, "event_lists", key, load, ttl)
+         return TableResponse[model].model_validate_json(data)
+
+   async def _cached(
+       self, cnt, name: str, key: str, load: Loader, ttl: int
+   ) -> str | bytes:
+      config = (await cnt.get(Config)).cache
+      if not config.enabled:
+         return await load()
+      cache = LeasedCache(
+         await cnt.get(RedisService),
+         name=name,
+         ttl=ttl,
+         lease_ttl=config.lease_ttl,
+         lease_wait=config.lease_wait_ms / 1000,
+         poll_interval=config.poll_interval_ms / 1000,
+      )
+      return await cache.get_or_load(key, load)
+
+   async def get_stats(self) -> EventStatsResponse:
+      async with core_container() as cnt:
+         return await (await cnt.get(EventStats)).read()
+
+   async def rebuild_stats(self) -> None:
+      async with core_container() as cnt:
+         stats = await cnt.get(EventStats)
+         await stats.rebuild(await cnt.get(EventRepository))
+
+   async def _count(
+       self, cnt, old: dict[str, str] | None = None,
+       new: dict[str, str] | None = None
+   ) -> None:
+      if (await cnt.get(Config)).stats.enabled:
+         await (await cnt.get(EventStats)).move(old=old, new=new)
+
+   async def refresh_creator(self, user_id: str) -> int:
+      """
+      Copy the current profile of a user into the creator snapshot of
+      their events and drop those events from the cache. Returns the
+      number of updated events.
+      """
+      where = {"created_by.$id": ObjectId(user_id)}
+      async with core_container() as cnt:
+         auth_repo = await cnt.get(AuthRepository)
+         event_repo = await cnt.get(EventRepository)
+         user = await auth_repo.get_one(
+            where=(User.id == ObjectId(user_id)), project=PROFILE_FIELDS
          )
-         count = await event_repo.count(where=clause)
-         return TableResponse(
-            page=request.page,
-            pages=math.ceil(count / request.page_size),
-            total_count=count,
-            items=[EventResponse(**event.model_dump()) for event in events]
+         if not user:
+            return 0
+         creator = EventCreator(**user.model_dump())
+         updated = await event_repo.update(
+            where=where, creator=creator.model_dump()
+         )
+         events = await event_repo.get_many(where=where, project={"_id": 1})
+         await self._invalidate(cnt, *(str(event.id) for event in events))
+         return updated
+
+   async def _responses[Model: BaseModel](
+       self, cnt, model: type[Model], docs: list[dict]
+   ) -> list[Model]:
+      """
+      Responses of event documents. Events stored without a creator
+      snapshot get their creator from the profile cache, one lookup for
+      the whole batch.
+      """
+      unresolved = [
+         doc for doc in docs
+         if doc.get("creator") is None and doc.get("created_by") is not None
+      ]
+      if unresolved:
+         profiles = await cnt.get(ProfileCache)
+         found = await profiles.get_many(
+            {_creator_id(doc) for doc in unresolved},
+            await cnt.get(AuthRepository)
          )
+         for doc in unresolved:
+            if profile := found.get(_creator_id(doc)):
+               doc["creator"] = profile.model_dump()
+      return [to_response(model, doc) for doc in docs]
 
+   async def _invalidate(self, cnt, *event_ids: str) -> None:
+      config = (await cnt.get(Config)).cache
+      if event_ids and config.enabled:
+         redis = await cnt.get(RedisService)
+         await redis.invalidate(
+            *(cache_key("events", event_id) for event_id in event_ids),
+            window=config.invalidation_window
+         )
 
    async def subscribe(
        self, user_id: str, event_id: str, redis: RedisService
@@ -97,4 +403,21 @@ class EventService:
                where=(Event.id == ObjectId(event_id))
             )
             payload.update(**{"init": True, "expire_at": event.end_time})
-      await redis.add_to_set(user_id, **payload)
\ No newline at end of file
+            # events created before reminders existed have no job yet
+            await self._schedule_reminder(
+               cnt, event_id, event.status, event.start_time, only_new=True
+            )
+      await redis.add_to_set(user_id, **payload)
+
+   async def _schedule_reminder(
+       self, cnt, event_id: str, status: EventStatus, start_time: datetime,
+       only_new: bool = False
+   ) -> None:
+      """Only scheduled events are reminded of, others lose their job."""
+      if not (await cnt.get(Config)).reminders.enabled:
+         return
+      reminders = await cnt.get(ReminderQueue)
+      if status == EventStatus.scheduled:
+         await reminders.schedule(event_id, start_time, only_new=only_new)
+      elif not only_new:
+         await reminders.cancel(event_id)
\ No newline at end of file
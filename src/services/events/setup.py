@@ -0,0 +1,36 @@
+from typing import AsyncIterator
+
+from dishka import Provider, Scope, provide
+from redis.asyncio.client import Redis
+
+from src.core.config import Config
+from src.services.events.feed import FeedHub
+from src.services.events.reminders import ReminderQueue
+from src.services.events.stats import EventStats
+from src.services.redis.service import RedisService
+
+
+class FeedProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_feed_hub(
+        self, redis: Redis, redis_service: RedisService, config: Config
+    ) -> AsyncIterator[FeedHub]:
+        hub = FeedHub(redis=redis, redis_service=redis_service, config=config.feed)
+        yield hub
+        await hub.stop()
+
+
+class ReminderProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_reminder_queue(
+        self, redis: Redis, config: Config
+    ) -> ReminderQueue:
+        return ReminderQueue(redis=redis, config=config.reminders)
+
+
+class StatsProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def get_event_stats(
+        self, redis: Redis, config: Config
+    ) -> EventStats:
+        return EventStats(redis=redis, config=config.stats)
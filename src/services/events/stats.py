@@ -0,0 +1,144 @@
+"""Event counts per status, start day and creator kept in Redis hashes.
+
+Writes adjust the counters with one script call, so a read is three
+HGETALLs whatever the size of the collection. Counters are not updated in
+the same transaction as MongoDB; ``src.worker`` rebuilds them from an
+aggregation every ``reconcile_interval`` seconds, which also fixes any
+drift (an event written during a rebuild may be off until the next one).
+"""
+import asyncio
+import logging
+import os
+from collections import Counter as Tally
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from redis.asyncio.client import Redis
+
+from src.core.config import StatsConfig
+from src.services.events.repository import EventRepository
+from src.services.events.schemas import EventStatsResponse
+
+logger = logging.getLogger(__name__)
+
+STATUS_KEY = "stats:events:status"
+DAY_KEY = "stats:events:day"
+CREATOR_KEY = "stats:events:creator"
+RECONCILE_LOCK_KEY = "stats:events:reconcile"
+
+# KEYS: hashes; ARGV: field and delta per key. Buckets reaching zero are
+# removed so the hashes only hold non-empty ones.
+ADJUST = """
+for i, key in ipairs(KEYS) do
+   local field = ARGV[2 * i - 1]
+   if redis.call('HINCRBY', key, field, ARGV[2 * i]) <= 0 then
+      redis.call('HDEL', key, field)
+   end
+end
+"""
+
+REBUILD_PIPELINE = [
+    {"$facet": {
+        STATUS_KEY: [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+        DAY_KEY: [{"$group": {
+            "_id": {"$dateToString": {
+                "format": "%Y-%m-%d", "date": "$start_time"
+            }},
+            "count": {"$sum": 1}
+        }}],
+        CREATOR_KEY: [{"$group": {
+            # "$created_by.$id" is not a valid field path
+            "_id": {"$toString": {"$getField": {
+                "field": {"$literal": "$id"}, "input": "$created_by"
+            }}},
+            "count": {"$sum": 1}
+        }}],
+    }}
+]
+
+
+def stat_fields(
+    status: str, start_time: datetime, creator_id: str
+) -> dict[str, str]:
+    """The bucket of an event in every counter hash."""
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    return {
+        STATUS_KEY: str(status),
+        DAY_KEY: start_time.strftime("%Y-%m-%d"),
+        CREATOR_KEY: creator_id,
+    }
+
+
+class EventStats:
+
+    def __init__(self, redis: Redis, config: StatsConfig):
+        self._redis = redis
+        self._config = config
+        self._adjust = redis.register_script(ADJUST)
+
+    async def move(
+        self,
+        old: dict[str, str] | None = None,
+        new: dict[str, str] | None = None
+    ) -> None:
+        """Count an event out of its ``old`` buckets and into ``new`` ones."""
+        deltas = Tally()
+        for fields, delta in ((old, -1), (new, 1)):
+            for key, field in (fields or {}).items():
+                deltas[key, field] += delta
+        keys, args = [], []
+        for (key, field), delta in deltas.items():
+            if delta:
+                keys.append(key)
+                args.extend((field, delta))
+        if keys:
+            await self._adjust(keys=keys, args=args)
+
+    async def read(self) -> EventStatsResponse:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for key in (STATUS_KEY, DAY_KEY, CREATOR_KEY):
+                pipe.hgetall(key)
+            by_status, by_day, by_creator = (
+                {field.decode(): int(count) for field, count in counts.items()}
+                for counts in await pipe.execute()
+            )
+        return EventStatsResponse(
+            total=sum(by_status.values()),
+            by_status=by_status,
+            by_day=dict(sorted(by_day.items())),
+            by_creator=by_creator
+        )
+
+    async def rebuild(self, event_repo: EventRepository) -> None:
+        """Replace the counters with a full aggregation of the events."""
+        [facets] = await event_repo.aggregate(REBUILD_PIPELINE)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for key, groups in facets.items():
+                pipe.delete(key)
+                counts = {
+                    group["_id"]: group["count"] for group in groups
+                    if group["_id"] is not None
+                }
+                if counts:
+                    pipe.hset(key, mapping=counts)
+            await pipe.execute()
+
+    async def reconcile_forever(
+        self, rebuild: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Call ``rebuild`` every ``reconcile_interval`` seconds; the lock lets
+        a single process of all the workers do it per interval.
+        """
+        interval = self._config.reconcile_interval
+        while True:
+            try:
+                if await self._redis.set(
+                    RECONCILE_LOCK_KEY, os.getpid(),
+                    ex=max(int(interval), 1), nx=True
+                ):
+                    await rebuild()
+            except Exception:
+                logger.warning("Event stats rebuild failed", exc_info=True)
+            await asyncio.sleep(interval)
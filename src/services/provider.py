@@ -3,7 +3,9 @@ from typing import AsyncIterator
 from dishka import Provider, provide, Scope
 
 from src.services.auth.repository import AuthRepository
-from src.services.events.repository import EventRepository
+from src.services.events.repository import (
+    EventNotificationRepository, EventRepository
+)
 
 
 class RepositoryProvider(Provider):
@@ -15,4 +17,10 @@ class RepositoryProvider(Provider):
 
     @provide
     async def get_event_repo(self) -> AsyncIterator[EventRepository]:
-        yield EventRepository()
\ No newline at end of file
+        yield EventRepository()
+
+    @provide
+    async def get_event_notification_repo(
+        self
+    ) -> AsyncIterator[EventNotificationRepository]:
+        yield EventNotificationRepository()
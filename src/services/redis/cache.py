@@ -0,0 +1,126 @@
+"""Read-through caching of hot reads.
+
+``SingleFlight`` coalesces identical concurrent calls inside a process,
+``LeasedCache`` stores results in Redis and lets only the holder of a short
+lease load a missing key, so a miss does not send every worker to MongoDB
+at once. Loaded values are written back only if the key was not
+invalidated (``RedisService.invalidate``) while they were loaded.
+"""
+import asyncio
+import os
+from typing import Awaitable, Callable, Hashable
+
+from src.core.metrics.registry import Counter
+from src.services.redis.service import RedisService
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cached reads by cache and outcome",
+    ("cache", "outcome"),
+)
+
+Loader = Callable[[], Awaitable[str | bytes | None]]
+
+
+def cache_key(name: str, suffix: str) -> str:
+    return f"cache:{name}:{suffix}"
+
+
+class SingleFlight:
+    """Runs a single call per key; concurrent callers await its result.
+
+    The call runs as its own task, so a caller that is cancelled (a client
+    that went away) does not cancel the call for the others.
+    """
+
+    def __init__(self, name: str):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self._coalesced = CACHE_REQUESTS.labels(name, "coalesced")
+
+    async def do[T](self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._coalesced.inc()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._calls.pop(key, None)
+        # retrieved here in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class LeasedCache:
+    """Redis read-through cache with a load lease per key.
+
+    On a miss the first caller takes ``lease:<key>`` (SET NX) and loads the
+    value; the others poll the cache for up to ``lease_wait`` seconds and
+    load it themselves only if the holder did not finish in time. Values
+    are opaque bytes, ``None`` from the loader is not cached.
+    """
+
+    def __init__(
+        self,
+        redis: RedisService,
+        *,
+        name: str,
+        ttl: int,
+        lease_ttl: int,
+        lease_wait: float,
+        poll_interval: float,
+    ):
+        self._redis = redis
+        self._name = name
+        self._ttl = ttl
+        self._lease_ttl = lease_ttl
+        self._lease_wait = lease_wait
+        self._poll_interval = poll_interval
+
+    async def get_or_load(
+        self, suffix: str, loader: Loader
+    ) -> str | bytes | None:
+        key = cache_key(self._name, suffix)
+        [(value, generation)] = await self._redis.get_versioned([key])
+        if value is not None:
+            CACHE_REQUESTS.labels(self._name, "hit").inc()
+            return value
+
+        lease = f"lease:{key}"
+        if await self._redis.set_value(
+            lease, os.getpid(), ttl=self._lease_ttl, only_new=True
+        ):
+            CACHE_REQUESTS.labels(self._name, "miss").inc()
+            try:
+                return await self._load(key, loader, generation)
+            finally:
+                await self._redis.delete(lease)
+
+        value = await self._wait_for(key)
+        if value is not None:
+            CACHE_REQUESTS.labels(self._name, "lease_wait").inc()
+            return value
+        CACHE_REQUESTS.labels(self._name, "lease_timeout").inc()
+        return await self._load(key, loader, generation)
+
+    async def _load(
+        self, key: str, loader: Loader, generation: bytes | None
+    ) -> str | bytes | None:
+        value = await loader()
+        if value is not None:
+            await self._redis.set_unchanged(
+                {key: (value, generation)}, ttl=self._ttl
+            )
+        return value
+
+    async def _wait_for(self, key: str) -> bytes | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._lease_wait
+        while loop.time() < deadline:
+            await asyncio.sleep(self._poll_interval)
+            value = await self._redis.get(key)
+            if value is not None:
+                return value
+        return None
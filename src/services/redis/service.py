@@ -2,11 +2,46 @@ from datetime import datetime
 
 from redis.asyncio.client import Redis
 
+from src.core.metrics.instrument import REDIS_ERRORS, REDIS_LATENCY, timed
+
+GENERATION_COUNTER = "gen:counter"
+
+# KEYS: generation counter, then each key followed by its generation key;
+# ARGV: seconds the generations are kept. Generations come from a single
+# counter so an expired one is never handed out again.
+INVALIDATE = """
+local generation = redis.call('INCR', KEYS[1])
+for i = 2, #KEYS, 2 do
+   redis.call('DEL', KEYS[i])
+   redis.call('SET', KEYS[i + 1], generation, 'EX', ARGV[1])
+end
+"""
+
+# KEYS: each key followed by its generation key; ARGV: ttl, then the value
+# and the generation read before loading it ('' for none) per key.
+SET_UNCHANGED = """
+local written = 0
+for i = 1, #KEYS, 2 do
+   if (redis.call('GET', KEYS[i + 1]) or '') == ARGV[i + 2] then
+      redis.call('SET', KEYS[i], ARGV[i + 1], 'EX', ARGV[1])
+      written = written + 1
+   end
+end
+return written
+"""
+
+
+def generation_key(key: str) -> str:
+    return f"gen:{key}"
+
 
 class RedisService:
     def __init__(self, redis: Redis):
         self.redis = redis
+        self._invalidate = redis.register_script(INVALIDATE)
+        self._set_unchanged = redis.register_script(SET_UNCHANGED)
 
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "add_to_set")
     async def add_to_set(
         self, *values, key: str, init=False, expire_at: datetime | None = None
     ):
@@ -14,11 +49,79 @@ class RedisService:
         if init:
             await self.redis.expireat(name=key, when=expire_at)
 
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "get")
+    async def get(self, key: str) -> bytes | None:
+        return await self.redis.get(key)
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "set_value")
+    async def set_value(
+        self, key: str, value: str | bytes, *, ttl: int | None = None,
+        only_new: bool = False
+    ) -> bool:
+        """SET with an optional TTL; with only_new (NX) False if the key exists."""
+        return bool(await self.redis.set(key, value, ex=ttl, nx=only_new))
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "get_versioned")
+    async def get_versioned(
+        self, keys: list[str]
+    ) -> list[tuple[bytes | None, bytes | None]]:
+        """Value and generation of each key, read with one MGET."""
+        values = await self.redis.mget(
+            [*keys, *(generation_key(key) for key in keys)]
+        )
+        return list(zip(values[:len(keys)], values[len(keys):]))
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "set_unchanged")
+    async def set_unchanged(
+        self, values: dict[str, tuple[str | bytes, bytes | None]], *, ttl: int
+    ) -> int:
+        """
+        SET each key to its value unless it was invalidated since its
+        generation was read; returns the number of keys written.
+        """
+        keys, args = [], [ttl]
+        for key, (value, generation) in values.items():
+            keys.extend((key, generation_key(key)))
+            args.extend((value, generation or b""))
+        return await self._set_unchanged(keys=keys, args=args)
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "invalidate")
+    async def invalidate(self, *keys: str, window: int) -> None:
+        """
+        DEL the keys and give them a new generation for ``window`` seconds,
+        so loads that started before are not written back.
+        """
+        await self._invalidate(
+            keys=[
+                GENERATION_COUNTER,
+                *(name for key in keys for name in (key, generation_key(key)))
+            ],
+            args=[window]
+        )
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "delete")
+    async def delete(self, *keys: str) -> int:
+        return await self.redis.delete(*keys)
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "increment_var")
     async def increment_var(self, key: str):
         return await self.redis.incr(name=key)
 
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "set_expire")
     async def set_expire(self, key: str, expire: int):
         await self.redis.expire(name=key, time=expire)
 
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "find_keys")
     async def find_keys(self, pattern: str):
         return await self.redis.keys(pattern)
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "publish")
+    async def publish(self, channel: str, message: str | bytes) -> int:
+        return await self.redis.publish(channel, message)
+
+    @timed(REDIS_LATENCY, REDIS_ERRORS, "members_many")
+    async def members_many(self, keys: list[str]) -> list[set[bytes]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.smembers(key)
+            return await pipe.execute()
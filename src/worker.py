@@ -0,0 +1,134 @@
+"""Queue consumer worker: ``python -m src.worker``.
+
+Consumes the event queues declared in ``src.core.brokers.topology``.
+Several worker processes may consume the same queues; per-event ordering
+is kept within a process. Profile changes from ``users.updated`` are fanned
+out to the creator snapshots of the user's events. Due event reminders are
+claimed from Redis and published to the ``reminder`` queue, and the event
+statistics counters are rebuilt periodically.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from beanie import init_beanie
+from faststream import FastStream
+from faststream.rabbit import RabbitBroker
+from faststream.rabbit.annotations import RabbitMessage
+from faststream.rabbit.message import RabbitMessage as IncomingMessage
+from pymongo.asynchronous.database import AsyncDatabase
+
+from src.core.brokers.batching import PartitionedBatcher
+from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.brokers.codecs import codec_for
+from src.core.brokers.topology import (
+    build_dead_letter_exchange, build_dead_letter_queue, build_exchange,
+    build_queue_map, build_retry_queue, build_user_dead_letter_queue,
+    build_user_queue
+)
+from src.core.metrics.registry import REGISTRY
+from src.core.provider import CoreProvider, core_container
+from src.services.auth.models import User
+from src.services.events.consumer import Delivery, EventConsumer
+from src.services.events.models import Event, EventNotification
+from src.services.events.reminders import ReminderQueue
+from src.services.events.service import EventService
+from src.services.events.stats import EventStats
+
+config = CoreProvider().get_config()
+
+broker = RabbitBroker(
+    config.rabbit.rabbit_uri, max_consumers=config.worker.prefetch
+)
+consumer = EventConsumer(broker, config.worker)
+batcher = PartitionedBatcher(
+    consumer.handle_batch,
+    partitions=config.worker.partitions,
+    batch_size=config.worker.batch_size,
+    max_wait=config.worker.batch_max_wait_ms / 1000,
+)
+exchange = build_exchange(config.rabbit)
+queue_map = build_queue_map(config.rabbit)
+events = EventService()
+
+
+async def decode_message(message: IncomingMessage):
+    return codec_for(message.content_type).decode(message.body)
+
+
+def _subscribe(action: str) -> None:
+    # acknowledgement is left to the consumer once the batch is processed
+    @broker.subscriber(
+        queue_map[action], exchange, decoder=decode_message,
+        no_ack=True, retry=False
+    )
+    async def handle(body: dict, message: RabbitMessage) -> None:
+        batcher.submit(body["id"], Delivery(action, body, message))
+
+
+for _action in queue_map:
+    _subscribe(_action)
+
+
+@broker.subscriber(
+    build_user_queue(config.rabbit), exchange, decoder=decode_message,
+    retry=False
+)
+async def refresh_creator(body: dict) -> None:
+    # reads the current profile, so redeliveries and reordering are harmless
+    await events.refresh_creator(body["id"])
+
+
+async def declare_topology() -> None:
+    dead_letter_exchange = await broker.declare_exchange(
+        build_dead_letter_exchange(config.rabbit)
+    )
+    for action in queue_map:
+        await broker.declare_queue(build_retry_queue(action))
+        dead_letter_queue = build_dead_letter_queue(action)
+        queue = await broker.declare_queue(dead_letter_queue)
+        await queue.bind(
+            dead_letter_exchange, routing_key=dead_letter_queue.routing_key
+        )
+    user_dead_letter_queue = build_user_dead_letter_queue()
+    queue = await broker.declare_queue(user_dead_letter_queue)
+    await queue.bind(
+        dead_letter_exchange, routing_key=user_dead_letter_queue.routing_key
+    )
+
+
+@asynccontextmanager
+async def lifespan():
+    if config.metrics.enabled:
+        REGISTRY.start(config.metrics.directory, config.metrics.flush_interval)
+    await init_beanie(
+        database=await core_container.get(AsyncDatabase),
+        document_models=[User, Event, EventNotification]
+    )
+    await broker.connect()
+    await declare_topology()
+    batcher.start()
+    tasks = []
+    if config.reminders.enabled:
+        queue = await core_container.get(ReminderQueue)
+        tasks.append(asyncio.create_task(queue.dispatch_forever(
+            await core_container.get(RabbitMqPublisher)
+        )))
+    if config.stats.enabled:
+        stats = await core_container.get(EventStats)
+        tasks.append(asyncio.create_task(
+            stats.reconcile_forever(events.rebuild_stats)
+        ))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await core_container.close()
+    await REGISTRY.stop()
+
+
+# stops the partitions before the broker connection is closed
+app = FastStream(broker, lifespan=lifespan, on_shutdown=[batcher.stop])
+
+
+if __name__ == "__main__":
+    asyncio.run(app.run())
@@ -0,0 +1,75 @@
+import pytest
+
+
+class FakeRedisService:
+    """In-memory stand-in for the RedisService methods used by the tests."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.generations: dict[str, bytes] = {}
+        self._counter = 0
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set_value(
+        self, key: str, value: str | bytes, *, ttl: int | None = None,
+        only_new: bool = False
+    ) -> bool:
+        if only_new and key in self.values:
+            return False
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [self.values.get(key) for key in keys]
+
+    async def get_versioned(
+        self, keys: list[str]
+    ) -> list[tuple[bytes | None, bytes | None]]:
+        return [
+            (self.values.get(key), self.generations.get(key)) for key in keys
+        ]
+
+    async def set_unchanged(
+        self, values: dict[str, tuple[str | bytes, bytes | None]], *, ttl: int
+    ) -> int:
+        written = 0
+        for key, (value, generation) in values.items():
+            if self.generations.get(key) == generation:
+                await self.set_value(key, value, ttl=ttl)
+                written += 1
+        return written
+
+    async def invalidate(self, *keys: str, window: int) -> None:
+        self._counter += 1
+        for key in keys:
+            self.values.pop(key, None)
+            self.generations[key] = str(self._counter).encode()
+
+
+class FakeContainer:
+    """Replaces ``core_container``: every dependency is looked up by type."""
+
+    def __init__(self, **dependencies):
+        self.dependencies = dependencies
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def get(self, dependency_type):
+        return self.dependencies[dependency_type.__name__]
+
+
+@pytest.fixture
+def redis_service() -> FakeRedisService:
+    return FakeRedisService()
@@ -0,0 +1,94 @@
+from bson import ObjectId
+
+from src.core.config import CacheConfig
+from src.services.auth.profiles import ProfileCache, UnknownLogins
+from src.services.redis.cache import LeasedCache, cache_key
+
+
+def _cache(redis_service) -> LeasedCache:
+    return LeasedCache(
+        redis_service, name="events", ttl=300, lease_ttl=5,
+        lease_wait=0.05, poll_interval=0.01
+    )
+
+
+async def test_loaded_value_is_cached(redis_service):
+    cache = _cache(redis_service)
+    calls = []
+
+    async def load() -> str:
+        calls.append(1)
+        return "v1"
+
+    assert await cache.get_or_load("1", load) == "v1"
+    assert await cache.get_or_load("1", load) == b"v1"
+    assert len(calls) == 1
+
+
+async def test_load_racing_an_invalidation_is_not_written_back(redis_service):
+    cache = _cache(redis_service)
+    key = cache_key("events", "1")
+
+    async def load() -> str:
+        # the event changes after the loader read it
+        await redis_service.invalidate(key, window=60)
+        return "stale"
+
+    assert await cache.get_or_load("1", load) == "stale"
+    assert key not in redis_service.values
+
+    async def reload() -> str:
+        return "fresh"
+
+    assert await cache.get_or_load("1", reload) == "fresh"
+    assert redis_service.values[key] == b"fresh"
+
+
+class StoredUser:
+    """What ``AuthRepository.get_many`` returns with the profile projection."""
+
+    def __init__(self, **values):
+        self.id = values["id"]
+        self._values = values
+
+    def model_dump(self) -> dict:
+        return dict(self._values)
+
+
+class RacingRepository:
+    """Returns the old profile, changed (and invalidated) meanwhile."""
+
+    def __init__(self, profiles: ProfileCache, user: StoredUser):
+        self._profiles = profiles
+        self._user = user
+
+    async def get_many(self, where: dict, project: dict) -> list[StoredUser]:
+        await self._profiles.invalidate(str(self._user.id))
+        return [self._user]
+
+
+async def test_profile_load_racing_an_invalidation_is_not_written_back(
+    redis_service
+):
+    profiles = ProfileCache(redis_service, CacheConfig())
+    user = StoredUser(
+        id=ObjectId(), email="old@example.com", username="old"
+    )
+    repo = RacingRepository(profiles, user)
+
+    found = await profiles.get_many([str(user.id)], repo)
+
+    assert found[str(user.id)].username == "old"
+    assert cache_key("profiles", str(user.id)) not in redis_service.values
+
+
+async def test_unknown_login_is_not_added_after_a_registration(redis_service):
+    unknown_logins = UnknownLogins(redis_service, CacheConfig())
+
+    unknown, generation = await unknown_logins.lookup("alice")
+    # the user registers while the login looks "alice" up in MongoDB
+    await unknown_logins.discard("alice")
+    await unknown_logins.add("alice", generation)
+
+    assert not unknown
+    assert await unknown_logins.lookup("alice") == (False, b"1")
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from src.core.brokers.codecs import CODECS, MsgpackCodec, codec_for
+from src.services.events.messages import EventMessage
+
+
+def _message() -> EventMessage:
+    return EventMessage(
+        id=str(ObjectId()),
+        title="Conference",
+        action="created",
+        timestamp=datetime(2026, 5, 1, 12, 30, 15, 250, tzinfo=timezone.utc),
+        user_id=str(ObjectId()),
+    )
+
+
+def test_msgpack_round_trip_is_compact():
+    message = _message()
+    codec = MsgpackCodec()
+
+    body = codec.encode(message)
+
+    assert codec.decode(body) == message.model_dump()
+    assert bytes.fromhex(message.id) in body
+    assert len(body) < len(CODECS["json"].encode(message)) * 2 // 3
+
+
+def test_decoder_is_picked_by_content_type():
+    message = _message()
+
+    for codec in CODECS.values():
+        decoded = codec_for(codec.content_type).decode(codec.encode(message))
+        assert decoded["id"] == message.id
+    assert codec_for(None) is CODECS["json"]
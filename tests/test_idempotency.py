@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from src.core.application import utils
+from src.core.application.utils import REPLAYED_HEADER, idempotent
+from tests.conftest import FakeContainer
+
+
+class Payload(BaseModel):
+    title: str
+
+
+def test_app_and_worker_import():
+    import src.main
+    import src.worker
+
+    assert src.main.app.routes
+    assert src.worker.app is not None
+
+
+@pytest.fixture
+def endpoint(monkeypatch, redis_service):
+    monkeypatch.setattr(
+        utils, "core_container", FakeContainer(RedisService=redis_service)
+    )
+    calls = []
+
+    @idempotent(scope="tests")
+    async def create(user, request: Payload, idempotency_key=None):
+        calls.append(request.title)
+        return {"title": request.title, "call": len(calls)}
+
+    create.calls = calls
+    return create
+
+
+async def test_repeated_key_replays_the_first_response(endpoint):
+    user = SimpleNamespace(user_id="user-1")
+    first = await endpoint(
+        user=user, request=Payload(title="a"), idempotency_key="key"
+    )
+    second = await endpoint(
+        user=user, request=Payload(title="a"), idempotency_key="key"
+    )
+
+    assert first == {"title": "a", "call": 1}
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert second.body == b'{"title": "a", "call": 1}'
+    assert endpoint.calls == ["a"]
+
+
+async def test_reused_key_with_another_payload_is_rejected(endpoint):
+    user = SimpleNamespace(user_id="user-1")
+    await endpoint(user=user, request=Payload(title="a"), idempotency_key="k")
+    response = await endpoint(
+        user=user, request=Payload(title="b"), idempotency_key="k"
+    )
+
+    assert response.status_code == 422
+    assert endpoint.calls == ["a"]
+
+
+async def test_keys_are_scoped_per_user(endpoint):
+    for user_id in ("user-1", "user-2"):
+        await endpoint(
+            user=SimpleNamespace(user_id=user_id),
+            request=Payload(title="a"), idempotency_key="key"
+        )
+
+    assert endpoint.calls == ["a", "a"]
+
+
+async def test_requests_without_key_always_run(endpoint):
+    user = SimpleNamespace(user_id="user-1")
+    await endpoint(user=user, request=Payload(title="a"))
+    await endpoint(user=user, request=Payload(title="a"))
+
+    assert endpoint.calls == ["a", "a"]
+
+
+async def test_failed_request_releases_the_key(monkeypatch, redis_service):
+    monkeypatch.setattr(
+        utils, "core_container", FakeContainer(RedisService=redis_service)
+    )
+
+    @idempotent(scope="tests")
+    async def failing(user, idempotency_key=None):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await failing(
+            user=SimpleNamespace(user_id="user-1"), idempotency_key="key"
+        )
+    assert redis_service.values == {}
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError
+
+from src.core.config import ImportConfig
+from src.core.exception.reason import Reason
+from src.services.auth.importer import UserImporter, _lines, _parse
+from src.services.auth.schemas import ImportReport
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_lines_are_numbered_across_chunks():
+    body = _body(b'{"a": 1}\n\n{"b"', b': 2}\n  \n{"c": 3}')
+
+    lines = [item async for item in _lines(body)]
+
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (5, b'{"c": 3}')]
+
+
+def test_parse_valid_row():
+    report = ImportReport()
+
+    request = _parse(
+        1,
+        b'{"email": "a@example.com", "username": "alice",'
+        b' "password": "Secret123!"}',
+        report
+    )
+
+    assert request.username == "alice"
+    assert report.failed == []
+
+
+def test_parse_reports_invalid_rows():
+    report = ImportReport()
+
+    assert _parse(2, b'{"email": "a@example.com"}', report) is None
+    assert _parse(
+        3,
+        b'{"email": "b@example.com", "username": "bob",'
+        b' "password": "secret123!"}',
+        report
+    ) is None
+    assert _parse(
+        4,
+        b'{"email": "c@example.com", "username": "carol",'
+        b' "password": "Secret123"}',
+        report
+    ) is None
+
+    missing, no_upper, no_special = report.failed
+    assert (missing.line, missing.reason) == (2, Reason.INVALID_USER_RECORD)
+    assert "username" in missing.details
+    assert (no_upper.line, no_upper.reason) == (3, Reason.UPPER_PASSWORD)
+    assert (no_special.line, no_special.reason) == (4, Reason.CHAR_PASSWORD)
+
+
+class FailingRepository:
+    """Rejects the rows of ``insert_many`` listed in ``write_errors``."""
+
+    def __init__(self, write_errors: list[dict]):
+        self._write_errors = write_errors
+
+    async def add_many(self, items, ordered: bool = True):
+        raise BulkWriteError({"writeErrors": self._write_errors})
+
+
+class RecordingUnknownLogins:
+
+    def __init__(self):
+        self.discarded: list[str] = []
+
+    async def discard(self, *login_keys: str) -> None:
+        self.discarded.extend(login_keys)
+
+
+async def test_write_maps_errors_to_their_rows():
+    repo = FailingRepository([
+        {"index": 1, "code": 11000, "keyValue": {"login_keys": "bob"}},
+        {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+    ])
+    unknown_logins = RecordingUnknownLogins()
+    importer = UserImporter(repo, None, unknown_logins, ImportConfig())
+    users = [
+        SimpleNamespace(login_keys=[name]) for name in ("alice", "bob", "eve")
+    ]
+    report = ImportReport()
+
+    await importer._write([4, 7, 9], users, report)
+
+    duplicate, invalid = report.failed
+    assert (duplicate.line, duplicate.reason, duplicate.details) == (
+        7, Reason.USER_ALREADY_EXISTS, "login_keys"
+    )
+    assert (invalid.line, invalid.reason) == (9, Reason.INVALID_USER_RECORD)
+    assert report.created == 1
+    assert unknown_logins.discarded == ["alice"]
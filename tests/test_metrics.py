@@ -0,0 +1,35 @@
+import json
+import subprocess
+
+from src.core.metrics.registry import Counter, Gauge, Registry
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+async def test_start_folds_snapshots_of_exited_workers(tmp_path):
+    registry = Registry()
+    requests = Counter("requests_total", "Requests", registry=registry)
+    Gauge("connections", "Open connections", registry=registry)
+    requests.labels().inc()
+    dead = tmp_path / f"{_dead_pid()}.json"
+    dead.write_text(json.dumps({
+        "requests_total": [[[], 3.0]], "connections": [[[], 5.0]]
+    }))
+    (tmp_path / "exited.json").write_text(json.dumps({
+        "requests_total": [[[], 2.0]]
+    }))
+
+    registry.start(str(tmp_path), interval=60)
+    await registry.stop()
+
+    assert not dead.exists()
+    assert json.loads((tmp_path / "exited.json").read_text()) == {
+        "requests_total": [[[], 5.0]]
+    }
+    lines = registry.render(registry.read_workers()).splitlines()
+    assert "requests_total 6.0" in lines
+    assert not any(line.startswith("connections ") for line in lines)
@@ -0,0 +1,19 @@
+import os
+
+from src.core.config import ProfilingConfig
+from src.core.profiling.middleware import ProfilingMiddleware
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    config = ProfilingConfig(output_dir=str(tmp_path), max_files=3)
+    middleware = ProfilingMiddleware(None, config, admin=None)
+    for age, request_id in enumerate(("c", "b", "a")):
+        path = tmp_path / f"{request_id}.folded"
+        path.write_text("main 1\n")
+        os.utime(path, (1000 - age, 1000 - age))
+
+    middleware._store("new", "main 1\n")
+
+    assert sorted(path.stem for path in tmp_path.glob("*.folded")) == [
+        "b", "c", "new"
+    ]
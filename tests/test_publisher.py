@@ -0,0 +1,77 @@
+import pytest
+
+from src.core.brokers.rabbitmq import RabbitMqPublisher
+from src.core.brokers.spool import SPOOL_MESSAGES, Spool, SpoolFullError
+
+
+class RecordingBroker:
+    """Records published bodies; fails every publish when ``down``."""
+
+    def __init__(self, down: bool = False):
+        self.down = down
+        self.published: list[bytes] = []
+
+    async def publish(self, message: bytes, **kwargs) -> None:
+        if self.down:
+            raise ConnectionError("broker is down")
+        self.published.append(message)
+
+
+async def _unused_sender(routing_key: str, body: bytes, content_type: str):
+    raise AssertionError("the spool is not replayed in these tests")
+
+
+def _publisher(broker: RecordingBroker, tmp_path) -> RabbitMqPublisher:
+    publisher = RabbitMqPublisher(broker=broker, exchange=None, queue_map={})
+    # the connection was established before
+    publisher._connected = True
+    publisher.attach_spool(Spool(
+        _unused_sender, directory=str(tmp_path), max_bytes=0,
+        segment_bytes=1024, fsync_interval=1, backoff=1, max_backoff=1
+    ))
+    return publisher
+
+
+async def test_message_is_dropped_when_the_full_spool_is_pending(tmp_path):
+    broker = RecordingBroker()
+    publisher = _publisher(broker, tmp_path)
+    publisher._spool.pending = True
+    dropped = SPOOL_MESSAGES.labels("dropped")
+    before = dropped.value
+
+    await publisher.publish({"id": "1"}, "events.created")
+
+    assert dropped.value == before + 1
+    assert broker.published == []
+    assert publisher._spool.size == 0
+
+
+async def test_message_is_dropped_when_the_broker_fails_and_spool_is_full(
+    tmp_path
+):
+    broker = RecordingBroker(down=True)
+    publisher = _publisher(broker, tmp_path)
+    dropped = SPOOL_MESSAGES.labels("dropped")
+    before = dropped.value
+
+    await publisher.publish({"id": "1"}, "events.created")
+
+    assert dropped.value == before + 1
+    assert broker.published == []
+    assert publisher._spool.size == 0
+    assert not publisher._spool.pending
+
+
+async def test_full_spool_raises_when_dropping_is_not_allowed(tmp_path):
+    broker = RecordingBroker(down=True)
+    publisher = _publisher(broker, tmp_path)
+    dropped = SPOOL_MESSAGES.labels("dropped")
+    before = dropped.value
+
+    with pytest.raises(SpoolFullError):
+        await publisher.publish(
+            {"id": "1"}, "events.reminder", drop_if_full=False
+        )
+
+    assert dropped.value == before
+    assert broker.published == []
@@ -0,0 +1,57 @@
+import asyncio
+
+from src.core.database.slowlog import SlowQueryLog, normalize
+
+
+class Model:
+    """Document class stand-in; explain fails and is only logged."""
+
+    @staticmethod
+    def get_collection_name() -> str:
+        return "events"
+
+
+class FindOneQuery:
+    """Like beanie's FindOne: a filter but no sort_expressions."""
+
+    def get_filter_query(self) -> dict:
+        return {"_id": "abc", "version": 3}
+
+
+class FindManyQuery(FindOneQuery):
+    sort_expressions = [("start_time", 1)]
+
+
+async def _observe(query) -> SlowQueryLog:
+    log = SlowQueryLog(threshold_ms=0, explain_sample_rate=0)
+    log.observe(Model, "update_one", query, 0.001)
+    await asyncio.gather(*log._tasks)
+    return log
+
+
+async def test_find_one_queries_are_recorded():
+    [shape] = (await _observe(FindOneQuery())).top()
+
+    assert shape["operation"] == "update_one"
+    assert shape["filter"] == {"_id": "?", "version": "?"}
+    assert shape["sort"] == []
+    assert shape["count"] == 1
+
+
+async def test_find_many_queries_keep_their_sort():
+    [shape] = (await _observe(FindManyQuery())).top()
+
+    assert shape["sort"] == [["start_time", 1]]
+
+
+def test_fast_queries_are_ignored():
+    log = SlowQueryLog(threshold_ms=100)
+    log.observe(Model, "get_one", FindOneQuery(), 0.01)
+
+    assert log.top() == []
+
+
+def test_normalize_keeps_the_structure():
+    assert normalize({"$in": [1, 2], "a": {"$gt": 3}}) == {
+        "$in": ["?"], "a": {"$gt": "?"}
+    }